@@ -0,0 +1,461 @@
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+from dotenv import load_dotenv
+from loguru import logger
+
+from .config import Config
+from .exceptions import ApplicationError, ProcessingError
+from .filters.base import FilterFactory
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".m4v", ".webm")
+MANIFEST_VERSION = 1
+# Кадры перед диапазоном, которые пропускаются через цепочку с фильтрами с состоянием (temporal, denoise)
+# без записи: к началу диапазона накопитель совпадает с последовательной обработкой (0.8^30 < 0.1%)
+STATEFUL_WARMUP_FRAMES = 30
+
+
+@dataclass
+class FrameRange:
+    """Диапазон кадров [start, end) видеофайла, обрабатываемый одним заданием"""
+
+    index: int
+    start: int
+    end: int
+    done: bool = False
+    frames: int = 0        # Записано кадров
+    seconds: float = 0.0   # Процессорное время исполнителя на диапазон
+
+
+@dataclass
+class BatchJob:
+    """Обработка одного файла: настройки, диапазоны и пути результата"""
+
+    source: Path
+    output: Path
+    fps: float
+    frame_size: Tuple[int, int]
+    settings: Dict
+    ranges: List[FrameRange] = field(default_factory=list)
+    complete: bool = False
+    started: float = field(default_factory=time.perf_counter)
+    error: Optional[str] = None  # Ошибка диапазона или склейки: файл остаётся незавершённым до повторного запуска
+
+    @property
+    def parts_dir(self) -> Path:
+        return self.output.parent / f".{self.output.stem}.parts"
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.output.parent / f"{self.output.stem}.manifest.json"
+
+    def part_path(self, frame_range: FrameRange) -> Path:
+        return self.parts_dir / f"{frame_range.index:05d}{self.output.suffix}"
+
+    @property
+    def pending(self) -> List[FrameRange]:
+        return [frame_range for frame_range in self.ranges if not frame_range.done]
+
+    @property
+    def total_frames(self) -> int:
+        return self.ranges[-1].end if self.ranges else 0
+
+    def save(self) -> None:
+        """Запись манифеста через временный файл: прерванная запись не портит прежний манифест"""
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "settings": self.settings,
+            "complete": self.complete,
+            "ranges": [asdict(frame_range) for frame_range in self.ranges],
+        }
+        temporary = self.manifest_path.with_suffix(".json.tmp")
+        temporary.write_text(json.dumps(manifest, indent=2))
+        os.replace(temporary, self.manifest_path)
+
+
+def find_inputs(paths: Sequence[str]) -> List[Path]:
+    """Видеофайлы из списка файлов и каталогов (каталоги - без вложенных, по имени файла)"""
+    inputs: List[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            inputs.extend(sorted(
+                child for child in path.iterdir() if child.is_file() and child.suffix.lower() in VIDEO_EXTENSIONS
+            ))
+        elif path.is_file():
+            inputs.append(path)
+        else:
+            raise ProcessingError(f"Input not found: {path}")
+    return inputs
+
+
+def probe_video(path: Path) -> Tuple[int, float, Tuple[int, int]]:
+    """(число кадров, частота кадров, (ширина, высота)) видеофайла"""
+    capture = cv2.VideoCapture(str(path))
+    try:
+        if not capture.isOpened():
+            raise ProcessingError(f"Failed to open video file {path}")
+        frames = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+        size = (int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)), int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    finally:
+        capture.release()
+    if frames <= 0:
+        raise ProcessingError(f"Video file has no frames: {path}")
+    return frames, fps, size
+
+
+def split_ranges(total_frames: int, chunk_frames: int) -> List[FrameRange]:
+    """Деление файла на диапазоны по chunk_frames кадров"""
+    if chunk_frames <= 0:
+        raise ProcessingError("Chunk size must be positive")
+    return [
+        FrameRange(index, start, min(start + chunk_frames, total_frames))
+        for index, start in enumerate(range(0, total_frames, chunk_frames))
+    ]
+
+
+def process_range(task: Dict) -> Tuple[int, int, float]:
+    """
+        Задание процесса-исполнителя: декодирование диапазона, цепочка фильтров и запись сегмента.
+        Сегмент пишется во временный файл и переименовывается только целиком, поэтому после прерывания
+        на диске остаются лишь завершённые сегменты. Возвращает (номер диапазона, кадров, секунд)
+    """
+    # Один поток OpenCV на исполнитель: параллельность даёт пул процессов, а не потоки внутри каждого
+    cv2.setNumThreads(1)
+    for module_name in task["filter_modules"]:
+        importlib.import_module(module_name)
+    from .filters.pipeline import FilterPipeline
+
+    # Процессорное время, а не время по часам: при нехватке ядер исполнители делят их между собой
+    started = time.process_time()
+    pipeline = FilterPipeline.from_names(task["filters"], task["intensity"], task["fuse"])
+    stateful = any(image_filter.is_stateful for image_filter in pipeline.all_filters)
+    first = max(0, task["start"] - STATEFUL_WARMUP_FRAMES) if stateful else task["start"]
+
+    capture = cv2.VideoCapture(task["source"])
+    part = Path(task["part"])
+    temporary = part.with_name(f"{part.stem}.tmp{part.suffix}")
+    writer = cv2.VideoWriter(
+        str(temporary), cv2.VideoWriter_fourcc(*task["codec"]), task["fps"], tuple(task["frame_size"])
+    )
+    written = 0
+    try:
+        if not capture.isOpened() or not writer.isOpened():
+            raise ProcessingError(f"Failed to open {task['source']} or segment {temporary}")
+        # Бэкенд FFmpeg позиционирует по ключевым кадрам и для файлов с длинной группой кадров или переменной
+        # частотой может встать не на тот кадр. Неточное позиционирование дублировало бы или теряло кадры
+        # на границе диапазонов, поэтому такой диапазон завершается ошибкой
+        if first:
+            capture.set(cv2.CAP_PROP_POS_FRAMES, first)
+            actual = int(capture.get(cv2.CAP_PROP_POS_FRAMES))
+            if actual != first:
+                raise ProcessingError(f"Inexact seek in {task['source']}: requested frame {first}, got {actual}")
+        position = first
+        # У последнего диапазона end - оценка по заголовку: он читается до конца файла
+        while task["end"] is None or position < task["end"]:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            result = pipeline.apply(frame)
+            if position >= task["start"]:
+                writer.write(result)
+                written += 1
+            position += 1
+    finally:
+        writer.release()
+        capture.release()
+    os.replace(temporary, part)
+    return task["index"], written, time.process_time() - started
+
+
+def concatenate_segments(parts: Sequence[Path], output: Path, fps: float, codec: str) -> None:
+    """
+        Склейка сегментов по порядку. С ffmpeg в PATH сегменты склеиваются без перекодирования,
+        иначе кадры сегментов перекодируются в выходной файл средствами OpenCV
+    """
+    temporary = output.with_name(f"{output.stem}.tmp{output.suffix}")
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg:
+        listing = parts[0].parent / "segments.txt"
+        listing.write_text("".join(f"file '{part.resolve()}'\n" for part in parts))
+        command = [ffmpeg, "-y", "-v", "error", "-f", "concat", "-safe", "0", "-i", str(listing),
+                   "-c", "copy", str(temporary)]
+        if subprocess.run(command, capture_output=True).returncode == 0:
+            os.replace(temporary, output)
+            return
+        logger.warning(f"ffmpeg concat failed for {output}, re-encoding segments")
+
+    writer: Optional[cv2.VideoWriter] = None
+    try:
+        for part in parts:
+            capture = cv2.VideoCapture(str(part))
+            while True:
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                if writer is None:
+                    height, width = frame.shape[:2]
+                    writer = cv2.VideoWriter(str(temporary), cv2.VideoWriter_fourcc(*codec), fps, (width, height))
+                writer.write(frame)
+            capture.release()
+    finally:
+        if writer is not None:
+            writer.release()
+    if writer is None:
+        raise ProcessingError(f"No frames to write to {output}")
+    os.replace(temporary, output)
+
+
+class BatchProcessor:
+    """
+        Офлайн-обработка видеофайлов цепочкой фильтров в пуле процессов.
+        Каждый файл делится на диапазоны кадров; диапазоны всех файлов выполняются исполнителями параллельно,
+        сегменты склеиваются по порядку, когда готовы все диапазоны файла.
+        Состояние файла хранится в манифесте рядом с результатом и обновляется после каждого диапазона,
+        поэтому прерванный запуск продолжается с незавершённых диапазонов
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        filters: Sequence[str],
+        intensity: float = 1.0,
+        fuse: bool = False,
+        codec: str = "mp4v",
+        container: str = "mp4",
+        chunk_frames: int = 300,
+        workers: int = 0
+    ):
+        unknown = [name for name in filters if name not in FilterFactory.get_available_filters()]
+        if unknown:
+            raise ProcessingError(f"Filters are not available: {', '.join(unknown)}")
+        if len(codec) != 4:
+            raise ProcessingError(f"Codec must be a FourCC code: {codec}")
+
+        self.output_dir = Path(output_dir)
+        self.filters = list(filters)
+        self.intensity = intensity
+        self.fuse = fuse
+        self.codec = codec
+        self.container = container.lstrip(".")
+        self.chunk_frames = chunk_frames
+        self.workers = workers or os.cpu_count() or 1
+        # Модули зарегистрированных фильтров: исполнители импортируют их, чтобы получить тот же набор фильтров
+        self._filter_modules = sorted({
+            filter_class.__module__ for filter_class in FilterFactory._filters.values()
+        })
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Config,
+        output_dir: str,
+        chunk_frames: int = 300,
+        workers: int = 0
+    ) -> "BatchProcessor":
+        return cls(
+            output_dir,
+            config.filter_chain,
+            config.filter_intensity,
+            config.filter_fusion,
+            config.record_codec,
+            config.record_container,
+            chunk_frames,
+            workers or config.processing_workers
+        )
+
+    def plan(self, source: Path) -> BatchJob:
+        """Задание для файла: из манифеста, если он совпадает с файлом и настройками, иначе заново"""
+        frames, fps, frame_size = probe_video(source)
+        stat = source.stat()
+        settings = {
+            "source": str(source.resolve()),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "frames": frames,
+            "filters": self.filters,
+            "intensity": self.intensity,
+            "fuse": self.fuse,
+            "codec": self.codec,
+            "chunk_frames": self.chunk_frames,
+        }
+        job = BatchJob(source, self.output_dir / f"{source.stem}.{self.container}", fps, frame_size, settings)
+
+        if job.manifest_path.exists():
+            manifest = json.loads(job.manifest_path.read_text())
+            if manifest.get("version") == MANIFEST_VERSION and manifest.get("settings") == settings:
+                job.ranges = [FrameRange(**frame_range) for frame_range in manifest["ranges"]]
+                job.complete = manifest.get("complete", False) and job.output.exists()
+                # Сегмент, удалённый после записи манифеста, обрабатывается заново
+                for frame_range in job.ranges:
+                    frame_range.done = job.complete or (frame_range.done and job.part_path(frame_range).exists())
+                return job
+            logger.warning(f"{source.name}: manifest does not match the file or settings, starting over")
+
+        shutil.rmtree(job.parts_dir, ignore_errors=True)
+        job.ranges = split_ranges(frames, self.chunk_frames)
+        return job
+
+    def _task(self, job: BatchJob, frame_range: FrameRange) -> Dict:
+        return {
+            "source": str(job.source),
+            "part": str(job.part_path(frame_range)),
+            "index": frame_range.index,
+            "start": frame_range.start,
+            "end": None if frame_range is job.ranges[-1] else frame_range.end,
+            "filters": self.filters,
+            "intensity": self.intensity,
+            "fuse": self.fuse,
+            "codec": self.codec,
+            "fps": job.fps,
+            "frame_size": job.frame_size,
+            "filter_modules": self._filter_modules,
+        }
+
+    def run(self, inputs: Sequence[Path]) -> List[Dict]:
+        """Обработка файлов; возвращает сводку по каждому файлу"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        jobs: List[BatchJob] = []
+        failed: List[Dict] = []
+        for source in inputs:
+            # Файл, который не удалось открыть, не останавливает обработку остальных
+            try:
+                jobs.append(self.plan(source))
+            except Exception as e:
+                logger.error(f"{source.name}: {e}")
+                failed.append({"source": str(source), "output": None, "complete": False, "error": str(e)})
+        for job in jobs:
+            if job.complete:
+                logger.info(f"{job.source.name}: already processed, output {job.output}")
+            else:
+                job.parts_dir.mkdir(parents=True, exist_ok=True)
+                job.save()
+                resumed = len(job.ranges) - len(job.pending)
+                if resumed:
+                    logger.info(f"{job.source.name}: resuming, {resumed}/{len(job.ranges)} ranges already done")
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(self.workers, mp_context=context) as executor:
+            futures: Dict[Future, Tuple[BatchJob, FrameRange]] = {}
+            for job in jobs:
+                if not job.complete:
+                    for frame_range in job.pending:
+                        futures[executor.submit(process_range, self._task(job, frame_range))] = (job, frame_range)
+                    if not job.pending:
+                        self._finish(job)
+            try:
+                while futures:
+                    finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        job, frame_range = futures.pop(future)
+                        try:
+                            _, frame_range.frames, frame_range.seconds = future.result()
+                        except Exception as e:
+                            # Диапазон остаётся незавершённым в манифесте и выполняется при повторном запуске
+                            logger.error(f"{job.source.name}: range {frame_range.index} failed: {e}")
+                            job.error = str(e)
+                            continue
+                        frame_range.done = True
+                        job.save()
+                        self._report_progress(job)
+                        if not job.pending:
+                            self._finish(job)
+            except BaseException:
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+
+        return [self._summary(job) for job in jobs] + failed
+
+    def _report_progress(self, job: BatchJob) -> None:
+        done = [frame_range for frame_range in job.ranges if frame_range.done]
+        frames = sum(frame_range.end - frame_range.start for frame_range in done)
+        logger.info(
+            f"{job.source.name}: {len(done)}/{len(job.ranges)} ranges, "
+            f"{frames}/{job.total_frames} frames ({frames / max(1, job.total_frames):.0%})"
+        )
+
+    def _finish(self, job: BatchJob) -> None:
+        """Склейка сегментов готового файла и удаление промежуточных файлов"""
+        try:
+            concatenate_segments([job.part_path(frame_range) for frame_range in job.ranges], job.output,
+                                 job.fps, self.codec)
+        except Exception as e:
+            # Сегменты остаются на диске: повторный запуск только склеит их
+            logger.error(f"{job.source.name}: failed to concatenate segments: {e}")
+            job.error = str(e)
+            return
+        job.complete = True
+        job.save()
+        shutil.rmtree(job.parts_dir, ignore_errors=True)
+        summary = self._summary(job)
+        logger.info(
+            f"{job.source.name}: {summary['frames']} frames in {summary['wall_seconds']:.1f} s, "
+            f"{summary['fps_per_core']:.1f} fps per core, output {job.output}"
+        )
+
+    def _summary(self, job: BatchJob) -> Dict:
+        frames = sum(frame_range.frames for frame_range in job.ranges)
+        seconds = sum(frame_range.seconds for frame_range in job.ranges)
+        return {
+            "source": str(job.source),
+            "output": str(job.output),
+            "complete": job.complete,
+            "frames": frames,
+            "wall_seconds": time.perf_counter() - job.started,
+            # Кадров в секунду на одно ядро: по процессорному времени исполнителей, без простоя пула
+            "fps_per_core": frames / seconds if seconds > 0 else 0.0,
+            "error": job.error,
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Apply the configured filter chain to video files")
+    parser.add_argument("inputs", nargs="+", help="Video files or directories")
+    parser.add_argument("--output", required=True, help="Output directory (also holds resume manifests)")
+    parser.add_argument("--filters", nargs="*", help="Filter chain (default: FILTER_CHAIN)")
+    parser.add_argument("--intensity", type=float, help="Filter intensity (default: FILTER_INTENSITY)")
+    parser.add_argument("--chunk-frames", type=int, default=300, help="Frames per range processed by one task")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Worker processes (default: PROCESSING_WORKERS or CPU count)")
+    args = parser.parse_args(argv)
+
+    load_dotenv(Path(__file__).parent.parent / ".env")
+    try:
+        config = Config()
+        if args.filters:
+            config.filter_chain = args.filters
+        if args.intensity is not None:
+            config.filter_intensity = args.intensity
+        processor = BatchProcessor.from_config(config, args.output, args.chunk_frames, args.workers)
+        summaries = processor.run(find_inputs(args.inputs))
+    except ApplicationError as e:
+        logger.error(f"Batch processing failed: {e}")
+        return 1
+    except Exception as e:
+        logger.error(f"Batch processing failed unexpectedly: {e}")
+        return 1
+    except KeyboardInterrupt:
+        logger.warning("Batch processing interrupted; run the same command again to resume")
+        return 130
+
+    failed = [summary["source"] for summary in summaries if not summary["complete"]]
+    if failed:
+        logger.error(f"{len(failed)} of {len(summaries)} files were not completed; run the same command to resume")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+import argparse
+import importlib
+import json
+import os
+import pkgutil
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from .camera.source import SyntheticSource
+from .filters import base as filters_base
+from .filters.base import BaseFilter, FilterFactory
+from .filters.parallel import TiledFilter
+
+# Разрешения для перебора: от VGA до 4K
+RESOLUTIONS: Dict[str, Tuple[int, int]] = {
+    "vga": (640, 480),
+    "hd": (1280, 720),
+    "fhd": (1920, 1080),
+    "4k": (3840, 2160),
+}
+
+DTYPES = {
+    "uint8": np.uint8,
+    "float32": np.float32,
+}
+
+
+def register_all_filters() -> List[str]:
+    """Импортирует все модули из src/filters, чтобы фильтры зарегистрировались в FilterFactory"""
+    package_path = Path(filters_base.__file__).parent
+    for module_info in pkgutil.iter_modules([str(package_path)]):
+        importlib.import_module(f"{filters_base.__package__}.{module_info.name}")
+    return FilterFactory.get_available_filters()
+
+
+def make_frames(width: int, height: int, dtype: str, count: int = 8) -> List[np.ndarray]:
+    """Набор воспроизводимых синтетических кадров"""
+    source = SyntheticSource(width, height, pattern="noise", seed=0)
+    source.open()
+    frames = []
+    for _ in range(count):
+        _, frame = source.read()
+        frames.append(frame.astype(DTYPES[dtype]) if dtype != "uint8" else frame)
+    return frames
+
+
+def measure_filter(
+    filter_name: str,
+    frames: List[np.ndarray],
+    intensity: float,
+    iterations: int,
+    warmup: int = 5
+) -> Dict[str, float]:
+    """Замер задержки, пропускной способности и пиковой памяти одного фильтра"""
+    image_filter = FilterFactory.create(filter_name, intensity)
+
+    # Прогрев: первые вызовы OpenCV включают выделение буферов и инициализацию потоков
+    for index in range(warmup):
+        image_filter.apply(frames[index % len(frames)])
+
+    latencies = np.empty(iterations, dtype=np.float64)
+    started = time.perf_counter()
+    for index in range(iterations):
+        frame = frames[index % len(frames)]
+        frame_started = time.perf_counter()
+        image_filter.apply(frame)
+        latencies[index] = time.perf_counter() - frame_started
+    total = time.perf_counter() - started
+
+    # Память замеряется отдельным проходом, т.к. tracemalloc искажает время
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    for index in range(min(iterations, 3)):
+        image_filter.apply(frames[index % len(frames)])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies_ms = latencies * 1000.0
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+    return {
+        "frames": iterations,
+        "fps": iterations / total if total > 0 else 0.0,
+        "mean_ms": float(latencies_ms.mean()),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(latencies_ms.max()),
+        "peak_memory_bytes": int(peak - baseline),
+    }
+
+
+def run_benchmark(
+    filter_names: Optional[Iterable[str]] = None,
+    resolutions: Optional[Dict[str, Tuple[int, int]]] = None,
+    intensities: Iterable[float] = (0.0, 0.5, 1.0),
+    dtypes: Iterable[str] = ("uint8",),
+    iterations: int = 50,
+    warmup: int = 5
+) -> Dict:
+    """Перебор фильтров, разрешений, интенсивностей и типов данных"""
+    available = register_all_filters()
+    filter_names = list(filter_names or available)
+    resolutions = resolutions or RESOLUTIONS
+
+    results = []
+    for resolution_name, (width, height) in resolutions.items():
+        for dtype in dtypes:
+            frames = make_frames(width, height, dtype)
+            for filter_name in filter_names:
+                for intensity in intensities:
+                    case = {
+                        "filter": filter_name,
+                        "resolution": resolution_name,
+                        "width": width,
+                        "height": height,
+                        "intensity": intensity,
+                        "dtype": dtype,
+                    }
+                    try:
+                        case.update(measure_filter(filter_name, frames, intensity, iterations, warmup))
+                        logger.info(
+                            f"{filter_name:<12} {resolution_name:<5} {dtype:<8} i={intensity:<4} "
+                            f"{case['fps']:9.1f} fps  p50={case['p50_ms']:.3f} ms  p99={case['p99_ms']:.3f} ms"
+                        )
+                    except Exception as e:
+                        case["error"] = str(e)
+                        logger.warning(f"{filter_name} {resolution_name} {dtype} failed: {e}")
+                    results.append(case)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "opencv_threads": cv2.getNumThreads(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def measure_tiled_speedup(
+    filter_name: str,
+    width: int,
+    height: int,
+    intensity: float = 1.0,
+    worker_counts: Iterable[int] = (1, 2, 4, 8),
+    iterations: int = 30,
+    warmup: int = 3
+) -> List[Dict]:
+    """
+        Ускорение параллельного выполнения по полосам относительно однопоточного фильтра
+        для каждого числа исполнителей. Заодно проверяется побитное совпадение результатов
+    """
+    register_all_filters()
+    frames = make_frames(width, height, "uint8", count=4)
+    image_filter = FilterFactory.create(filter_name, intensity)
+    dst = np.empty_like(frames[0])
+
+    def median_ms(apply_filter: BaseFilter) -> float:
+        for index in range(warmup):
+            apply_filter.apply_into(frames[index % len(frames)], dst)
+        latencies = []
+        for index in range(iterations):
+            started = time.perf_counter()
+            apply_filter.apply_into(frames[index % len(frames)], dst)
+            latencies.append(time.perf_counter() - started)
+        return float(np.median(latencies) * 1000.0)
+
+    baseline_ms = median_ms(image_filter)
+    expected = image_filter.apply(frames[0])
+    report = []
+    for workers in worker_counts:
+        tiled = TiledFilter(FilterFactory.create(filter_name, intensity), workers)
+        p50_ms = median_ms(tiled)
+        report.append({
+            "filter": filter_name,
+            "width": width,
+            "height": height,
+            "workers": workers,
+            "p50_ms": p50_ms,
+            "baseline_p50_ms": baseline_ms,
+            "speedup": baseline_ms / p50_ms if p50_ms > 0 else 0.0,
+            "identical": bool(np.array_equal(tiled.apply(frames[0]), expected)),
+        })
+    return report
+
+
+def _case_key(case: Dict) -> Tuple:
+    return case["filter"], case["resolution"], float(case["intensity"]), case["dtype"]
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = 0.1) -> List[Dict]:
+    """
+        Сравнение с сохранённым baseline.
+        Регрессия - рост медианной задержки больше чем на threshold (доля),
+        а также случай baseline, который в текущем прогоне отсутствует или завершился ошибкой
+    """
+    current_cases = {_case_key(case): case for case in current["results"]}
+    regressions = []
+    for reference in baseline["results"]:
+        if "error" in reference:
+            continue
+        regression = {
+            "filter": reference["filter"],
+            "resolution": reference["resolution"],
+            "intensity": reference["intensity"],
+            "dtype": reference["dtype"],
+            "baseline_p50_ms": reference["p50_ms"],
+        }
+        case = current_cases.get(_case_key(reference))
+        if case is None:
+            regressions.append(dict(regression, error="missing from current run"))
+            continue
+        if "error" in case:
+            regressions.append(dict(regression, error=case["error"]))
+            continue
+        if reference["p50_ms"] <= 0:
+            continue
+
+        change = case["p50_ms"] / reference["p50_ms"] - 1.0
+        if change > threshold:
+            regressions.append(dict(regression, current_p50_ms=case["p50_ms"], change=change))
+    return regressions
+
+
+def _parse_resolutions(names: List[str]) -> Dict[str, Tuple[int, int]]:
+    """Разрешения по имени (vga, hd, fhd, 4k) или в формате WIDTHxHEIGHT"""
+    resolutions = {}
+    for name in names:
+        if name in RESOLUTIONS:
+            resolutions[name] = RESOLUTIONS[name]
+        else:
+            width, height = name.lower().split("x")
+            resolutions[name] = (int(width), int(height))
+    return resolutions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Filter benchmark")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmark and write JSON results")
+    run_parser.add_argument("--output", default="bench_results.json")
+    run_parser.add_argument("--filters", nargs="*", help="Filters to measure (default: all registered)")
+    run_parser.add_argument("--resolutions", nargs="*", default=list(RESOLUTIONS))
+    run_parser.add_argument("--intensities", nargs="*", type=float, default=[0.0, 0.5, 1.0])
+    run_parser.add_argument("--dtypes", nargs="*", default=["uint8"], choices=list(DTYPES))
+    run_parser.add_argument("--iterations", type=int, default=50)
+    run_parser.add_argument("--warmup", type=int, default=5)
+    run_parser.add_argument("--baseline", help="Compare against this baseline after the run")
+    run_parser.add_argument("--threshold", type=float, default=0.1)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    tiles_parser = subparsers.add_parser("tiles", help="Report tiled execution speedup versus worker count")
+    tiles_parser.add_argument("--filters", nargs="*", default=["blur", "sharpen"])
+    tiles_parser.add_argument("--resolution", default="4k")
+    tiles_parser.add_argument("--intensity", type=float, default=1.0)
+    tiles_parser.add_argument("--workers", nargs="*", type=int, default=[1, 2, 4, 8])
+    tiles_parser.add_argument("--iterations", type=int, default=30)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "tiles":
+        width, height = _parse_resolutions([args.resolution])[args.resolution]
+        logger.info(f"OpenCV threads: {cv2.getNumThreads()}")
+        for filter_name in args.filters:
+            for row in measure_tiled_speedup(
+                filter_name, width, height, args.intensity, args.workers, args.iterations
+            ):
+                logger.info(
+                    f"{filter_name:<12} {args.resolution:<5} workers={row['workers']:<3} "
+                    f"p50={row['p50_ms']:.3f} ms (1 thread {row['baseline_p50_ms']:.3f} ms) "
+                    f"speedup x{row['speedup']:.2f} identical={row['identical']}"
+                )
+        return 0
+
+    if args.command == "run":
+        current = run_benchmark(
+            args.filters,
+            _parse_resolutions(args.resolutions),
+            args.intensities,
+            args.dtypes,
+            args.iterations,
+            args.warmup
+        )
+        Path(args.output).write_text(json.dumps(current, indent=2))
+        logger.info(f"Benchmark results written to {args.output}")
+        if not args.baseline:
+            return 0
+        baseline = json.loads(Path(args.baseline).read_text())
+    else:
+        baseline = json.loads(Path(args.baseline).read_text())
+        current = json.loads(Path(args.current).read_text())
+
+    regressions = compare_results(baseline, current, args.threshold)
+    for regression in regressions:
+        case_name = (
+            f"{regression['filter']} {regression['resolution']} {regression['dtype']} "
+            f"i={regression['intensity']}"
+        )
+        if "error" in regression:
+            logger.error(f"Regression: {case_name}: {regression['error']}")
+            continue
+        logger.error(
+            f"Regression: {case_name}: p50 {regression['baseline_p50_ms']:.3f} -> "
+            f"{regression['current_p50_ms']:.3f} ms (+{regression['change'] * 100:.1f}%)"
+        )
+    if regressions:
+        return 1
+
+    logger.info(f"No regressions beyond {args.threshold * 100:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, asdict
+from typing import TYPE_CHECKING, Dict, Optional, Type
+
+from ..exceptions import ConfigurationError
+
+if TYPE_CHECKING:
+    from .buffer import FrameRingBuffer
+
+
+@dataclass
+class FlowStats:
+    """Счётчики передачи кадров между захватом и отображением"""
+
+    produced: int = 0  # Кадров опубликовано производителем
+    consumed: int = 0  # Кадров получено потребителем
+    dropped: int = 0   # Кадров потеряно из-за переполнения
+    stale: int = 0     # Кадров вытеснено более новым кадром (почтовый ящик)
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class BackpressurePolicy(ABC):
+    """
+        Политика поведения кольцевого буфера при переполнении.
+        Все методы вызываются буфером под его блокировкой, поэтому счётчики не требуют своей
+    """
+
+    def __init__(self, timeout: float = 0.0):
+        self.timeout = timeout
+        self.stats = FlowStats()
+
+    @abstractmethod
+    def reserve(self, buffer: "FrameRingBuffer") -> Optional[int]:
+        """Выбирает индекс слота для записи или возвращает None, если новый кадр отбрасывается"""
+        pass
+
+    def publish(self, buffer: "FrameRingBuffer", index: int) -> None:
+        """Помещает заполненный слот в очередь готовых кадров"""
+        buffer._ready.append(index)
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Имя политики"""
+        pass
+
+
+class DropOldestPolicy(BackpressurePolicy):
+    """При переполнении перезаписывается самый старый непрочитанный кадр"""
+
+    def reserve(self, buffer: "FrameRingBuffer") -> Optional[int]:
+        if buffer._free:
+            return buffer._free.popleft()
+        if buffer._ready:
+            self.stats.dropped += 1
+            return buffer._evict_oldest()
+        # Все слоты удерживаются потребителями
+        self.stats.dropped += 1
+        return None
+
+    @property
+    def name(self) -> str:
+        return "drop_oldest"
+
+
+class DropNewestPolicy(BackpressurePolicy):
+    """При переполнении отбрасывается новый кадр, очередь не трогается"""
+
+    def reserve(self, buffer: "FrameRingBuffer") -> Optional[int]:
+        if buffer._free:
+            return buffer._free.popleft()
+        self.stats.dropped += 1
+        return None
+
+    @property
+    def name(self) -> str:
+        return "drop_newest"
+
+
+class BlockPolicy(BackpressurePolicy):
+    """Производитель ждёт свободный слот не дольше timeout, затем новый кадр отбрасывается"""
+
+    def reserve(self, buffer: "FrameRingBuffer") -> Optional[int]:
+        # wait_for отпускает блокировку буфера на время ожидания
+        if buffer._condition.wait_for(lambda: buffer._free or buffer._closed, self.timeout) and buffer._free:
+            return buffer._free.popleft()
+        self.stats.dropped += 1
+        return None
+
+    @property
+    def name(self) -> str:
+        return "block"
+
+
+class LatestOnlyPolicy(BackpressurePolicy):
+    """
+        Почтовый ящик на один кадр: новый кадр вытесняет все непрочитанные,
+        поэтому задержка отображения не превышает одного кадра
+    """
+
+    def reserve(self, buffer: "FrameRingBuffer") -> Optional[int]:
+        if buffer._free:
+            return buffer._free.popleft()
+        if buffer._ready:
+            self.stats.stale += 1
+            return buffer._evict_oldest()
+        self.stats.dropped += 1
+        return None
+
+    def publish(self, buffer: "FrameRingBuffer", index: int) -> None:
+        while buffer._ready:
+            buffer._recycle(buffer._evict_oldest())
+            self.stats.stale += 1
+        buffer._ready.append(index)
+
+    @property
+    def name(self) -> str:
+        return "latest_only"
+
+
+class BackpressureFactory:
+    """Для создания политик переполнения по имени"""
+
+    _policies: Dict[str, Type[BackpressurePolicy]] = {}
+
+    @classmethod
+    def register(cls, policy_class: Type[BackpressurePolicy]) -> None:
+        """Регистрирует класс политики"""
+        instance = policy_class()
+        cls._policies[instance.name] = policy_class
+
+    @classmethod
+    def create(cls, policy_name: str, timeout: float = 0.0) -> BackpressurePolicy:
+        """Создает экземпляр политики по имени"""
+        if policy_name not in cls._policies:
+            raise ConfigurationError(f"Unknown backpressure policy: {policy_name}")
+
+        return cls._policies[policy_name](timeout)
+
+    @classmethod
+    def get_available_policies(cls) -> list:
+        """Возврат списка имен доступных политик"""
+        return list(cls._policies.keys())
+
+
+BackpressureFactory.register(DropOldestPolicy)
+BackpressureFactory.register(DropNewestPolicy)
+BackpressureFactory.register(BlockPolicy)
+BackpressureFactory.register(LatestOnlyPolicy)
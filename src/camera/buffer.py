@@ -0,0 +1,278 @@
+import threading
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..exceptions import CameraError
+from ..utils.tracing import FrameRecord
+from .backpressure import BackpressurePolicy, DropOldestPolicy, FlowStats
+
+
+class FrameSlot:
+    """Слот кольцевого буфера с предвыделенным кадром"""
+
+    __slots__ = ("index", "frame", "state", "record")
+
+    FREE = 0     # Слот свободен и может быть заполнен
+    WRITING = 1  # Слот заполняется производителем
+    READY = 2    # Кадр готов к чтению
+    READING = 3  # Слот удерживается потребителем
+
+    def __init__(self, index: int, frame: np.ndarray):
+        self.index = index
+        self.frame = frame
+        self.state = FrameSlot.FREE
+        self.record = FrameRecord()  # Номер кадра и отметки времени этапов
+
+
+class FrameRingBuffer:
+    """
+        Кольцевой буфер предвыделенных кадров.
+        Производитель заполняет слот на месте (camera.read(image=slot.frame)) и публикует его,
+        потребитель получает слот во владение и обязательно возвращает его через release().
+        Слот, удерживаемый потребителем, никогда не перезаписывается.
+        Поведение при переполнении определяется политикой (по умолчанию - перезапись самого старого кадра).
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        frame_shape: Tuple[int, ...],
+        dtype: np.dtype = np.uint8,
+        policy: Optional[BackpressurePolicy] = None
+    ):
+        if capacity <= 0:
+            raise CameraError("Ring buffer capacity must be positive")
+
+        self._slots: List[FrameSlot] = [
+            FrameSlot(index, np.zeros(frame_shape, dtype=dtype)) for index in range(capacity)
+        ]
+        self._free: Deque[int] = deque(range(capacity))  # Индексы свободных слотов
+        self._ready: Deque[int] = deque()                # Индексы готовых кадров, от старых к новым
+        self._condition = threading.Condition()
+        self._closed = False
+        self.policy = policy or DropOldestPolicy()
+
+        self.overwrites = 0  # Сколько готовых кадров перезаписано до чтения
+
+    @property
+    def capacity(self) -> int:
+        return len(self._slots)
+
+    @property
+    def occupancy(self) -> int:
+        """Количество готовых, но ещё не прочитанных кадров"""
+        with self._condition:
+            return len(self._ready)
+
+    @property
+    def stats(self) -> FlowStats:
+        """Счётчики политики переполнения"""
+        return self.policy.stats
+
+    def _evict_oldest(self) -> int:
+        """Забирает самый старый готовый кадр для перезаписи (вызывается под блокировкой)"""
+        self.overwrites += 1
+        return self._ready.popleft()
+
+    def _recycle(self, index: int) -> None:
+        """Возвращает слот в пул свободных (вызывается под блокировкой)"""
+        self._slots[index].state = FrameSlot.FREE
+        self._free.append(index)
+
+    def acquire_write(self) -> Optional[FrameSlot]:
+        """
+            Выдаёт слот для записи. Если свободных слотов нет, решение принимает политика переполнения.
+            Возвращает None, если новый кадр должен быть отброшен
+        """
+        with self._condition:
+            if self._closed:
+                return None
+            index = self.policy.reserve(self)
+            if index is None:
+                return None
+
+            slot = self._slots[index]
+            slot.state = FrameSlot.WRITING
+            return slot
+
+    def commit(self, slot: FrameSlot, frame: Optional[np.ndarray] = None) -> None:
+        """
+            Публикует заполненный слот.
+            Если камера вернула другой массив (например, при смене разрешения), слот принимает его
+        """
+        with self._condition:
+            if frame is not None and frame is not slot.frame:
+                slot.frame = frame
+            slot.state = FrameSlot.READY
+            self.policy.publish(self, slot.index)
+            self.policy.stats.produced += 1
+            self._condition.notify_all()
+
+    def abort(self, slot: FrameSlot) -> None:
+        """Возвращает слот, который не удалось заполнить"""
+        with self._condition:
+            self._recycle(slot.index)
+            self._condition.notify_all()
+
+    def acquire_read(self, timeout: Optional[float] = None) -> Optional[FrameSlot]:
+        """Ожидает самый старый готовый кадр. Возвращает None по таймауту или после close()"""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._ready or self._closed, timeout):
+                return None
+            if not self._ready:
+                return None
+
+            slot = self._slots[self._ready.popleft()]
+            slot.state = FrameSlot.READING
+            self.policy.stats.consumed += 1
+            return slot
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Ожидание готового кадра без его получения"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._ready or self._closed, timeout) and bool(self._ready)
+
+    def newest_timestamp(self) -> Optional[float]:
+        """Время захвата самого нового готового кадра"""
+        with self._condition:
+            if not self._ready:
+                return None
+            return self._slots[self._ready[-1]].record.capture_ts
+
+    def acquire_nearest(self, timestamp: float) -> Optional[FrameSlot]:
+        """
+            Получение готового кадра, ближайшего по времени захвата к timestamp.
+            Более старые готовые кадры возвращаются в пул и учитываются как вытесненные
+        """
+        with self._condition:
+            if not self._ready:
+                return None
+            nearest = min(
+                range(len(self._ready)),
+                key=lambda position: abs(self._slots[self._ready[position]].record.capture_ts - timestamp)
+            )
+            for _ in range(nearest):
+                self._recycle(self._ready.popleft())
+                self.policy.stats.stale += 1
+
+            slot = self._slots[self._ready.popleft()]
+            slot.state = FrameSlot.READING
+            self.policy.stats.consumed += 1
+            self._condition.notify_all()
+            return slot
+
+    def release(self, slot: FrameSlot) -> None:
+        """Возвращает прочитанный слот в пул свободных"""
+        with self._condition:
+            if slot.state != FrameSlot.READING:
+                raise CameraError(f"Slot {slot.index} is not held by a consumer")
+            self._recycle(slot.index)
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """Будит ожидающих потребителей при остановке захвата"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class DeferredDecodeBuffer:
+    """
+        Буфер для режима захвата grab/retrieve.
+        Поток захвата только вызывает grab() и сообщает о новом кадре через notify_grab(),
+        а декодирование (retrieve) выполняется в потоке потребителя и только для кадров,
+        которые он действительно забирает. Кадры, захваченные между двумя чтениями, не декодируются.
+        Интерфейс потребителя совпадает с FrameRingBuffer (acquire_read/release)
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        frame_shape: Tuple[int, ...],
+        retrieve: Callable[[np.ndarray], Tuple[bool, Optional[np.ndarray], int, float]],
+        dtype: np.dtype = np.uint8
+    ):
+        if capacity <= 0:
+            raise CameraError("Ring buffer capacity must be positive")
+
+        self._slots: List[FrameSlot] = [
+            FrameSlot(index, np.zeros(frame_shape, dtype=dtype)) for index in range(capacity)
+        ]
+        self._free: Deque[int] = deque(range(capacity))
+        self._condition = threading.Condition()
+        self._closed = False
+        # Функция декодирования последнего захваченного кадра в переданный массив,
+        # возвращает (успех, кадр, порядковый номер захвата, время захвата)
+        self._retrieve = retrieve
+
+        self._grabbed = 0    # Порядковый номер последнего захваченного кадра
+        self._retrieved = 0  # Порядковый номер последнего декодированного кадра
+        self.stats = FlowStats()
+
+    @property
+    def capacity(self) -> int:
+        return len(self._slots)
+
+    @property
+    def occupancy(self) -> int:
+        """1, если есть захваченный, но ещё не декодированный кадр"""
+        with self._condition:
+            return int(self._grabbed > self._retrieved)
+
+    def notify_grab(self, sequence: int) -> None:
+        """Сообщает потребителям о захвате нового кадра"""
+        with self._condition:
+            self._grabbed = sequence
+            self.stats.produced += 1
+            self._condition.notify_all()
+
+    def acquire_read(self, timeout: Optional[float] = None) -> Optional[FrameSlot]:
+        """Ожидает новый захваченный кадр и декодирует его в свободный слот"""
+        with self._condition:
+            ready = self._condition.wait_for(
+                lambda: (self._grabbed > self._retrieved and self._free) or self._closed,
+                timeout
+            )
+            if not ready or self._closed:
+                return None
+            slot = self._slots[self._free.popleft()]
+            slot.state = FrameSlot.READING
+
+        # Декодирование вне блокировки буфера, чтобы не задерживать notify_grab()
+        ok, frame, sequence, grab_ts = self._retrieve(slot.frame)
+
+        with self._condition:
+            if not ok or frame is None:
+                slot.state = FrameSlot.FREE
+                self._free.append(slot.index)
+                return None
+
+            if frame is not slot.frame:
+                slot.frame = frame
+            slot.record.begin(sequence, grab_ts)
+            # Кадры между двумя декодированиями пропущены без затрат на декодирование
+            self.stats.stale += max(0, sequence - self._retrieved - 1)
+            self._retrieved = max(self._retrieved, sequence)
+            self.stats.consumed += 1
+            return slot
+
+    def release(self, slot: FrameSlot) -> None:
+        """Возвращает прочитанный слот в пул свободных"""
+        with self._condition:
+            if slot.state != FrameSlot.READING:
+                raise CameraError(f"Slot {slot.index} is not held by a consumer")
+            slot.state = FrameSlot.FREE
+            self._free.append(slot.index)
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """Будит ожидающих потребителей при остановке захвата"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+# Любой буфер, из которого потребитель забирает кадры через acquire_read/release
+FrameBuffer = Union[FrameRingBuffer, DeferredDecodeBuffer]
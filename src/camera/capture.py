@@ -1,93 +1,238 @@
 import threading
 import time
-from queue import Queue, Full
-from typing import Optional
+from typing import Optional, Tuple
 
-import cv2
+import numpy as np
 from loguru import logger
 
 from ..config import Config
-from ..exceptions import CameraError
+from ..exceptions import CameraError, ExportError
+from ..utils.metrics import REGISTRY, FrameRateGauge
+from ..utils.shared_ring import SharedFrameRing
+from .backpressure import BackpressureFactory
+from .buffer import DeferredDecodeBuffer, FrameBuffer, FrameRingBuffer
+from .hub import FrameHub, FrameSubscription
+from .pacing import FramePacer
+from .source import FrameSource, create_frame_source
 
 
 class CameraCapture:
     """Обрабатывает захват видео с камеры"""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, camera_index: Optional[int] = None):
         self.config = config
-        self.camera: Optional[cv2.VideoCapture] = None
-        self.frame_queue: Queue = Queue(maxsize=config.max_queue_size)
+        # Номер камеры; по умолчанию - CAMERA_INDEX
+        self.camera_index = config.camera_index if camera_index is None else camera_index
+        self.camera: Optional[FrameSource] = None
+        frame_shape = (config.frame_height, config.frame_width, 3)
+        self.frame_buffer: FrameBuffer
+        # Рассылка кадров нескольким потребителям; окно - один из подписчиков
+        self.frame_hub: Optional[FrameHub] = None
+        if config.capture_mode == "grab":
+            # Декодирование по запросу: поток захвата только вызывает grab(),
+            # retrieve() выполняется потребителем для кадров, которые он забирает
+            self.frame_buffer = DeferredDecodeBuffer(config.max_queue_size, frame_shape, self._retrieve_frame)
+        elif config.frame_hub:
+            # Захват пишет в общий пул хаба, окно читает через свою подписку без копирования
+            self.frame_hub = FrameHub(frame_shape, camera_label=str(self.camera_index))
+            self.frame_buffer = self.frame_hub.subscribe("display", config.max_queue_size, config.backpressure_policy)
+        else:
+            # Кольцо предвыделенных кадров, размер задаётся max_queue_size,
+            # поведение при переполнении - политикой backpressure_policy
+            self.frame_buffer = FrameRingBuffer(
+                config.max_queue_size,
+                frame_shape,
+                policy=BackpressureFactory.create(config.backpressure_policy, config.backpressure_timeout)
+            )
+        # Куда пишет поток захвата: хаб или кольцевой буфер окна
+        self.frame_writer = self.frame_hub or self.frame_buffer
+        self.frame_sequence = 0  # Порядковый номер последнего захваченного кадра
+        self.grab_timestamp = 0.0  # Время последнего grab() в режиме grab
+        # Планировщик частоты кадров по монотонным дедлайнам; None - захват без ограничения частоты
+        self.pacer: Optional[FramePacer] = FramePacer(config.fps, config.pacing_mode, config.pacing_spin_threshold)
         self.capture_lock = threading.Lock() # Блокировка для потокобезопасного доступа к камере
         self.is_capturing = False
+        # Кольцо разделяемой памяти для кадров захвата (SHM_EXPORT=raw); создаётся по первому кадру
+        self.export_raw = "raw" in config.shm_export
+        self.frame_export: Optional[SharedFrameRing] = None
+        self._register_metrics(str(self.camera_index))
+
+    def _register_metrics(self, camera_label: str) -> None:
+        """Метрики захвата. В цикле только увеличиваются счётчики, остальное вычисляется при чтении метрик"""
+        self.frames_metric = REGISTRY.counter(
+            "video_capture_frames_total", "Frames captured from the source"
+        ).labels(camera=camera_label)
+        self.read_failures_metric = REGISTRY.counter(
+            "video_capture_read_failures_total", "Failed reads from the source"
+        ).labels(camera=camera_label)
+        REGISTRY.gauge("video_capture_fps", "Capture frame rate since the previous scrape").labels(
+            camera=camera_label
+        ).set_function(FrameRateGauge(self.frames_metric))
+        REGISTRY.gauge("video_queue_depth", "Frames waiting in the capture buffer").labels(
+            camera=camera_label
+        ).set_function(lambda: self.frame_buffer.occupancy)
+        REGISTRY.counter("video_frames_dropped_total", "Frames dropped by the backpressure policy").labels(
+            camera=camera_label
+        ).set_function(lambda: self.frame_buffer.stats.dropped)
+        REGISTRY.counter("video_frames_stale_total", "Frames superseded by a newer frame before display").labels(
+            camera=camera_label
+        ).set_function(lambda: self.frame_buffer.stats.stale)
 
     def initialize(self) -> None:
         """Инициализирует захват с камеры"""
         try:
-            self.camera = cv2.VideoCapture(self.config.camera_index)
-            if not self.camera.isOpened():
-                raise CameraError(f"Failed to open camera {self.config.camera_index}")
+            # Источник кадров выбирается в конфигурации: камера, видеофайл, изображения или синтетика
+            self.camera = create_frame_source(self.config, self.camera_index)
+            self.camera.open()
 
-            # Установка свойств камеры (ширина, высота, FPS)
-            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.config.frame_width)
-            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.config.frame_height)
-            self.camera.set(cv2.CAP_PROP_FPS, self.config.fps)
+            # Частота захвата задаётся источником (например, FPS видеофайла)
+            source_fps = self.camera.fps
+            if source_fps:
+                self.pacer = FramePacer(source_fps, self.config.pacing_mode, self.config.pacing_spin_threshold)
+            else:
+                self.pacer = None
 
-            logger.info(f"Camera initialized: {self.config.camera_index}")
+            logger.info(f"Camera initialized: {self.camera.name}")
 
         except Exception as e:
             raise CameraError(f"Failed to initialize camera: {e}")
 
     def start_capture(self, shutdown_event: threading.Event) -> None:
         """Запускает захват кадров в цикле"""
-        if not self.camera:
-            raise CameraError("Camera not initialized")
-
-        self.is_capturing = True            # Флаг захвата кадров
-        frame_time = 1.0 / self.config.fps  # Время между кадрами в секундах
-
-        logger.info("Starting camera capture")
+        self.begin_capture()
 
         try:
             # Цикл захвата кадров
             while not shutdown_event.is_set() and self.is_capturing:
-                start_time = time.time()
-
-                # Захват кадра с блокировкой для потокобезопасности
-                with self.capture_lock:
-                    ret, frame = self.camera.read()
-
-                if not ret:  # Если кадр не был захвачен, пропускаем итерацию
-                    logger.warning("Failed to read frame from camera")
-                    continue
-
-                # Добавление кадра в очередь
-                try:
-                    self.frame_queue.put(frame, block=False)
-                except Full:
-                    # Если очередь заполнена, удаляем самый старый кадр
-                    try:
-                        self.frame_queue.get_nowait()
-                        self.frame_queue.put(frame, block=False)
-                    except:
-                        pass
-
-                # Поддержание частоты кадров
-                elapsed = time.time() - start_time
-                # Вычисление времени ожидания для поддержания заданного FPS
-                sleep_time = max(0, int(frame_time - elapsed))
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
+                # Поддержание частоты кадров: ожидание дедлайна очередного кадра.
+                # Ожидание в начале итерации распространяется и на итерации с ошибкой чтения
+                if self.pacer:
+                    self.pacer.wait()
+                self.capture_once()
 
         except Exception as e:
             logger.error(f"Capture error: {e}")
             raise CameraError(f"Capture failed: {e}")
         finally:
-            self.is_capturing = False
-            logger.info("Camera capture stopped")
+            self.end_capture()
+
+    def begin_capture(self) -> None:
+        """Подготовка к захвату: флаг захвата и новое расписание кадров"""
+        if not self.camera:
+            raise CameraError("Camera not initialized")
+        self.is_capturing = True            # Флаг захвата кадров
+        self.export_raw = "raw" in self.config.shm_export
+        if self.pacer:
+            self.pacer.reset()
+        logger.info(f"Starting camera capture: camera {self.camera_index}")
+
+    def capture_once(self) -> None:
+        """Одна итерация захвата без ожидания дедлайна (его соблюдает вызывающий цикл или планировщик)"""
+        if self.config.capture_mode == "grab":
+            self._grab_frame()
+        else:
+            self._read_frame()
+
+    def end_capture(self) -> None:
+        """Завершение захвата и сводка по потоку кадров"""
+        self.is_capturing = False
+        # Кольцо закрывается в потоке захвата, после последней публикации
+        self._close_export()
+        logger.info(f"Camera {self.camera_index} capture stopped, frame flow: {self.frame_buffer.stats.as_dict()}")
+        if self.pacer:
+            logger.info(f"Camera {self.camera_index} capture pacing (ms): {self.pacer.jitter_stats()}")
+
+    def _read_frame(self) -> None:
+        """Захват и декодирование одного кадра в слот кольцевого буфера"""
+        # Слот для записи; если политика отбрасывает кадр, он только считывается с устройства
+        # без декодирования, чтобы камера не накапливала старые кадры
+        slot = self.frame_writer.acquire_write()
+        if slot is None:
+            with self.capture_lock:
+                self.camera.grab()
+            return
+
+        # Захват кадра прямо в предвыделенный буфер с блокировкой для потокобезопасности
+        with self.capture_lock:
+            ret, frame = self.camera.read(image=slot.frame)
+
+        if not ret or frame is None:  # Если кадр не был захвачен, пропускаем итерацию
+            self.frame_writer.abort(slot)
+            if self.camera.exhausted:
+                self._source_ended()
+                return
+            self.read_failures_metric.inc()
+            logger.warning("Failed to read frame from camera")
+            return
+
+        self.frames_metric.inc()
+        self.frame_sequence += 1
+        slot.record.begin(self.frame_sequence, time.perf_counter())
+        self.frame_writer.commit(slot, frame)
+        if self.export_raw:
+            # Копия в кольцо без ожидания читателей; потребители этого процесса читают кадр параллельно.
+            # Под блокировкой захвата, чтобы stop_capture() не закрыл кольцо во время записи
+            with self.capture_lock:
+                self._export_frame(frame, self.frame_sequence, slot.record.capture_ts)
+
+    def _source_ended(self) -> None:
+        """Кадры источника закончились: цикл захвата (или планировщик) завершает захват этой камеры"""
+        logger.info(f"Camera {self.camera_index} source ended: {self.camera.name}")
+        self.is_capturing = False
+
+    def _export_frame(self, frame: np.ndarray, sequence: int, timestamp: float) -> None:
+        """Публикация кадра захвата в разделяемую память (вызывается под блокировкой захвата)"""
+        if not self.export_raw:
+            return
+        if self.frame_export is None:
+            name = f"{self.config.shm_name}_raw_{self.camera_index}"
+            try:
+                self.frame_export = SharedFrameRing(name, self.config.shm_slots, frame.nbytes)
+            except (OSError, ExportError) as e:
+                # Экспорт необязателен: без него захват продолжается
+                logger.error(f"Failed to create shared memory ring {name}: {e}")
+                self.export_raw = False
+                return
+        self.frame_export.publish(frame, sequence, timestamp)
+
+    def _close_export(self) -> None:
+        """Закрытие кольца экспорта; после него кадры больше не публикуются"""
+        with self.capture_lock:
+            self.export_raw = False
+            if self.frame_export is not None:
+                self.frame_export.close()
+                self.frame_export = None
+
+    def _grab_frame(self) -> None:
+        """Захват кадра без декодирования (режим grab)"""
+        with self.capture_lock:
+            if not self.camera.grab():
+                if self.camera.exhausted:
+                    self._source_ended()
+                    return
+                self.read_failures_metric.inc()
+                logger.warning("Failed to grab frame from camera")
+                return
+            self.frames_metric.inc()
+            self.frame_sequence += 1
+            self.grab_timestamp = time.perf_counter()
+            sequence = self.frame_sequence
+
+        self.frame_buffer.notify_grab(sequence)
+
+    def _retrieve_frame(self, image: np.ndarray) -> Tuple[bool, Optional[np.ndarray], int, float]:
+        """Декодирование последнего захваченного кадра в переданный массив (вызывается потребителем)"""
+        with self.capture_lock:
+            if not self.camera or not self.is_capturing:
+                return False, None, self.frame_sequence, self.grab_timestamp
+            ret, frame = self.camera.retrieve(image=image)
+            return ret, frame, self.frame_sequence, self.grab_timestamp
 
     def stop_capture(self) -> None:
         """Останавливает захват"""
         self.is_capturing = False
+        self.frame_writer.close()
+        self._close_export()
 
         if self.camera:
             # с блокировкой освобождаем ресурсы камеры
@@ -95,6 +240,12 @@ class CameraCapture:
                 self.camera.release()
             logger.info("Camera released")
 
-    def get_frame_queue(self) -> Queue:
-        """Возвращает очередь кадров"""
-        return self.frame_queue
\ No newline at end of file
+    def get_frame_buffer(self) -> FrameBuffer:
+        """Возвращает кольцевой буфер кадров"""
+        return self.frame_buffer
+
+    def subscribe(self, name: str, depth: int = 2, policy: str = "drop_oldest") -> FrameSubscription:
+        """Подписка дополнительного потребителя на кадры камеры (требует FRAME_HUB)"""
+        if self.frame_hub is None:
+            raise CameraError("Frame subscriptions require FRAME_HUB=true and CAPTURE_MODE=read")
+        return self.frame_hub.subscribe(name, depth, policy)
\ No newline at end of file
@@ -0,0 +1,297 @@
+import threading
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..exceptions import CameraError
+from ..utils.metrics import REGISTRY
+from .backpressure import FlowStats
+from .buffer import FrameSlot
+
+# Политики подписчика при переполнении его очереди. Ожидания (block) нет:
+# производитель никогда не ждёт подписчиков, иначе медленный подписчик задерживал бы остальных
+SUBSCRIBER_POLICIES = ["drop_oldest", "drop_newest", "latest_only"]
+
+
+class FrameSubscription:
+    """
+        Подписка на кадры FrameHub со своим курсором (очередью), глубиной и политикой переполнения.
+        Интерфейс потребителя совпадает с FrameRingBuffer (acquire_read/release), но кадр выдаётся
+        как представление только для чтения общего кадра хаба - без копирования.
+        Запись FrameRecord у подписки своя, поэтому отметки этапов подписчиков не смешиваются
+    """
+
+    def __init__(self, hub: "FrameHub", name: str, depth: int, policy: str):
+        if depth <= 0:
+            raise CameraError("Subscription depth must be positive")
+        if policy not in SUBSCRIBER_POLICIES:
+            raise CameraError(f"Unsupported subscriber policy: {policy}")
+
+        self.hub = hub
+        self.name = name
+        self.depth = depth
+        self.policy = policy
+        self.stats = FlowStats()
+        self._queue: Deque[int] = deque()  # Индексы слотов хаба, от старых к новым
+        # Слоты подписки по индексу слота хаба: представление кадра только для чтения и своя запись
+        self._views: Dict[int, FrameSlot] = {}
+        self._view_sources: Dict[int, np.ndarray] = {}
+        self._held = 0
+        self._last_sequence = 0  # Номер последнего полученного кадра
+        self._closed = False
+        # Вызывается под блокировкой хаба при новом кадре в очереди и при закрытии подписки
+        self._listener: Optional[Callable[[], None]] = None
+
+    @property
+    def capacity(self) -> int:
+        return self.depth
+
+    @property
+    def occupancy(self) -> int:
+        """Количество кадров в очереди подписчика"""
+        with self.hub._condition:
+            return len(self._queue)
+
+    @property
+    def lag(self) -> int:
+        """На сколько кадров подписчик отстаёт от производителя"""
+        with self.hub._condition:
+            return max(0, self.hub.sequence - self._last_sequence)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def set_listener(self, listener: Optional[Callable[[], None]]) -> None:
+        """
+            Уведомление о новом кадре или закрытии подписки вместо ожидания в acquire_read.
+            Слушатель вызывается в потоке производителя под блокировкой хаба, поэтому должен только
+            передать сигнал (например, через loop.call_soon_threadsafe) и не обращаться к хабу
+        """
+        with self.hub._condition:
+            self._listener = listener
+
+    def _notify(self) -> None:
+        if self._listener is not None:
+            self._listener()
+
+    def _offer(self, index: int) -> bool:
+        """Постановка опубликованного кадра в очередь (вызывается под блокировкой хаба)"""
+        self.stats.produced += 1
+        if self.policy == "latest_only":
+            while self._queue:
+                self.hub._unref(self._queue.popleft())
+                self.stats.stale += 1
+        elif len(self._queue) >= self.depth:
+            if self.policy == "drop_newest":
+                self.stats.dropped += 1
+                return False
+            self.hub._unref(self._queue.popleft())
+            self.stats.dropped += 1
+        self._queue.append(index)
+        self._notify()
+        return True
+
+    def _view_slot(self, index: int) -> FrameSlot:
+        """Слот подписки для слота хаба; представление пересоздаётся, только если хаб сменил массив кадра"""
+        source = self.hub._slots[index].frame
+        view_slot = self._views.get(index)
+        if view_slot is None or self._view_sources.get(index) is not source:
+            view = source.view()
+            view.flags.writeable = False
+            view_slot = FrameSlot(index, view)
+            self._views[index] = view_slot
+            self._view_sources[index] = source
+        return view_slot
+
+    def acquire_read(self, timeout: Optional[float] = None) -> Optional[FrameSlot]:
+        """Ожидает самый старый кадр в очереди подписчика. Возвращает None по таймауту или после закрытия"""
+        with self.hub._condition:
+            if not self.hub._condition.wait_for(lambda: self._queue or self._closed, timeout):
+                return None
+            if not self._queue:
+                return None
+
+            index = self._queue.popleft()
+            view_slot = self._view_slot(index)
+            view_slot.record.copy_from(self.hub._slots[index].record)
+            view_slot.state = FrameSlot.READING
+            self._held += 1
+            self._last_sequence = view_slot.record.sequence
+            self.stats.consumed += 1
+            return view_slot
+
+    def release(self, slot: FrameSlot) -> None:
+        """Возвращает кадр хабу; слот освобождается, когда его отпустят все подписчики"""
+        with self.hub._condition:
+            if slot.state != FrameSlot.READING or self._views.get(slot.index) is not slot:
+                raise CameraError(f"Slot {slot.index} is not held by subscriber '{self.name}'")
+            slot.state = FrameSlot.FREE
+            self._held -= 1
+            self.hub._unref(slot.index)
+            self.hub._condition.notify_all()
+
+    def close(self) -> None:
+        """Отписка: кадры из очереди возвращаются хабу, ожидающий потребитель просыпается"""
+        self.hub.unsubscribe(self)
+
+
+class FrameHub:
+    """
+        Рассылка кадров захвата нескольким потребителям без копирования.
+        Производитель заполняет слот на месте (интерфейс acquire_write/commit/abort как у FrameRingBuffer),
+        опубликованный слот попадает в очереди всех подписчиков, а счётчик ссылок возвращает его в пул,
+        когда кадр отпустят все. Пул растёт при подписке на глубину очереди подписчика плюс удерживаемый кадр,
+        поэтому производитель не ждёт даже самого медленного подписчика: переполнение каждой очереди
+        обрабатывает политика этого подписчика. После отписки лишние слоты пула выводятся из оборота
+        (их кадры освобождаются), как только на них не останется ссылок, и повторно используются
+        следующими подписчиками
+    """
+
+    def __init__(self, frame_shape: Tuple[int, ...], dtype: np.dtype = np.uint8, camera_label: str = "0"):
+        self._frame_shape = tuple(frame_shape)
+        self._dtype = dtype
+        # Один слот всегда остаётся для записи производителем
+        self._slots: List[FrameSlot] = [FrameSlot(0, np.zeros(self._frame_shape, dtype=dtype))]
+        self._refs: List[int] = [0]
+        self._free: Deque[int] = deque([0])
+        self._retired: List[int] = []  # Слоты без кадра, освобождённые после отписки
+        self._reserved = 1  # Сколько слотов с кадрами нужно текущим подписчикам и производителю
+        self._subscribers: Dict[str, FrameSubscription] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self.camera_label = camera_label
+        self.sequence = 0  # Номер последнего опубликованного кадра
+        self.stats = FlowStats()
+
+    @property
+    def capacity(self) -> int:
+        """Количество слотов пула с кадрами"""
+        with self._condition:
+            return len(self._slots) - len(self._retired)
+
+    @property
+    def occupancy(self) -> int:
+        """Количество слотов, на которые ссылаются подписчики"""
+        with self._condition:
+            return len(self._slots) - len(self._retired) - len(self._free)
+
+    @property
+    def subscribers(self) -> Dict[str, FrameSubscription]:
+        with self._condition:
+            return dict(self._subscribers)
+
+    def subscribe(self, name: str, depth: int = 2, policy: str = "drop_oldest") -> FrameSubscription:
+        """Новая подписка со своей очередью глубины depth и политикой переполнения"""
+        subscription = FrameSubscription(self, name, depth, policy)
+        with self._condition:
+            if name in self._subscribers:
+                raise CameraError(f"Subscriber already exists: {name}")
+            self._reserved += depth + 1
+            while len(self._slots) - len(self._retired) < self._reserved:
+                frame = np.zeros(self._frame_shape, dtype=self._dtype)
+                if self._retired:
+                    index = self._retired.pop()
+                    self._slots[index].frame = frame
+                else:
+                    index = len(self._slots)
+                    self._slots.append(FrameSlot(index, frame))
+                    self._refs.append(0)
+                self._free.append(index)
+            self._subscribers[name] = subscription
+            # Подписка на остановленный захват сразу закрыта, чтобы потребитель не ждал кадров
+            subscription._closed = self._closed
+
+        labels = {"camera": self.camera_label, "subscriber": name}
+        REGISTRY.gauge("video_subscriber_lag", "Frames a hub subscriber is behind the producer").labels(
+            **labels
+        ).set_function(lambda: subscription.lag)
+        REGISTRY.counter("video_subscriber_dropped_total", "Frames dropped by a hub subscriber policy").labels(
+            **labels
+        ).set_function(lambda: subscription.stats.dropped + subscription.stats.stale)
+        return subscription
+
+    def unsubscribe(self, subscription: FrameSubscription) -> None:
+        """
+            Удаление подписки и её серий метрик. Слоты подписки освобождаются, когда на них не останется
+            ссылок (кадры, которые потребитель ещё держит, возвращаются при release)
+        """
+        with self._condition:
+            if self._subscribers.get(subscription.name) is not subscription:
+                return
+            del self._subscribers[subscription.name]
+            self._reserved -= subscription.depth + 1
+            while subscription._queue:
+                self._unref(subscription._queue.popleft())
+            while self._free and len(self._slots) - len(self._retired) > self._reserved:
+                self._retire(self._free.pop())
+            subscription._closed = True
+            subscription._notify()
+            self._condition.notify_all()
+
+        labels = {"camera": self.camera_label, "subscriber": subscription.name}
+        REGISTRY.gauge("video_subscriber_lag", "Frames a hub subscriber is behind the producer").remove(**labels)
+        REGISTRY.counter("video_subscriber_dropped_total", "Frames dropped by a hub subscriber policy").remove(
+            **labels
+        )
+
+    def _retire(self, index: int) -> None:
+        """Вывод свободного слота из пула: кадр и представления подписчиков освобождаются (под блокировкой)"""
+        self._slots[index].frame = np.empty(0, dtype=self._dtype)
+        for subscription in self._subscribers.values():
+            subscription._views.pop(index, None)
+            subscription._view_sources.pop(index, None)
+        self._retired.append(index)
+
+    def _unref(self, index: int) -> None:
+        """Снятие ссылки на слот (вызывается под блокировкой)"""
+        self._refs[index] -= 1
+        if self._refs[index] == 0:
+            self._slots[index].state = FrameSlot.FREE
+            if len(self._slots) - len(self._retired) > self._reserved:
+                self._retire(index)
+            else:
+                self._free.append(index)
+
+    def acquire_write(self) -> Optional[FrameSlot]:
+        """Выдаёт свободный слот для записи; None, если подписчики удерживают все слоты"""
+        with self._condition:
+            if self._closed:
+                return None
+            if not self._free:
+                self.stats.dropped += 1
+                return None
+            slot = self._slots[self._free.popleft()]
+            slot.state = FrameSlot.WRITING
+            return slot
+
+    def commit(self, slot: FrameSlot, frame: Optional[np.ndarray] = None) -> None:
+        """Публикует кадр всем подписчикам; слот без подписчиков сразу возвращается в пул"""
+        with self._condition:
+            if frame is not None and frame is not slot.frame:
+                slot.frame = frame
+            slot.state = FrameSlot.READY
+            self.sequence = max(self.sequence, slot.record.sequence)
+            self.stats.produced += 1
+            self._refs[slot.index] = 1  # Ссылка производителя на время рассылки
+            for subscription in self._subscribers.values():
+                if subscription._offer(slot.index):
+                    self._refs[slot.index] += 1
+            self._unref(slot.index)
+            self._condition.notify_all()
+
+    def abort(self, slot: FrameSlot) -> None:
+        """Возвращает слот, который не удалось заполнить"""
+        with self._condition:
+            slot.state = FrameSlot.FREE
+            self._free.append(slot.index)
+
+    def close(self) -> None:
+        """Будит ожидающих подписчиков при остановке захвата"""
+        with self._condition:
+            self._closed = True
+            for subscription in self._subscribers.values():
+                subscription._closed = True
+                subscription._notify()
+            self._condition.notify_all()
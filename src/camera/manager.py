@@ -1,26 +1,56 @@
+import asyncio
+import itertools
 import threading
-from queue import Queue
-from typing import Optional
+from typing import Dict, List, Optional
 from loguru import logger
+import numpy as np
 
 from ..config import Config
 from ..exceptions import CameraError
+from ..camera.buffer import FrameBuffer
 from ..camera.capture import CameraCapture
+from ..camera.hub import FrameSubscription
+from ..camera.scheduler import CaptureScheduler, FrameSet, FrameSynchronizer
+from ..camera.stream import AsyncFrameStream
 
 
 class CameraManager:
-    """Управляет операциями захвата изображенияя с камеры"""
+    """
+        Управляет операциями захвата изображения с одной или нескольких камер (CAMERA_INDICES).
+        У каждой камеры свой буфер и своё расписание кадров, а потоки захвата общие
+        (не больше CAPTURE_THREADS)
+    """
 
     def __init__(self, config: Config):
         self.config = config
-        self.capture = CameraCapture(config)
+        self.captures: Dict[int, CameraCapture] = {
+            camera_index: CameraCapture(config, camera_index) for camera_index in config.camera_indices
+        }
+        # Основная камера: её поток кадров выводится в окно
+        self.capture = self.captures[config.camera_indices[0]]
+        self.scheduler = CaptureScheduler(list(self.captures.values()), config.capture_threads)
+        self._synchronizer: Optional[FrameSynchronizer] = None
+        self._stream_ids = itertools.count(1)  # Имена подписок асинхронных потоков кадров
+        # Постоянные подписки latest_only для latest_frame() по камерам, чтобы не подписываться на каждый вызов
+        self._latest_streams: Dict[int, AsyncFrameStream] = {}
         self.capture_thread: Optional[threading.Thread] = None
 
+    @property
+    def camera_indices(self) -> List[int]:
+        return list(self.captures)
+
     def start_capture(self, shutdown_event: threading.Event) -> None:
-        """Запуск процесса захвата"""
+        """Запуск процесса захвата; возвращается после остановки захвата всех камер"""
         try:
-            self.capture.initialize()
-            self.capture.start_capture(shutdown_event)
+            for capture in self.captures.values():
+                capture.initialize()
+
+            if len(self.captures) == 1:
+                self.capture.start_capture(shutdown_event)
+                return
+
+            self.scheduler.start(shutdown_event)
+            self.scheduler.join()
 
         except CameraError as e:
             logger.error(f"Camera manager error: {e}")
@@ -29,8 +59,81 @@ class CameraManager:
     def stop_capture(self) -> None:
         """Останавка процесса захвата"""
         logger.info("Stopping camera capture")
-        self.capture.stop_capture()
+        for stream in self._latest_streams.values():
+            stream.close()
+        self._latest_streams.clear()
+        for capture in self.captures.values():
+            capture.stop_capture()
+
+    def get_frame_buffer(self, camera_index: Optional[int] = None) -> FrameBuffer:
+        """Получение кольцевого буфера кадров камеры (по умолчанию - основной)"""
+        if camera_index is None:
+            return self.capture.get_frame_buffer()
+        if camera_index not in self.captures:
+            raise CameraError(f"Unknown camera: {camera_index}")
+        return self.captures[camera_index].get_frame_buffer()
+
+    def subscribe(
+        self,
+        name: str,
+        depth: int = 2,
+        policy: str = "drop_oldest",
+        camera_index: Optional[int] = None
+    ) -> FrameSubscription:
+        """
+            Подписка потребителя (запись, аналитика) на кадры камеры (по умолчанию - основной).
+            Подписчик получает кадры без копирования, медленный подписчик теряет только свои кадры
+        """
+        if camera_index is None:
+            return self.capture.subscribe(name, depth, policy)
+        if camera_index not in self.captures:
+            raise CameraError(f"Unknown camera: {camera_index}")
+        return self.captures[camera_index].subscribe(name, depth, policy)
+
+    def frames(
+        self,
+        depth: int = 1,
+        policy: str = "latest_only",
+        camera_index: Optional[int] = None
+    ) -> AsyncFrameStream:
+        """
+            Асинхронный поток кадров камеры (требует FRAME_HUB); создаётся в работающем цикле событий:
+                async with manager.frames() as stream:
+                    async for frame in stream:
+                        ...
+            Каждый поток - своя подписка хаба, дополнительных потоков не создаётся
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            raise CameraError("Async frame streams must be opened from a running event loop")
+        subscription = self.subscribe(f"async-{next(self._stream_ids)}", depth, policy, camera_index)
+        return AsyncFrameStream(subscription, loop)
+
+    async def latest_frame(self, camera_index: Optional[int] = None) -> Optional[np.ndarray]:
+        """
+            Копия самого нового ещё не выданного кадра камеры (при его отсутствии ожидается следующий);
+            None, если захват остановлен. Все вызовы читают одну подписку latest_only на камеру,
+            которая пересоздаётся только при смене цикла событий
+        """
+        key = self.capture.camera_index if camera_index is None else camera_index
+        stream = self._latest_streams.get(key)
+        if stream is None or stream._loop is not asyncio.get_running_loop():
+            if stream is not None:
+                stream.close()
+            stream = AsyncFrameStream(self.subscribe(f"async-latest-{key}", 1, "latest_only", camera_index))
+            self._latest_streams[key] = stream
+        return await stream.latest()
 
-    def get_frame_queue(self) -> Queue:
-        """Получение очереди кадров от объекта захвата"""
-        return self.capture.get_frame_queue()
\ No newline at end of file
+    def get_frame_set(self, timeout: Optional[float] = None) -> Optional[FrameSet]:
+        """
+            Синхронный набор кадров всех камер, подобранных по ближайшему времени захвата.
+            Набор нужно вернуть через FrameSet.release().
+            Кадры берутся из тех же буферов, что читает окно, поэтому кадры, отброшенные
+            синхронизатором или взятые в набор, окно не покажет
+        """
+        if self._synchronizer is None:
+            self._synchronizer = FrameSynchronizer({
+                camera_index: capture.get_frame_buffer() for camera_index, capture in self.captures.items()
+            })
+        return self._synchronizer.acquire(timeout)
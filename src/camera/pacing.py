@@ -0,0 +1,109 @@
+import math
+import time
+from typing import Dict
+
+import numpy as np
+
+from ..exceptions import ConfigurationError
+
+
+class FramePacer:
+    """
+        Поддержание частоты кадров по абсолютным дедлайнам на монотонных часах.
+        Каждый следующий дедлайн отсчитывается от предыдущего, а не от момента пробуждения,
+        поэтому ошибка сна не накапливается. При отставании больше чем на кадр пропущенные
+        дедлайны отбрасываются без "догоняющей" серии кадров.
+    """
+
+    MODES = ("sleep", "hybrid")
+
+    def __init__(
+        self,
+        fps: float,
+        mode: str = "sleep",
+        spin_threshold: float = 0.002,
+        history: int = 1024
+    ):
+        if fps <= 0:
+            raise ConfigurationError("FPS must be positive")
+        if mode not in self.MODES:
+            raise ConfigurationError(f"Invalid pacing mode: {mode}")
+
+        self.period = 1.0 / fps
+        self.mode = mode
+        self.spin_threshold = spin_threshold  # Последний отрезок ожидания в режиме hybrid крутится в цикле
+
+        # Кольцо интервалов между кадрами для статистики джиттера
+        self._intervals = np.zeros(history, dtype=np.float64)
+        self._interval_count = 0
+        self._next_deadline = None
+        self._last_tick = None
+
+        self.missed_deadlines = 0
+
+    def reset(self) -> None:
+        """Сброс расписания, следующий вызов wait() вернётся сразу"""
+        self._next_deadline = None
+        self._last_tick = None
+
+    def wait(self) -> None:
+        """Ожидание следующего дедлайна"""
+        if self._next_deadline is not None and time.perf_counter() < self._next_deadline:
+            self._sleep_until(self._next_deadline)
+        self.advance(time.perf_counter())
+
+    def time_until_next(self, now: float) -> float:
+        """Сколько осталось до дедлайна (0 - кадр пора захватывать); для планировщика без сна"""
+        if self._next_deadline is None:
+            return 0.0
+        return max(0.0, self._next_deadline - now)
+
+    def advance(self, now: float) -> None:
+        """Отметка кадра, захваченного в момент now (не раньше дедлайна), и переход к следующему дедлайну"""
+        if self._next_deadline is None:
+            self._next_deadline = now
+        else:
+            # Опоздание больше чем на кадр: сдвигаем расписание на целое число периодов
+            missed = math.floor((now - self._next_deadline) / self.period)
+            if missed > 0:
+                self.missed_deadlines += missed
+                self._next_deadline += missed * self.period
+
+        self._next_deadline += self.period
+        self._record_tick(now)
+
+    def _sleep_until(self, deadline: float) -> None:
+        """Сон до дедлайна; в режиме hybrid остаток добирается активным ожиданием"""
+        if self.mode == "hybrid":
+            remaining = deadline - time.perf_counter() - self.spin_threshold
+            if remaining > 0:
+                time.sleep(remaining)
+            while time.perf_counter() < deadline:
+                pass
+        else:
+            remaining = deadline - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+
+    def _record_tick(self, now: float) -> None:
+        if self._last_tick is not None:
+            self._intervals[self._interval_count % len(self._intervals)] = now - self._last_tick
+            self._interval_count += 1
+        self._last_tick = now
+
+    def jitter_stats(self) -> Dict[str, float]:
+        """Статистика интервалов между кадрами в миллисекундах"""
+        count = min(self._interval_count, len(self._intervals))
+        if count == 0:
+            return {"count": 0, "target": self.period * 1000.0, "mean": 0.0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+
+        intervals = self._intervals[:count] * 1000.0
+        p50, p99 = np.percentile(intervals, [50, 99])
+        return {
+            "count": count,
+            "target": self.period * 1000.0,
+            "mean": float(intervals.mean()),
+            "p50": float(p50),
+            "p99": float(p99),
+            "max": float(intervals.max()),
+        }
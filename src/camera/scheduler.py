@@ -0,0 +1,155 @@
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+from loguru import logger
+
+from ..exceptions import CameraError
+from .buffer import FrameRingBuffer, FrameSlot
+from .capture import CameraCapture
+
+# Наибольший интервал сна планировщика: за это время проверяется сигнал завершения
+MAX_IDLE = 0.05
+
+
+class CaptureScheduler:
+    """
+        Общий планировщик захвата для нескольких камер.
+        Число потоков ограничено max_threads: камеры распределяются по потокам, и каждый поток
+        по очереди захватывает кадры тех камер, чей дедлайн наступил, а до ближайшего дедлайна спит.
+        У каждой камеры остаются свой буфер и своё расписание (FramePacer).
+        Ошибка одной камеры останавливает только её
+    """
+
+    def __init__(self, captures: Sequence[CameraCapture], max_threads: int = 0):
+        self.captures = list(captures)
+        thread_count = min(max_threads or len(self.captures), len(self.captures))
+        self.groups: List[List[CameraCapture]] = [self.captures[index::thread_count] for index in range(thread_count)]
+        self.threads: List[threading.Thread] = []
+
+    def start(self, shutdown_event: threading.Event) -> None:
+        """Запуск потоков захвата"""
+        self.threads = [
+            threading.Thread(target=self.run_group, args=(group, shutdown_event), daemon=True, name=f"capture-{index}")
+            for index, group in enumerate(self.groups)
+        ]
+        for thread in self.threads:
+            thread.start()
+        logger.info(f"Capture scheduler: {len(self.captures)} cameras on {len(self.threads)} threads")
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def run_group(self, group: List[CameraCapture], shutdown_event: threading.Event) -> None:
+        """Цикл одного потока: захват кадров камер группы по их дедлайнам"""
+        for capture in group:
+            capture.begin_capture()
+
+        try:
+            while not shutdown_event.is_set():
+                active = [capture for capture in group if capture.is_capturing]
+                if not active:
+                    break
+
+                now = time.perf_counter()
+                idle = MAX_IDLE
+                for capture in active:
+                    wait = capture.pacer.time_until_next(now) if capture.pacer else 0.0
+                    if wait > 0:
+                        idle = min(idle, wait)
+                        continue
+
+                    if capture.pacer:
+                        capture.pacer.advance(now)
+                    try:
+                        capture.capture_once()
+                        if not capture.is_capturing:
+                            # Источник камеры исчерпан
+                            capture.end_capture()
+                    except Exception as e:
+                        logger.error(f"Camera {capture.camera_index} capture error: {e}")
+                        capture.end_capture()
+                    now = time.perf_counter()
+                    idle = 0.0
+
+                if idle > 0:
+                    time.sleep(idle)
+        finally:
+            for capture in group:
+                if capture.is_capturing:
+                    capture.end_capture()
+
+
+class FrameSet:
+    """Набор кадров разных камер, совпадающих по времени захвата. Слоты принадлежат потребителю до release()"""
+
+    def __init__(self, slots: Dict[int, FrameSlot], buffers: Dict[int, FrameRingBuffer]):
+        self.slots = slots
+        self._buffers = buffers
+        timestamps = [slot.record.capture_ts for slot in slots.values()]
+        self.timestamp = max(timestamps)
+        # Разброс времени захвата внутри набора (сек)
+        self.skew = max(timestamps) - min(timestamps)
+
+    def frame(self, camera_index: int):
+        return self.slots[camera_index].frame
+
+    def release(self) -> None:
+        """Возврат всех слотов набора в буферы камер"""
+        for camera_index, slot in self.slots.items():
+            self._buffers[camera_index].release(slot)
+        self.slots = {}
+
+
+class FrameSynchronizer:
+    """
+        Сборка синхронных наборов кадров.
+        Опорное время - самый новый момент, до которого кадры есть у всех камер (минимум по камерам
+        времени их последнего кадра). Из каждой камеры берётся кадр, ближайший к опорному времени,
+        более старые кадры отбрасываются.
+        Синхронизатор читает те же буферы камер, что и окно отображения: кадр, отброшенный
+        или взятый в набор, окно уже не получит, поэтому двум потребителям одной камеры
+        синхронизатор не подходит
+    """
+
+    def __init__(self, buffers: Dict[int, FrameRingBuffer]):
+        for camera_index, buffer in buffers.items():
+            if not isinstance(buffer, FrameRingBuffer):
+                raise CameraError(
+                    f"Camera {camera_index}: synchronized frame sets require CAPTURE_MODE=read without FRAME_HUB"
+                )
+        self.buffers = buffers
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[FrameSet]:
+        """Ожидает кадры всех камер и возвращает набор; None по таймауту или после остановки захвата"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            for buffer in self.buffers.values():
+                remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+                if not buffer.wait_ready(remaining):
+                    return None
+
+            frame_set = self._try_acquire()
+            if frame_set is not None:
+                return frame_set
+            # Кадр вытеснен захватом между проверкой и получением - набор собирается заново
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+
+    def _try_acquire(self) -> Optional[FrameSet]:
+        """Одна попытка собрать набор; None, если кадр какой-либо камеры вытеснен захватом"""
+        newest = [buffer.newest_timestamp() for buffer in self.buffers.values()]
+        if any(timestamp is None for timestamp in newest):
+            return None
+        reference = min(newest)
+
+        slots: Dict[int, FrameSlot] = {}
+        for camera_index, buffer in self.buffers.items():
+            slot = buffer.acquire_nearest(reference)
+            if slot is None:
+                for held_index, held_slot in slots.items():
+                    self.buffers[held_index].release(held_slot)
+                return None
+            slots[camera_index] = slot
+        return FrameSet(slots, self.buffers)
@@ -0,0 +1,307 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from ..config import Config
+from ..exceptions import CameraError
+
+
+class FrameSource(ABC):
+    """
+        Абстрактный источник кадров.
+        Повторяет часть интерфейса cv2.VideoCapture (grab/retrieve/read/release),
+        поэтому CameraCapture работает с любым источником одинаково
+    """
+
+    @abstractmethod
+    def open(self) -> None:
+        """Открытие источника, при ошибке - CameraError"""
+        pass
+
+    @abstractmethod
+    def grab(self) -> bool:
+        """Захват следующего кадра без декодирования"""
+        pass
+
+    @abstractmethod
+    def retrieve(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """Декодирование захваченного кадра, по возможности в переданный массив"""
+        pass
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """Захват и декодирование следующего кадра"""
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def release(self) -> None:
+        """Освобождение ресурсов источника"""
+        pass
+
+    @property
+    def fps(self) -> Optional[float]:
+        """Частота, с которой нужно забирать кадры; None - так быстро, как возможно"""
+        return None
+
+    @property
+    def exhausted(self) -> bool:
+        """True, если кадры закончились (конец незацикленного файла); захват после этого завершается"""
+        return False
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Описание источника для логов"""
+        pass
+
+
+class DeviceSource(FrameSource):
+    """Камера, подключённая к системе"""
+
+    def __init__(self, camera_index: int, width: int, height: int, fps: float):
+        self.camera_index = camera_index
+        self.width = width
+        self.height = height
+        self._fps = fps
+        self.capture: Optional[cv2.VideoCapture] = None
+
+    def open(self) -> None:
+        self.capture = cv2.VideoCapture(self.camera_index)
+        if not self.capture.isOpened():
+            raise CameraError(f"Failed to open camera {self.camera_index}")
+
+        # Установка свойств камеры (ширина, высота, FPS)
+        self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        self.capture.set(cv2.CAP_PROP_FPS, self._fps)
+
+    def grab(self) -> bool:
+        return self.capture.grab()
+
+    def retrieve(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        return self.capture.retrieve(image=image)
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        return self.capture.read(image=image)
+
+    def release(self) -> None:
+        if self.capture:
+            self.capture.release()
+
+    @property
+    def fps(self) -> Optional[float]:
+        return self._fps
+
+    @property
+    def name(self) -> str:
+        return f"camera {self.camera_index}"
+
+
+class VideoFileSource(FrameSource):
+    """Видеофайл с опциональным зацикливанием и воспроизведением в реальном времени"""
+
+    def __init__(self, path: str, loop: bool = True, realtime: bool = True):
+        self.path = path
+        self.loop = loop
+        self.realtime = realtime
+        self.capture: Optional[cv2.VideoCapture] = None
+        self._file_fps = 0.0
+        self._exhausted = False
+
+    def open(self) -> None:
+        if not Path(self.path).is_file():
+            raise CameraError(f"Video file not found: {self.path}")
+
+        self.capture = cv2.VideoCapture(self.path)
+        if not self.capture.isOpened():
+            raise CameraError(f"Failed to open video file {self.path}")
+        self._file_fps = self.capture.get(cv2.CAP_PROP_FPS) or 0.0
+        self._exhausted = False
+
+    def grab(self) -> bool:
+        if self.capture.grab():
+            return True
+        if not self.loop:
+            self._exhausted = True
+            return False
+        # Конец файла: перемотка в начало
+        self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return self.capture.grab()
+
+    def retrieve(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        return self.capture.retrieve(image=image)
+
+    def release(self) -> None:
+        if self.capture:
+            self.capture.release()
+
+    @property
+    def fps(self) -> Optional[float]:
+        # В реальном времени кадры отдаются с частотой файла
+        if self.realtime and self._file_fps > 0:
+            return self._file_fps
+        return None
+
+    @property
+    def exhausted(self) -> bool:
+        return self._exhausted
+
+    @property
+    def name(self) -> str:
+        return f"video file {self.path}"
+
+
+class ImageSequenceSource(FrameSource):
+    """Последовательность изображений из каталога, упорядоченная по имени файла"""
+
+    EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+    def __init__(self, path: str, loop: bool = True, fps: Optional[float] = None):
+        self.path = path
+        self.loop = loop
+        self._fps = fps
+        self.files: List[Path] = []
+        self._position = -1
+
+    def open(self) -> None:
+        directory = Path(self.path)
+        if not directory.is_dir():
+            raise CameraError(f"Image directory not found: {self.path}")
+
+        self.files = sorted(
+            file for file in directory.iterdir() if file.suffix.lower() in self.EXTENSIONS
+        )
+        if not self.files:
+            raise CameraError(f"No images found in {self.path}")
+        self._position = -1
+
+    def grab(self) -> bool:
+        if self._position + 1 >= len(self.files):
+            if not self.loop:
+                self._position = len(self.files)
+                return False
+            self._position = -1
+        self._position += 1
+        return True
+
+    def retrieve(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        frame = cv2.imread(str(self.files[self._position]), cv2.IMREAD_COLOR)
+        if frame is None:
+            logger.warning(f"Failed to read image {self.files[self._position]}")
+            return False, None
+        # imread не умеет писать в готовый буфер, поэтому копируем при совпадении формы
+        if image is not None and image.shape == frame.shape and image.dtype == frame.dtype:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame
+
+    @property
+    def fps(self) -> Optional[float]:
+        return self._fps
+
+    @property
+    def exhausted(self) -> bool:
+        return self._position >= len(self.files) > 0
+
+    @property
+    def name(self) -> str:
+        return f"image sequence {self.path} ({len(self.files)} files)"
+
+
+class SyntheticSource(FrameSource):
+    """
+        Детерминированный генератор тестовых кадров произвольного разрешения.
+        Кадр с номером N всегда одинаков для одного и того же шаблона и seed,
+        что делает замеры производительности воспроизводимыми
+    """
+
+    PATTERNS = ("gradient", "noise")
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        fps: Optional[float] = None,
+        pattern: str = "gradient",
+        seed: int = 0
+    ):
+        if pattern not in self.PATTERNS:
+            raise CameraError(f"Unknown synthetic pattern: {pattern}")
+
+        self.width = width
+        self.height = height
+        self._fps = fps
+        self.pattern = pattern
+        self.seed = seed
+        self.frame_index = -1
+        self._texture: Optional[np.ndarray] = None
+
+    def open(self) -> None:
+        # Текстура двойной ширины: кадр - это окно, сдвигающееся на шаг с каждым кадром,
+        # поэтому генерация кадра сводится к одному копированию без выделения памяти
+        if self.pattern == "noise":
+            rng = np.random.default_rng(self.seed)
+            self._texture = rng.integers(0, 256, (self.height, self.width * 2, 3), dtype=np.uint8)
+        else:
+            x = np.arange(self.width * 2, dtype=np.float32) / max(1, self.width)
+            y = np.arange(self.height, dtype=np.float32)[:, None] / max(1, self.height)
+            texture = np.empty((self.height, self.width * 2, 3), dtype=np.uint8)
+            texture[..., 0] = ((x + y) * 127.5) % 256
+            texture[..., 1] = (np.sin(x * np.pi * 2) * 0.5 + 0.5) * 255 * (1 - y * 0.5)
+            texture[..., 2] = y * 255
+            self._texture = texture
+        self.frame_index = -1
+
+    def grab(self) -> bool:
+        self.frame_index += 1
+        return True
+
+    def retrieve(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        shape = (self.height, self.width, 3)
+        if image is None or image.shape != shape or image.dtype != np.uint8:
+            image = np.empty(shape, dtype=np.uint8)
+
+        offset = (self.frame_index * 4) % self.width
+        np.copyto(image, self._texture[:, offset:offset + self.width])
+        # Номер кадра в первом пикселе помогает проверять порядок кадров в тестах
+        image[0, 0] = (self.frame_index & 0xFF, (self.frame_index >> 8) & 0xFF, (self.frame_index >> 16) & 0xFF)
+        return True, image
+
+    @property
+    def fps(self) -> Optional[float]:
+        return self._fps
+
+    @property
+    def name(self) -> str:
+        return f"synthetic {self.pattern} {self.width}x{self.height}"
+
+
+def create_frame_source(config: Config, camera_index: Optional[int] = None) -> FrameSource:
+    """
+        Создаёт источник кадров, выбранный в конфигурации.
+        camera_index - номер камеры (по умолчанию CAMERA_INDEX); синтетические источники
+        разных камер различаются начальным значением генератора
+    """
+    camera_index = config.camera_index if camera_index is None else camera_index
+    # Для файлов и синтетики без реального времени кадры отдаются так быстро, как возможно
+    paced_fps = config.fps if config.source_realtime else None
+
+    if config.frame_source == "device":
+        return DeviceSource(camera_index, config.frame_width, config.frame_height, config.fps)
+    if config.frame_source == "video":
+        return VideoFileSource(config.source_path, config.source_loop, config.source_realtime)
+    if config.frame_source == "images":
+        return ImageSequenceSource(config.source_path, config.source_loop, paced_fps)
+    if config.frame_source == "synthetic":
+        return SyntheticSource(
+            config.frame_width,
+            config.frame_height,
+            paced_fps,
+            config.synthetic_pattern,
+            config.synthetic_seed + camera_index
+        )
+    raise CameraError(f"Unknown frame source: {config.frame_source}")
@@ -0,0 +1,110 @@
+import asyncio
+from typing import Optional
+
+import numpy as np
+
+from .buffer import FrameSlot
+from .hub import FrameSubscription
+
+
+class AsyncFrameStream:
+    """
+        Асинхронный поток кадров поверх подписки FrameHub для потребителей на asyncio.
+        Поток захвата будит цикл событий через loop.call_soon_threadsafe, поэтому нет ни опроса с таймаутом,
+        ни отдельного потока на потребителя: любое число потоков кадров в одном цикле читает один захват.
+        При итерации (async for) кадр выдаётся без копирования как представление только для чтения
+        и действителен до следующего шага итерации.
+        Отмена задачи безопасна: ожидание не удерживает слотов, а закрытие (close, выход из async with,
+        остановка захвата) возвращает хабу удерживаемый кадр и завершает итерацию
+    """
+
+    def __init__(self, subscription: FrameSubscription, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self._loop = loop or asyncio.get_running_loop()
+        self.subscription = subscription
+        self._ready = asyncio.Event()
+        self._wakeup_pending = False  # Пробуждение уже запланировано в цикле событий
+        self._held: Optional[FrameSlot] = None  # Кадр, выданный последним шагом итерации
+        subscription.set_listener(self._wakeup)
+
+    @property
+    def record(self):
+        """Запись FrameRecord кадра, выданного последним шагом итерации (None, если кадр не удерживается)"""
+        return self._held.record if self._held is not None else None
+
+    def _wakeup(self) -> None:
+        """Слушатель подписки: вызывается в потоке захвата, лишние пробуждения не планируются"""
+        if self._wakeup_pending:
+            return
+        self._wakeup_pending = True
+        try:
+            self._loop.call_soon_threadsafe(self._on_wakeup)
+        except RuntimeError:
+            # Цикл событий уже закрыт: будить некого
+            self._wakeup_pending = False
+
+    def _on_wakeup(self) -> None:
+        self._wakeup_pending = False
+        self._ready.set()
+
+    async def acquire(self) -> Optional[FrameSlot]:
+        """Ожидает следующий кадр подписки. Возвращает None после закрытия; слот нужно вернуть через release()"""
+        while True:
+            # Сброс до проверки очереди: кадр, пришедший после проверки, снова установит событие
+            self._ready.clear()
+            slot = self.subscription.acquire_read(timeout=0)
+            if slot is not None:
+                return slot
+            if self.subscription.closed:
+                return None
+            await self._ready.wait()
+
+    def release(self, slot: FrameSlot) -> None:
+        self.subscription.release(slot)
+
+    async def latest(self) -> Optional[np.ndarray]:
+        """
+            Копия самого нового кадра: накопившиеся кадры пропускаются, при пустой очереди ожидается следующий.
+            Возвращает None после закрытия
+        """
+        self._release_held()
+        slot = await self.acquire()
+        if slot is None:
+            return None
+        while True:
+            newer = self.subscription.acquire_read(timeout=0)
+            if newer is None:
+                break
+            self.subscription.release(slot)
+            slot = newer
+        try:
+            return slot.frame.copy()
+        finally:
+            self.subscription.release(slot)
+
+    def _release_held(self) -> None:
+        if self._held is not None:
+            held, self._held = self._held, None
+            self.subscription.release(held)
+
+    def __aiter__(self) -> "AsyncFrameStream":
+        return self
+
+    async def __anext__(self) -> np.ndarray:
+        # Предыдущий кадр возвращается до ожидания, поэтому отмена не оставляет удерживаемых слотов
+        self._release_held()
+        slot = await self.acquire()
+        if slot is None:
+            raise StopAsyncIteration
+        self._held = slot
+        return slot.frame
+
+    def close(self) -> None:
+        """Возврат удерживаемого кадра и отписка; ожидающие acquire() и итерация завершаются"""
+        self._release_held()
+        self.subscription.close()
+
+    async def __aenter__(self) -> "AsyncFrameStream":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
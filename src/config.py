@@ -11,45 +11,137 @@ class Config:
     """Configuration class for video capture application."""
 
     # Настройки камеры
+    frame_source: str
+    source_path: str
+    source_loop: bool
+    source_realtime: bool
+    synthetic_pattern: str
+    synthetic_seed: int
     camera_index: int
+    camera_indices: list
+    capture_threads: int
     frame_width: int
     frame_height: int
     fps: int
+    capture_mode: str
+    frame_hub: bool
+    pacing_mode: str
+    pacing_spin_threshold: float
 
     # Настройки отображения
     window_title: str
     display_scale: float
+    resize_mode: str
+    output_sinks: list
+    record_path: str
+    record_codec: str
+    record_container: str
+    record_segment_seconds: float
+    record_segment_mb: float
+    record_queue_size: int
+    shm_export: list
+    shm_name: str
+    shm_slots: int
 
     # Настройки фильтров
     default_filter: str
+    filter_chain: list
+    filter_fusion: bool
+    filter_tiled: list
+    filter_tile_workers: int
     filter_intensity: float
 
     # Настройки производительности
     max_queue_size: int
     capture_timeout: float
+    backpressure_policy: str
+    backpressure_timeout: float
+    processing_workers: int
+    processing_depth: int
+    processing_order: str
+    adaptive_quality: bool
+    change_gating: bool
+    gate_threshold: float
+    gate_tile_size: int
+    gate_partial_limit: float
+    gate_refresh_frames: int
+    quality_high_watermark: float
+    quality_low_watermark: float
+    quality_hold_frames: int
 
     # Настройки логирования
     log_level: str
+    trace_latency: bool
+    trace_report_interval: float
+    metrics_enabled: bool
+    metrics_host: str
+    metrics_port: int
 
     def __init__(self):
         try:
+            self.frame_source = self._get_str_env("FRAME_SOURCE", "device")
+            self.source_path = self._get_str_env("SOURCE_PATH", "")
+            self.source_loop = self._get_bool_env("SOURCE_LOOP", True)
+            self.source_realtime = self._get_bool_env("SOURCE_REALTIME", True)
+            self.synthetic_pattern = self._get_str_env("SYNTHETIC_PATTERN", "gradient")
+            self.synthetic_seed = self._get_int_env("SYNTHETIC_SEED", 0)
             self.camera_index = self._get_int_env("CAMERA_INDEX", 0)
+            self.camera_indices = self._get_int_list_env("CAMERA_INDICES", [self.camera_index])
+            self.capture_threads = self._get_int_env("CAPTURE_THREADS", 0)
             self.frame_width = self._get_int_env("FRAME_WIDTH", 640)
             self.frame_height = self._get_int_env("FRAME_HEIGHT", 480)
             self.fps = self._get_int_env("FPS", 30)
+            self.capture_mode = self._get_str_env("CAPTURE_MODE", "read")
+            self.frame_hub = self._get_bool_env("FRAME_HUB", False)
+            self.pacing_mode = self._get_str_env("PACING_MODE", "sleep")
+            self.pacing_spin_threshold = self._get_float_env("PACING_SPIN_THRESHOLD", 0.002)
 
             self.window_title = self._get_str_env("WINDOW_TITLE", "Video Capture")
             self.display_scale = self._get_float_env("DISPLAY_SCALE", 1.0)
+            self.resize_mode = self._get_str_env("RESIZE_MODE", "auto")
+            self.output_sinks = self._get_list_env("OUTPUT_SINKS", ["window"])
+            self.record_path = self._get_str_env("RECORD_PATH", "recordings")
+            self.record_codec = self._get_str_env("RECORD_CODEC", "mp4v")
+            self.record_container = self._get_str_env("RECORD_CONTAINER", "mp4")
+            self.record_segment_seconds = self._get_float_env("RECORD_SEGMENT_SECONDS", 60.0)
+            self.record_segment_mb = self._get_float_env("RECORD_SEGMENT_MB", 0.0)
+            self.record_queue_size = self._get_int_env("RECORD_QUEUE_SIZE", 30)
+            self.shm_export = self._get_list_env("SHM_EXPORT", [])
+            self.shm_name = self._get_str_env("SHM_NAME", "video_capture")
+            self.shm_slots = self._get_int_env("SHM_SLOTS", 4)
 
             self.default_filter = self._get_str_env("DEFAULT_FILTER", "none")
             self.filter_intensity = self._get_float_env("FILTER_INTENSITY", 1.0)
             self.list_available_filters = self._get_list_env("AVAILABLE_FILTERS", ["none"])
             self.register_available_filters()
+            self.filter_chain = self._get_list_env("FILTER_CHAIN", []) or [self.default_filter]
+            self.filter_fusion = self._get_bool_env("FILTER_FUSION", False)
+            self.filter_tiled = self._get_list_env("FILTER_TILED", [])
+            self.filter_tile_workers = self._get_int_env("FILTER_TILE_WORKERS", 0)
 
             self.max_queue_size = self._get_int_env("MAX_QUEUE_SIZE", 10)
             self.capture_timeout = self._get_float_env("CAPTURE_TIMEOUT", 5.0)
+            self.backpressure_policy = self._get_str_env("BACKPRESSURE_POLICY", "drop_oldest")
+            self.backpressure_timeout = self._get_float_env("BACKPRESSURE_TIMEOUT", 0.05)
+            self.processing_workers = self._get_int_env("PROCESSING_WORKERS", 0)
+            self.processing_depth = self._get_int_env("PROCESSING_DEPTH", 4)
+            self.processing_order = self._get_str_env("PROCESSING_ORDER", "strict")
+            self.adaptive_quality = self._get_bool_env("ADAPTIVE_QUALITY", False)
+            self.change_gating = self._get_bool_env("CHANGE_GATING", False)
+            self.gate_threshold = self._get_float_env("GATE_THRESHOLD", 4.0)
+            self.gate_tile_size = self._get_int_env("GATE_TILE_SIZE", 64)
+            self.gate_partial_limit = self._get_float_env("GATE_PARTIAL_LIMIT", 0.5)
+            self.gate_refresh_frames = self._get_int_env("GATE_REFRESH_FRAMES", 30)
+            self.quality_high_watermark = self._get_float_env("QUALITY_HIGH_WATERMARK", 0.9)
+            self.quality_low_watermark = self._get_float_env("QUALITY_LOW_WATERMARK", 0.6)
+            self.quality_hold_frames = self._get_int_env("QUALITY_HOLD_FRAMES", 15)
 
             self.log_level = self._get_str_env("LOG_LEVEL", "DEBUG")
+            self.trace_latency = self._get_bool_env("TRACE_LATENCY", True)
+            self.trace_report_interval = self._get_float_env("TRACE_REPORT_INTERVAL", 10.0)
+            self.metrics_enabled = self._get_bool_env("METRICS_ENABLED", False)
+            self.metrics_host = self._get_str_env("METRICS_HOST", "127.0.0.1")
+            self.metrics_port = self._get_int_env("METRICS_PORT", 9100)
 
             self._validate_config()
 
@@ -60,6 +152,17 @@ class Config:
         """Получить строковую переменную окружения со значением по умолчанию"""
         return os.getenv(key, default)
 
+    def _get_bool_env(self, key: str, default: bool) -> bool:
+        """Получить логическую переменную окружения со значением по умолчанию"""
+        value = os.getenv(key)
+        if value is None:
+            return default
+        if value.strip().lower() in ("1", "true", "yes", "on"):
+            return True
+        if value.strip().lower() in ("0", "false", "no", "off"):
+            return False
+        raise ConfigurationError(f"Invalid boolean value for {key}: {value}")
+
     def _get_list_env(self, key: str, default: list) -> list:
         """Получить список из переменной окружения, разделенной запятыми"""
         value = os.getenv(key)
@@ -67,6 +170,13 @@ class Config:
             return default
         return [item.strip() for item in value.split(",") if item.strip()]
 
+    def _get_int_list_env(self, key: str, default: list) -> list:
+        """Получить список целых чисел из переменной окружения, разделенной запятыми"""
+        try:
+            return [int(item) for item in self._get_list_env(key, default)]
+        except ValueError:
+            raise ConfigurationError(f"Invalid integer list for {key}: {os.getenv(key)}")
+
     def _get_int_env(self, key: str, default: int) -> int:
         """Получить целочисленную переменную окружения со значением по умолчанию"""
         value = os.getenv(key)
@@ -107,6 +217,28 @@ class Config:
 
     def _validate_config(self) -> None:
         """Проверка корректности конфигурации"""
+        if self.frame_source not in ["device", "video", "images", "synthetic"]:
+            raise ConfigurationError(f"Invalid frame source: {self.frame_source}")
+
+        if self.frame_source in ["video", "images"] and not self.source_path:
+            raise ConfigurationError(f"SOURCE_PATH is required for frame source '{self.frame_source}'")
+
+        if self.synthetic_pattern not in ["gradient", "noise"]:
+            raise ConfigurationError(f"Invalid synthetic pattern: {self.synthetic_pattern}")
+
+        if not self.camera_indices:
+            raise ConfigurationError("At least one camera index is required")
+
+        if any(camera_index < 0 for camera_index in self.camera_indices):
+            raise ConfigurationError(f"Camera indices must be non-negative: {self.camera_indices}")
+
+        # Одинаковые номера открыли бы два захвата одного устройства
+        if len(set(self.camera_indices)) != len(self.camera_indices):
+            raise ConfigurationError(f"Duplicate camera indices: {self.camera_indices}")
+
+        if self.capture_threads < 0:
+            raise ConfigurationError("Capture threads must be non-negative")
+
         if self.camera_index < 0:
             raise ConfigurationError("Camera index must be non-negative")
 
@@ -116,9 +248,50 @@ class Config:
         if self.fps <= 0:
             raise ConfigurationError("FPS must be positive")
 
+        if self.capture_mode not in ["read", "grab"]:
+            raise ConfigurationError(f"Invalid capture mode: {self.capture_mode}")
+
+        if self.pacing_mode not in ["sleep", "hybrid"]:
+            raise ConfigurationError(f"Invalid pacing mode: {self.pacing_mode}")
+
+        if self.pacing_spin_threshold < 0:
+            raise ConfigurationError("Pacing spin threshold must be non-negative")
+
         if self.display_scale <= 0:
             raise ConfigurationError("Display scale must be positive")
 
+        if self.resize_mode not in ["auto", "strict"]:
+            raise ConfigurationError(f"Invalid resize mode: {self.resize_mode}")
+
+        for sink_name in self.output_sinks:
+            if sink_name not in ["window", "null", "recorder"]:
+                raise ConfigurationError(f"Invalid output sink: {sink_name}")
+
+        if len(self.record_codec) != 4:
+            raise ConfigurationError(f"Recorder codec must be a FourCC code: {self.record_codec}")
+
+        if not self.record_container:
+            raise ConfigurationError("Recorder container must not be empty")
+
+        if self.record_segment_seconds < 0 or self.record_segment_mb < 0:
+            raise ConfigurationError("Recorder segment limits must be non-negative")
+
+        if self.record_queue_size <= 0:
+            raise ConfigurationError("Recorder queue size must be positive")
+
+        for export_name in self.shm_export:
+            if export_name not in ["raw", "filtered"]:
+                raise ConfigurationError(f"Invalid shared memory export: {export_name}")
+
+        if "raw" in self.shm_export and self.capture_mode != "read":
+            raise ConfigurationError("Raw frame export requires CAPTURE_MODE=read")
+
+        if not self.shm_name:
+            raise ConfigurationError("Shared memory name must not be empty")
+
+        if self.shm_slots < 2:
+            raise ConfigurationError("Shared memory ring needs at least 2 slots")
+
         if self.filter_intensity < 0:
             raise ConfigurationError("Filter intensity must be non-negative")
 
@@ -128,6 +301,72 @@ class Config:
         if self.capture_timeout <= 0:
             raise ConfigurationError("Capture timeout must be positive")
 
-        valid_filters = ["none", "blur", "sharpen", "brightness"]
+        if self.trace_report_interval <= 0:
+            raise ConfigurationError("Trace report interval must be positive")
+
+        if not 0 <= self.metrics_port <= 65535:
+            raise ConfigurationError(f"Invalid metrics port: {self.metrics_port}")
+
+        valid_policies = ["drop_oldest", "drop_newest", "block", "latest_only"]
+        if self.backpressure_policy not in valid_policies:
+            raise ConfigurationError(f"Invalid backpressure policy: {self.backpressure_policy}")
+
+        if self.frame_hub and self.capture_mode != "read":
+            raise ConfigurationError("FRAME_HUB requires CAPTURE_MODE=read")
+
+        if self.frame_hub and self.backpressure_policy == "block":
+            raise ConfigurationError("FRAME_HUB does not support the block backpressure policy")
+
+        if self.processing_workers < 0:
+            raise ConfigurationError("Processing workers must be non-negative")
+
+        if self.processing_depth <= 0:
+            raise ConfigurationError("Processing depth must be positive")
+
+        if self.processing_order not in ["strict", "reorder"]:
+            raise ConfigurationError(f"Invalid processing order: {self.processing_order}")
+
+        if not 0 < self.quality_low_watermark < self.quality_high_watermark:
+            raise ConfigurationError("Quality watermarks must satisfy 0 < low < high")
+
+        if self.quality_hold_frames <= 0:
+            raise ConfigurationError("Quality hold frames must be positive")
+
+        if self.gate_threshold < 0:
+            raise ConfigurationError("Gate threshold must be non-negative")
+
+        if self.gate_tile_size < 8:
+            raise ConfigurationError("Gate tile size must be at least 8 pixels")
+
+        if not 0 <= self.gate_partial_limit <= 1:
+            raise ConfigurationError("Gate partial limit must be between 0 and 1")
+
+        if self.gate_refresh_frames < 0:
+            raise ConfigurationError("Gate refresh frames must be non-negative")
+
+        if self.filter_tile_workers < 0:
+            raise ConfigurationError("Filter tile workers must be non-negative")
+
+        if self.backpressure_timeout < 0:
+            raise ConfigurationError("Backpressure timeout must be non-negative")
+
+        valid_filters = ["none", "blur", "sharpen", "brightness", "contrast", "gamma", "temporal", "denoise"]
         if self.default_filter not in valid_filters:
             raise ConfigurationError(f"Invalid filter: {self.default_filter}")
+
+        from .filters.base import FilterFactory
+        for filter_name in self.filter_chain:
+            if filter_name not in FilterFactory.get_available_filters():
+                raise ConfigurationError(f"Filter in chain is not available: {filter_name}")
+
+        # Исполнители получают кадры вперемешку, и у каждого было бы своё состояние фильтра
+        if self.processing_workers > 1:
+            for filter_name in self.filter_chain:
+                if FilterFactory.is_stateful(filter_name):
+                    raise ConfigurationError(
+                        f"Stateful filter {filter_name} requires PROCESSING_WORKERS=0 or 1"
+                    )
+
+        for filter_name in self.filter_tiled:
+            if filter_name != "*" and filter_name not in FilterFactory.get_available_filters():
+                raise ConfigurationError(f"Tiled filter is not available: {filter_name}")
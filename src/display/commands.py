@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from queue import Empty, SimpleQueue
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class Command:
+    """Команда управления конвейером"""
+
+    action: str                     # quit, filter, help
+    argument: Optional[str] = None  # Например, имя фильтра для action="filter"
+
+
+# Привязка клавиш к командам. Добавьте сюда клавишу для своего фильтра
+KEY_BINDINGS: Dict[int, Command] = {
+    ord('q'): Command("quit"),
+    27: Command("quit"),  # ESC
+    ord('1'): Command("filter", "none"),
+    ord('2'): Command("filter", "blur"),
+    ord('3'): Command("filter", "sharpen"),
+    ord('4'): Command("filter", "brightness"),
+    ord('5'): Command("filter", "contrast"),
+    ord('6'): Command("filter", "gamma"),
+    ord('7'): Command("filter", "temporal"),
+    ord('8'): Command("filter", "denoise"),
+    # ord('9'): Command("filter", "myfilter"),  # Добавьте свой фильтр здесь
+    ord('h'): Command("help"),
+}
+
+
+def key_to_command(key: int) -> Optional[Command]:
+    """Преобразует код клавиши в команду"""
+    return KEY_BINDINGS.get(key)
+
+
+class CommandChannel:
+    """
+        Потокобезопасный канал команд, не зависящий от способа вывода.
+        Команды отправляют окно (по нажатию клавиш), обработчики сигналов или внешний код,
+        а цикл отображения забирает их между кадрами
+    """
+
+    def __init__(self):
+        self._queue: SimpleQueue = SimpleQueue()
+
+    def send(self, action: str, argument: Optional[str] = None) -> None:
+        """Отправка команды"""
+        self._queue.put(Command(action, argument))
+
+    def send_command(self, command: Command) -> None:
+        """Отправка готовой команды"""
+        self._queue.put(command)
+
+    def drain(self) -> List[Command]:
+        """Все накопившиеся команды без ожидания"""
+        commands = []
+        while True:
+            try:
+                commands.append(self._queue.get_nowait())
+            except Empty:
+                return commands
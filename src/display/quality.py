@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from loguru import logger
+
+from ..utils.metrics import REGISTRY
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    """Уровень деградации обработки"""
+
+    intensity_scale: float = 1.0   # Множитель интенсивности фильтров (меньше интенсивность - меньше ядро)
+    resolution_scale: float = 1.0  # Фильтрация в уменьшенном разрешении с последующим увеличением
+    filter_every: int = 1          # Фильтруется каждый N-й кадр, остальные повторяют последний результат
+
+    def describe(self) -> str:
+        if self == QualityLevel():
+            return "full quality"
+        return (
+            f"intensity x{self.intensity_scale:g}, resolution x{self.resolution_scale:g}, "
+            f"filter every {self.filter_every} frame(s)"
+        )
+
+
+# Уровни от полного качества к самому дешёвому; каждый следующий включает предыдущие упрощения
+QUALITY_LEVELS: List[QualityLevel] = [
+    QualityLevel(),
+    QualityLevel(intensity_scale=0.5),
+    QualityLevel(intensity_scale=0.5, resolution_scale=0.5),
+    QualityLevel(intensity_scale=0.5, resolution_scale=0.5, filter_every=2),
+]
+
+
+class QualityController:
+    """
+        Регулятор качества обработки по времени кадра.
+        Время обработки сглаживается (EWMA) и сравнивается с бюджетом кадра 1/fps: выше high_watermark
+        доли бюджета уровень деградации повышается, ниже low_watermark - понижается.
+        Гистерезис: между порогами уровень не меняется, после смены уровень держится не меньше hold_frames
+        кадров, а для восстановления требуется запас в течение втрое большего числа кадров
+    """
+
+    def __init__(
+        self,
+        fps: float,
+        high_watermark: float = 0.9,
+        low_watermark: float = 0.6,
+        hold_frames: int = 15,
+        smoothing: float = 0.2,
+        levels: Optional[Sequence[QualityLevel]] = None
+    ):
+        self.budget = 1.0 / fps
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.hold_frames = hold_frames
+        self.smoothing = smoothing
+        self.levels = list(levels or QUALITY_LEVELS)
+        self.level = 0
+        self.frame_time: Optional[float] = None  # Сглаженное время обработки кадра (сек)
+        self._frames_at_level = 0
+        self._headroom_frames = 0  # Кадров подряд с запасом по времени
+        REGISTRY.gauge("video_quality_level", "Current degradation level of the adaptive quality controller").labels(
+        ).set_function(lambda: self.level)
+
+    @property
+    def current(self) -> QualityLevel:
+        return self.levels[self.level]
+
+    def observe(self, seconds: float) -> bool:
+        """Учёт времени обработки кадра. Возвращает True, если уровень изменился"""
+        if self.frame_time is None:
+            self.frame_time = seconds
+        else:
+            self.frame_time += self.smoothing * (seconds - self.frame_time)
+        self._frames_at_level += 1
+
+        load = self.frame_time / self.budget
+        if load < self.low_watermark:
+            self._headroom_frames += 1
+        else:
+            self._headroom_frames = 0
+
+        if self._frames_at_level < self.hold_frames:
+            return False
+        if load > self.high_watermark and self.level < len(self.levels) - 1:
+            return self._set_level(self.level + 1, load)
+        if self._headroom_frames >= 3 * self.hold_frames and self.level > 0:
+            return self._set_level(self.level - 1, load)
+        return False
+
+    def _set_level(self, level: int, load: float) -> bool:
+        previous, self.level = self.level, level
+        self._frames_at_level = 0
+        self._headroom_frames = 0
+        message = (
+            f"Quality level {previous} -> {level} ({self.current.describe()}): "
+            f"frame time {self.frame_time * 1000.0:.1f} ms, {load:.0%} of {self.budget * 1000.0:.1f} ms budget"
+        )
+        if level > previous:
+            logger.warning(message)
+        else:
+            logger.info(message)
+        return True
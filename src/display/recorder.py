@@ -0,0 +1,204 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from ..camera.backpressure import DropNewestPolicy
+from ..camera.buffer import FrameRingBuffer
+from ..config import Config
+from ..exceptions import DisplayError
+from ..utils.metrics import REGISTRY
+from .sink import FrameSink
+
+
+class RecorderSink(FrameSink):
+    """
+        Запись обработанного потока в файлы сегментами.
+        write() только копирует кадр в слот ограниченного кольцевого буфера, кодирование (cv2.VideoWriter)
+        выполняется в отдельном потоке записи. Если диск не успевает, новые кадры отбрасываются
+        (политика drop_newest), и цикл отображения никогда не ждёт записи.
+        Новый сегмент начинается по длительности, размеру файла или при смене размера кадра
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        codec: str = "mp4v",
+        container: str = "mp4",
+        fps: float = 30.0,
+        segment_seconds: float = 60.0,
+        segment_bytes: int = 0,
+        queue_size: int = 30
+    ):
+        if len(codec) != 4:
+            raise DisplayError(f"Invalid recorder codec: {codec}")
+        self.directory = directory
+        self.codec = codec
+        self.container = container.lstrip(".")
+        self.fps = fps
+        self.segment_seconds = segment_seconds  # 0 - без ограничения длительности
+        self.segment_bytes = segment_bytes      # 0 - без ограничения размера
+        self.queue_size = queue_size
+        # Буфер создаётся по форме первого кадра
+        self.frame_buffer: Optional[FrameRingBuffer] = None
+        self.writer_thread: Optional[threading.Thread] = None
+
+        self.segments = []          # Пути записанных сегментов
+        self.frames_written = 0
+        self.bytes_written = 0      # Размер закрытых сегментов
+        self._writer: Optional[cv2.VideoWriter] = None
+        self._segment_path: Optional[str] = None
+        self._segment_start = 0.0
+        self._segment_size: Optional[Tuple[int, int]] = None
+        self._sequence = 0
+        self._closing = False
+        self.failed = False         # Сегмент не удалось открыть, запись отключена
+        self._register_metrics()
+
+    @classmethod
+    def from_config(cls, config: Config) -> "RecorderSink":
+        return cls(
+            config.record_path,
+            config.record_codec,
+            config.record_container,
+            config.fps,
+            config.record_segment_seconds,
+            int(config.record_segment_mb * 1024 * 1024),
+            config.record_queue_size
+        )
+
+    def _register_metrics(self) -> None:
+        REGISTRY.gauge("video_recorder_queue_depth", "Frames waiting to be encoded by the recorder").labels(
+        ).set_function(lambda: self.frame_buffer.occupancy if self.frame_buffer else 0)
+        REGISTRY.counter("video_recorder_dropped_total", "Frames dropped because the recorder fell behind").labels(
+        ).set_function(lambda: self.frame_buffer.stats.dropped if self.frame_buffer else 0)
+        REGISTRY.counter("video_recorder_bytes_total", "Bytes written to recording segments").labels(
+        ).set_function(lambda: self.total_bytes)
+        self.encode_time_metric = REGISTRY.histogram(
+            "video_recorder_encode_seconds", "Per-frame recorder encode time"
+        ).labels()
+
+    @property
+    def total_bytes(self) -> int:
+        """Размер закрытых сегментов и текущего сегмента на диске"""
+        return self.bytes_written + self._current_size()
+
+    def _current_size(self) -> int:
+        path = self._segment_path
+        if path is None:
+            return 0
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    def open(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        logger.info(f"Recorder writing {self.codec}/{self.container} segments to {self.directory}")
+
+    def write(self, frame: np.ndarray) -> None:
+        if self.failed:
+            return
+        if self.frame_buffer is None:
+            self.frame_buffer = FrameRingBuffer(self.queue_size, frame.shape, frame.dtype, DropNewestPolicy())
+            self.writer_thread = threading.Thread(target=self._writer_loop, daemon=True, name="recorder")
+            self.writer_thread.start()
+
+        slot = self.frame_buffer.acquire_write()
+        if slot is None:
+            # Запись отстаёт: кадр отбрасывается, счётчик ведёт политика буфера
+            return
+        if slot.frame.shape == frame.shape and slot.frame.dtype == frame.dtype:
+            np.copyto(slot.frame, frame)
+            copied = slot.frame
+        else:
+            copied = frame.copy()
+        self._sequence += 1
+        slot.record.begin(self._sequence, time.perf_counter())
+        self.frame_buffer.commit(slot, copied)
+
+    def _writer_loop(self) -> None:
+        """Поток записи: кодирует кадры из буфера до закрытия приёмника и опустошения буфера"""
+        while True:
+            slot = self.frame_buffer.acquire_read(timeout=0.1)
+            if slot is None:
+                if self.frame_buffer.occupancy == 0 and self._closing:
+                    break
+                continue
+            try:
+                # После отказа записи буфер только опустошается
+                if not self.failed:
+                    self._encode(slot.frame, slot.record.capture_ts)
+            except DisplayError as e:
+                # Сегмент не открывается (кодек, контейнер, права на каталог): повтор на каждом кадре
+                # дал бы ту же ошибку, поэтому запись отключается до конца работы приёмника
+                self.failed = True
+                logger.error(f"Recorder disabled: {e}")
+            except Exception as e:
+                logger.error(f"Recorder error: {e}")
+            finally:
+                self.frame_buffer.release(slot)
+        self._close_segment()
+
+    def _encode(self, frame: np.ndarray, timestamp: float) -> None:
+        size = (frame.shape[1], frame.shape[0])
+        if self._writer is None or self._should_rotate(size, timestamp):
+            self._open_segment(size, timestamp)
+
+        start = time.perf_counter()
+        self._writer.write(frame)
+        self.encode_time_metric.observe(time.perf_counter() - start)
+        self.frames_written += 1
+
+    def _should_rotate(self, size: Tuple[int, int], timestamp: float) -> bool:
+        if size != self._segment_size:
+            return True
+        if self.segment_seconds and timestamp - self._segment_start >= self.segment_seconds:
+            return True
+        return bool(self.segment_bytes) and self._current_size() >= self.segment_bytes
+
+    def _open_segment(self, size: Tuple[int, int], timestamp: float) -> None:
+        self._close_segment()
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(self.directory, f"segment_{stamp}_{len(self.segments):04d}.{self.container}")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*self.codec), self.fps, size)
+        if not writer.isOpened():
+            writer.release()
+            raise DisplayError(f"Failed to open recording segment: {path}")
+
+        self._writer = writer
+        self._segment_path = path
+        self._segment_start = timestamp
+        self._segment_size = size
+        self.segments.append(path)
+        logger.info(f"Recording segment started: {path}")
+
+    def _close_segment(self) -> None:
+        if self._writer is None:
+            return
+        self._writer.release()
+        self._writer = None
+        self.bytes_written += self._current_size()
+        self._segment_path = None
+
+    def close(self) -> None:
+        """Дописывает кадры из буфера и закрывает текущий сегмент"""
+        if self.frame_buffer is None or self._closing:
+            return
+        self._closing = True
+        self.frame_buffer.close()
+        if self.writer_thread is not None:
+            self.writer_thread.join()
+        logger.info(
+            f"Recorder stopped: {self.frames_written} frames, {len(self.segments)} segments, "
+            f"{self.bytes_written} bytes, flow: {self.frame_buffer.stats.as_dict()}"
+        )
+
+    @property
+    def name(self) -> str:
+        return "recorder"
@@ -0,0 +1,161 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from ..config import Config
+from ..exceptions import DisplayError, ExportError
+from ..utils.shared_ring import SharedFrameRing
+from .commands import CommandChannel, key_to_command
+
+
+class FrameSink(ABC):
+    """
+        Абстрактный приёмник обработанных кадров.
+        Кадр, переданный в write(), действителен только до возврата из метода:
+        приёмник, которому он нужен дольше, обязан его скопировать
+    """
+
+    def open(self) -> None:
+        """Подготовка приёмника перед первым кадром"""
+        pass
+
+    @abstractmethod
+    def write(self, frame: np.ndarray) -> None:
+        """Вывод кадра"""
+        pass
+
+    def poll(self) -> None:
+        """Обработка событий приёмника; вызывается на каждой итерации цикла, даже без кадра"""
+        pass
+
+    def close(self) -> None:
+        """Освобождение ресурсов; может вызываться повторно"""
+        pass
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """Имя приёмника"""
+        pass
+
+
+class NullSink(FrameSink):
+    """Приёмник, отбрасывающий кадры. Нужен для замера пропускной способности конвейера"""
+
+    def __init__(self):
+        self.frames = 0
+
+    def write(self, frame: np.ndarray) -> None:
+        self.frames += 1
+
+    @property
+    def name(self) -> str:
+        return "null"
+
+
+class CallbackSink(FrameSink):
+    """Передаёт каждый кадр в пользовательскую функцию"""
+
+    def __init__(self, callback: Callable[[np.ndarray], None]):
+        self.callback = callback
+
+    def write(self, frame: np.ndarray) -> None:
+        self.callback(frame)
+
+    @property
+    def name(self) -> str:
+        return "callback"
+
+
+class WindowSink(FrameSink):
+    """Окно OpenCV. Нажатия клавиш преобразуются в команды канала управления"""
+
+    def __init__(self, window_name: str, commands: Optional[CommandChannel] = None):
+        self.window_name = window_name
+        self.commands = commands
+        self.window_lock = threading.Lock()
+        self.is_open = False
+
+    def open(self) -> None:
+        cv2.namedWindow(self.window_name, cv2.WINDOW_AUTOSIZE)
+        self.is_open = True
+        logger.info(f"Display window created: {self.window_name}")
+
+    def write(self, frame: np.ndarray) -> None:
+        with self.window_lock:
+            cv2.imshow(self.window_name, frame)
+
+    def poll(self) -> None:
+        # waitKey также обрабатывает события окна, поэтому вызывается на каждой итерации
+        key = cv2.waitKey(1) & 0xFF
+        if key != 255 and self.commands is not None:  # Клавиша нажата
+            command = key_to_command(key)
+            if command is not None:
+                self.commands.send_command(command)
+
+    def close(self) -> None:
+        with self.window_lock:
+            cv2.destroyAllWindows()
+        self.is_open = False
+
+    @property
+    def name(self) -> str:
+        return "window"
+
+
+class SharedMemorySink(FrameSink):
+    """
+        Публикует обработанные кадры в кольцо разделяемой памяти (SHM_EXPORT=filtered) для других процессов.
+        Кольцо создаётся по первому кадру с вместимостью слота под его размер; приёмник не ждёт читателей
+    """
+
+    def __init__(self, ring_name: str, slots: int = 4):
+        self.ring_name = ring_name
+        self.slots = slots
+        self.ring: Optional[SharedFrameRing] = None
+        self._sequence = 0
+        self._failed = False
+
+    def write(self, frame: np.ndarray) -> None:
+        if self.ring is None:
+            if self._failed:
+                return
+            try:
+                self.ring = SharedFrameRing(self.ring_name, self.slots, frame.nbytes)
+            except (OSError, ExportError) as e:
+                logger.error(f"Failed to create shared memory ring {self.ring_name}: {e}")
+                self._failed = True
+                return
+        self._sequence += 1
+        self.ring.publish(frame, self._sequence)
+
+    def close(self) -> None:
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    @property
+    def name(self) -> str:
+        return "shared_memory"
+
+
+def create_sinks(config: Config, commands: CommandChannel) -> List[FrameSink]:
+    """Создаёт приёмники, перечисленные в конфигурации"""
+    sinks: List[FrameSink] = []
+    for sink_name in config.output_sinks:
+        if sink_name == "window":
+            sinks.append(WindowSink(config.window_title, commands))
+        elif sink_name == "null":
+            sinks.append(NullSink())
+        elif sink_name == "recorder":
+            from .recorder import RecorderSink
+            sinks.append(RecorderSink.from_config(config))
+        else:
+            raise DisplayError(f"Unknown output sink: {sink_name}")
+    if "filtered" in config.shm_export:
+        sinks.append(SharedMemorySink(f"{config.shm_name}_filtered", config.shm_slots))
+    return sinks
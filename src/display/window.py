@@ -1,73 +1,148 @@
 import threading
-from queue import Queue, Empty
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import cv2
+import numpy as np
 from loguru import logger
 
+from ..camera.buffer import FrameBuffer
 from ..config import Config
 from ..exceptions import DisplayError
-from ..filters.base import FilterFactory
+from ..filters.gating import ChangeGate
+from ..filters.pipeline import FilterPipeline
+from ..processing.stage import ProcessingStage
+from ..utils.metrics import REGISTRY, FrameRateGauge
+from ..utils.tracing import LatencyTracer
+from .commands import Command, CommandChannel, key_to_command
+from .quality import QualityController
+from .sink import FrameSink, WindowSink
 
 
 class DisplayWindow:
-    """Отображение видео и взаимодействие с user"""
+    """
+        Цикл обработки и вывода кадров.
+        Кадры выводятся в один или несколько приёмников (окно, null, callback),
+        управление приходит через канал команд, не зависящий от приёмника
+    """
 
-    def __init__(self, config: Config):
+    def __init__(
+        self,
+        config: Config,
+        sinks: Optional[List[FrameSink]] = None,
+        commands: Optional[CommandChannel] = None,
+        processing: Optional[ProcessingStage] = None
+    ):
         self.config = config
+        # Стадия многопроцессной обработки: фильтры применяют её исполнители, а окно только выводит кадры
+        self.processing = processing
         self.window_name = config.window_title
-        self.current_filter = FilterFactory.create(
-            config.default_filter,
-            config.filter_intensity
-        )
+        self.commands = commands or CommandChannel()
+        self.sinks: List[FrameSink] = sinks if sinks is not None else [WindowSink(self.window_name, self.commands)]
+        # Созданные цепочки по именам фильтров: повторное переключение не пересоздаёт фильтры и буферы
+        self._pipelines: Dict[Tuple[Tuple[str, ...], float], FilterPipeline] = {}
+        # Форма и тип последнего кадра, под которые подготавливаются цепочки при переключении
+        self.frame_geometry: Optional[Tuple[Tuple[int, ...], np.dtype]] = None
+        # Цепочка фильтров из настройки FILTER_CHAIN (по умолчанию - один DEFAULT_FILTER)
+        self.filter_names: List[str] = [] if processing else list(config.filter_chain)
+        self.current_filter = self._get_pipeline(self.filter_names)
+        # Адаптивное качество: при нехватке времени на кадр фильтрация упрощается по уровням
+        self.quality: Optional[QualityController] = None
+        if config.adaptive_quality and not processing:
+            self.quality = QualityController(
+                config.fps,
+                config.quality_high_watermark,
+                config.quality_low_watermark,
+                config.quality_hold_frames
+            )
+        # Детектор изменений: статичные кадры и плитки не фильтруются повторно
+        self.gate: Optional[ChangeGate] = None
+        if config.change_gating and not processing:
+            self.gate = ChangeGate(
+                config.gate_threshold,
+                config.gate_tile_size,
+                config.gate_partial_limit,
+                config.gate_refresh_frames
+            )
+        self._degraded_filter: Optional[FilterPipeline] = None
+        self._degraded_frames = 0
+        self._last_output: Optional[np.ndarray] = None
+        self._last_input_shape: Optional[Tuple[int, ...]] = None
+        self._downscaled: Optional[np.ndarray] = None
+        self._upscaled: Optional[np.ndarray] = None
+        # Гистограммы задержек по этапам; None - трассировка отключена
+        self.tracer = LatencyTracer(config.trace_report_interval) if config.trace_latency else None
         self.display_lock = threading.Lock()
         self.is_displaying = False
 
-    def start_display(self, frame_queue: Queue, shutdown_event: threading.Event) -> None:
+        # Метрики вывода; серия гистограммы фильтра выбирается при переключении, а не на каждом кадре
+        self.frames_metric = REGISTRY.counter("video_display_frames_total", "Frames presented to sinks").labels()
+        REGISTRY.gauge("video_display_fps", "Display frame rate since the previous scrape").labels().set_function(
+            FrameRateGauge(self.frames_metric)
+        )
+        self.filter_time_metric = self._filter_time_metric(self.current_filter.name)
+
+    def start_display(
+        self,
+        frame_buffer: Union[FrameBuffer, ProcessingStage],
+        shutdown_event: threading.Event
+    ) -> None:
         """Запуск цикла отображения"""
         try:
-            cv2.namedWindow(self.window_name, cv2.WINDOW_AUTOSIZE)
-            logger.info(f"Display window created: {self.window_name}")
+            for sink in self.sinks:
+                sink.open()
 
             self.is_displaying = True
             self._display_instructions()
 
             # Цикл отображения кадров пока не установлено событие завершения
             while not shutdown_event.is_set() and self.is_displaying:
-                try:
-                    # Получение кадра из очереди
-                    # если в течение 0.1 секунды кадр не появится в очереди, будет выброшено исключение queue.Empty.
-                    # Это позволяет циклу не блокироваться надолго, а регулярно проверять, не пришёл ли сигнал
-                    # завершения. Таким образом, окно может быстро реагировать на завершение работы или другие события.
-                    frame = frame_queue.get(timeout=0.1)
-
-                    # Применение текущего фильтра
-                    filtered_frame = self.current_filter.apply(frame)
-
-                    # Масштабирование кадра при необходимости
-                    if self.config.display_scale != 1.0:
-                        new_width = int(filtered_frame.shape[1] * self.config.display_scale)
-                        new_height = int(filtered_frame.shape[0] * self.config.display_scale)
-                        # Изменение размера кадра с использованием линейной интерполяции
-                        filtered_frame = cv2.resize(
-                            filtered_frame,
-                            (new_width, new_height),
-                            interpolation=cv2.INTER_LINEAR
-                        )
-
-                    # Отображение кадра пока не установлено событие завершения
-                    with self.display_lock:
-                        cv2.imshow(self.window_name, filtered_frame)
-
-                    # Обработка нажатий клавиш любых
-                    key = cv2.waitKey(1) & 0xFF
-                    if key != 255:              # Клавиша нажата
-                        if not self._handle_key_press(key):
-                            break
-
-                except Empty:
-                    continue
-                except Exception as e:
-                    logger.error(f"Display error: {e}")
+                # Получение слота с кадром из кольцевого буфера
+                # если в течение 0.1 секунды кадр не появится, вернётся None.
+                # Это позволяет циклу не блокироваться надолго, а регулярно проверять, не пришёл ли сигнал
+                # завершения. Таким образом, окно может быстро реагировать на завершение работы или другие события.
+                slot = frame_buffer.acquire_read(timeout=0.1)
+
+                if slot is not None:
+                    frame = slot.frame
+                    if self.frame_geometry is None or frame.shape != self.frame_geometry[0]:
+                        # Подготовка цепочки при первом кадре и при смене разрешения
+                        self.frame_geometry = (frame.shape, frame.dtype)
+                        self.current_filter.prepare(frame.shape, frame.dtype)
+
+                    record = slot.record
+                    record.dequeue_ts = time.perf_counter()
+                    try:
+                        # Применение текущей цепочки фильтров (с учётом уровня качества).
+                        # Масштабирование до DISPLAY_SCALE выполняет сама цепочка: планировщик ставит уменьшение
+                        # кадра перед фильтрами, перестановочными с ним, поэтому масштабирование входит в этап filter
+                        filtered_frame = self._apply_filters(frame)
+                        record.filter_ts = time.perf_counter()
+                        self.filter_time_metric.observe(record.filter_ts - record.dequeue_ts)
+
+                        # Вывод кадра во все приёмники
+                        with self.display_lock:
+                            for sink in self.sinks:
+                                sink.write(filtered_frame)
+                        record.present_ts = time.perf_counter()
+                        self.frames_metric.inc()
+                        if self.quality and self.quality.observe(record.present_ts - record.dequeue_ts):
+                            self._set_quality_pipeline()
+
+                        if self.tracer:
+                            self.tracer.observe(record)
+
+                    except Exception as e:
+                        logger.error(f"Display error: {e}")
+                        break
+                    finally:
+                        # Слот возвращается в кольцо только после вывода кадра
+                        frame_buffer.release(slot)
+
+                # События приёмников (например, нажатия клавиш в окне) и команды управления
+                for sink in self.sinks:
+                    sink.poll()
+                if not self._process_commands():
                     break
 
         except Exception as e:
@@ -76,54 +151,154 @@ class DisplayWindow:
         finally:
             self.stop_display()
 
+    def _apply_filters(self, frame: np.ndarray) -> np.ndarray:
+        """Фильтрация кадра текущей цепочкой или её упрощённым вариантом при деградации качества"""
+        if self.quality is None or self.quality.level == 0 or not self.current_filter.has_filters:
+            if self.gate:
+                return self.gate.apply(self.current_filter, frame)
+            return self.current_filter.apply(frame)
+
+        level = self.quality.current
+        skip = level.filter_every > 1 and self._degraded_frames % level.filter_every
+        self._degraded_frames += 1
+        if skip and self._last_output is not None and self._last_input_shape == frame.shape:
+            # Пропуск прохода фильтра: повторяется последний отфильтрованный кадр
+            return self._last_output
+
+        if level.resolution_scale == 1.0:
+            output = self._degraded_filter.apply(frame)
+        else:
+            height, width = frame.shape[:2]
+            small_size = (max(1, int(width * level.resolution_scale)), max(1, int(height * level.resolution_scale)))
+            self._downscaled = cv2.resize(frame, small_size, dst=self._downscaled, interpolation=cv2.INTER_AREA)
+            filtered = self._degraded_filter.apply(self._downscaled)
+            self._upscaled = cv2.resize(
+                filtered,
+                self.current_filter.output_size(frame.shape),
+                dst=self._upscaled,
+                interpolation=cv2.INTER_LINEAR
+            )
+            output = self._upscaled
+        self._last_output = output
+        self._last_input_shape = frame.shape
+        return output
+
+    def _set_quality_pipeline(self) -> None:
+        """Цепочка для текущего уровня качества: те же фильтры с уменьшенной интенсивностью"""
+        self._last_output = None
+        self._degraded_frames = 0
+        if self.quality is None or self.quality.level == 0:
+            self._degraded_filter = None
+            return
+
+        level = self.quality.current
+        self._degraded_filter = self._get_pipeline(
+            self.filter_names, self.config.filter_intensity * level.intensity_scale
+        )
+        if self.frame_geometry is not None:
+            shape, dtype = self.frame_geometry
+            scaled_shape = (
+                max(1, int(shape[0] * level.resolution_scale)),
+                max(1, int(shape[1] * level.resolution_scale))
+            ) + tuple(shape[2:])
+            self._degraded_filter.prepare(scaled_shape, dtype)
+
     def stop_display(self) -> None:
         """Останавливает отображение и очищает ресурсы"""
-        self.is_displaying = False
+        was_displaying, self.is_displaying = self.is_displaying, False
+        if was_displaying and self.tracer:
+            self.tracer.report()
+        if was_displaying and self.gate:
+            rates = ", ".join(f"{decision} {rate:.0%}" for decision, rate in self.gate.stats.rates().items())
+            logger.info(f"Change gating: {rates}, {self.gate.stats.tiles} tiles refiltered")
 
         try:
             with self.display_lock:
-                cv2.destroyAllWindows()
+                for sink in self.sinks:
+                    sink.close()
             logger.info("Display stopped")
         except Exception as e:
             logger.error(f"Display cleanup error: {e}")
 
+    def _process_commands(self) -> bool:
+        """Выполняет накопившиеся команды. Возвращает False для выхода"""
+        for command in self.commands.drain():
+            if not self._handle_command(command):
+                return False
+        return True
+
     def _handle_key_press(self, key: int) -> bool:
+        """Обрабатывает ввод с клавиатуры. Возвращает False для выхода"""
+        command = key_to_command(key)
+        if command is None:
+            return True
+        return self._handle_command(command)
+
+    def _handle_command(self, command: Command) -> bool:
         """
-            Обрабатывает ввод с клавиатуры. Возвращает False для выхода
-            Здесь прописываем действия для клавиш
+            Обрабатывает команду управления. Возвращает False для выхода
+            Здесь прописываем действия для команд
         """
-
-        if key == ord('q') or key == 27:  # 'q'  или ESC
-            logger.info("Exit key pressed")
+        if command.action == "quit":
+            logger.info("Exit command received")
             return False
 
-        elif key == ord('1'):
-            self._switch_filter("none")
-        elif key == ord('2'):
-            self._switch_filter("blur")
-        elif key == ord('3'):
-            self._switch_filter("sharpen")
-        elif key == ord('4'):
-            self._switch_filter("brightness")
-        # elif key == ord('5'):                     # Добавьте свой фильтр здесь
-        #    self._switch_filter("myfilter") ...
-        elif key == ord('h'):
+        elif command.action == "filter":
+            self._switch_filter(command.argument)
+        elif command.action == "help":
             self._display_instructions()
+        else:
+            logger.warning(f"Unknown command: {command.action}")
 
         return True
 
     def _switch_filter(self, filter_name: str) -> None:
         """Переключение на другой фильтр"""
         try:
-            # При переключении фильтра создаётся новый объект фильтра с заданной интенсивностью
-            self.current_filter = FilterFactory.create(
-                filter_name,
-                self.config.filter_intensity
-            )
+            if self.processing:
+                self.processing.set_filters([filter_name])
+                logger.info(f"Switched processing filter: {filter_name}")
+                return
+
+            # При переключении фильтра цепочка заменяется одним выбранным фильтром.
+            # Подготовка выполняется здесь, между кадрами, чтобы первый кадр нового фильтра не был медленнее
+            pipeline = self._get_pipeline([filter_name])
+            if self.frame_geometry is not None:
+                pipeline.prepare(*self.frame_geometry)
+            self.filter_names = [filter_name]
+            self.current_filter = pipeline
+            if self.quality:
+                self._set_quality_pipeline()
+            self.filter_time_metric = self._filter_time_metric(filter_name)
             logger.info(f"Switched to filter: {filter_name}")
         except Exception as e:
             logger.error(f"Failed to switch filter: {e}")
 
+    def _get_pipeline(self, filter_names: Sequence[str], intensity: Optional[float] = None) -> FilterPipeline:
+        """Цепочка из кэша окна (создаётся при первом запросе); по умолчанию с интенсивностью из настроек"""
+        intensity = self.config.filter_intensity if intensity is None else intensity
+        key = (tuple(filter_names), intensity)
+        pipeline = self._pipelines.get(key)
+        if pipeline is None:
+            pipeline = FilterPipeline.from_names(
+                key[0],
+                intensity,
+                self.config.filter_fusion,
+                self.config.filter_tiled,
+                self.config.filter_tile_workers,
+                self.config.display_scale,
+                self.config.resize_mode
+            )
+            self._pipelines[key] = pipeline
+        return pipeline
+
+    @staticmethod
+    def _filter_time_metric(filter_name: str):
+        """Серия гистограммы времени обработки кадра фильтром"""
+        return REGISTRY.histogram(
+            "video_filter_seconds", "Per-frame filter processing time"
+        ).labels(filter=filter_name)
+
     def _display_instructions(self) -> None:
         """Отображение инструкции для user"""
         instructions = [
@@ -132,11 +307,15 @@ class DisplayWindow:
             "Press '2' - Blur filter",
             "Press '3' - Sharpen filter",
             "Press '4' - Brightness filter",
-            # "Press '5' - My custom filter",  # Добавьте свой фильтр здесь
+            "Press '5' - Contrast filter",
+            "Press '6' - Gamma filter",
+            "Press '7' - Temporal filter",
+            "Press '8' - Denoise filter",
+            # "Press '9' - My custom filter",  # Добавьте свой фильтр здесь
             "Press 'h' - Show this help",
             "Press 'q' or ESC - Exit",
             "=============================="
         ]
 
         for instruction in instructions:
-            logger.info(instruction)
\ No newline at end of file
+            logger.info(instruction)
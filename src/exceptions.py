@@ -20,4 +20,14 @@ class FilterError(ApplicationError):
 
 class DisplayError(ApplicationError):
     """Исключение при ошибках отображения"""
-    pass
\ No newline at end of file
+    pass
+
+
+class ProcessingError(ApplicationError):
+    """Исключение при ошибках стадии многопроцессной обработки"""
+    pass
+
+
+class ExportError(ApplicationError):
+    """Исключение при ошибках экспорта кадров в разделяемую память"""
+    pass
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Type
+from typing import Dict, Optional, Sequence, Tuple, Type
 import numpy as np
 
 from ..exceptions import FilterError
@@ -10,12 +10,88 @@ class BaseFilter(ABC):
 
     def __init__(self, intensity: float = 1.0):
         self.intensity = max(0.0, min(1.0, intensity))
+        # Параметры, для которых выполнена подготовка: (форма, тип, интенсивность)
+        self._prepared_key: Optional[Tuple] = None
+
+    def prepare(self, shape: Sequence[int], dtype) -> None:
+        """
+            Подготовка к кадрам заданной формы и типа: ядра, коэффициенты и буферы вычисляются один раз.
+            Повторный вызов с теми же параметрами ничего не делает; подготовка повторяется
+            только при смене формы, типа или интенсивности
+        """
+        key = (tuple(shape), np.dtype(dtype), self.intensity)
+        if key == self._prepared_key:
+            return
+        self._prepare(tuple(shape), np.dtype(dtype))
+        self._prepared_key = key
+
+    def _prepare(self, shape: Tuple[int, ...], dtype: np.dtype) -> None:
+        """Предвычисление параметров фильтра; переопределяется фильтрами"""
+        pass
+
+    @property
+    def is_prepared(self) -> bool:
+        return self._prepared_key is not None
 
     @abstractmethod
     def apply(self, frame: np.ndarray) -> np.ndarray:
         """Применение фильтра к кадру"""
         pass
 
+    def apply_into(self, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+        """
+            Применение фильтра с записью результата в готовый буфер dst.
+            Возвращает массив с результатом: dst, если он подошёл по форме и типу.
+            src и dst не должны пересекаться. Реализация по умолчанию выделяет промежуточный кадр,
+            фильтры переопределяют метод, передавая dst прямо в функцию OpenCV
+        """
+        result = self.apply(src)
+        if result.shape != dst.shape or result.dtype != dst.dtype:
+            return result
+        np.copyto(dst, result)
+        return dst
+
+    @property
+    def is_identity(self) -> bool:
+        """True, если фильтр не меняет кадр и может быть пропущен в конвейере"""
+        return False
+
+    @property
+    def is_stateful(self) -> bool:
+        """True, если результат зависит от предыдущих кадров: такой экземпляр нельзя делить между потоками кадров"""
+        return False
+
+    def reset(self) -> None:
+        """Сброс состояния, накопленного по предыдущим кадрам; переопределяется фильтрами с состоянием"""
+        pass
+
+    @property
+    def kernel_radius(self) -> Optional[int]:
+        """
+            Сколько соседних строк нужно для расчёта пикселя (0 - поточечный фильтр).
+            None - неизвестно, и фильтр нельзя выполнять по полосам
+        """
+        return None
+
+    def scaled(self, factor: float) -> Optional["BaseFilter"]:
+        """
+            Фильтр с тем же действием на кадре, уменьшенном в factor раз (параметры ядра масштабируются).
+            None - фильтр не перестановочен с масштабированием и должен выполняться до него
+        """
+        return None
+
+    def linear_kernel(self) -> Optional[np.ndarray]:
+        """Ядро корреляции (filter2D), если фильтр - линейная свёртка; используется при объединении фильтров"""
+        return None
+
+    def separable_kernel(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Раздельное ядро (по X, по Y), если свёртка раскладывается на два одномерных прохода"""
+        return None
+
+    def affine_params(self) -> Optional[Tuple[float, float]]:
+        """(alpha, beta), если фильтр - поточечное преобразование alpha * x + beta с насыщением"""
+        return None
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -29,6 +105,21 @@ class NoneFilter(BaseFilter):
     def apply(self, frame: np.ndarray) -> np.ndarray:
         return frame.copy()
 
+    def apply_into(self, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+        np.copyto(dst, src)
+        return dst
+
+    @property
+    def is_identity(self) -> bool:
+        return True
+
+    @property
+    def kernel_radius(self) -> Optional[int]:
+        return 0
+
+    def scaled(self, factor: float) -> Optional[BaseFilter]:
+        return self
+
     @property
     def name(self) -> str:
         return "none"
@@ -38,12 +129,17 @@ class FilterFactory:
     """Для создания экземпляров фильтров"""
 
     _filters: Dict[str, Type[BaseFilter]] = {}
+    # Общие экземпляры по (имя, интенсивность): подготовленные ядра переживают переключение фильтров
+    _instances: Dict[Tuple[str, float], BaseFilter] = {}
 
     @classmethod
     def register(cls, filter_class: Type[BaseFilter]) -> None:
         """Регистрирует класс фильтра"""
         instance = filter_class()
         cls._filters[instance.name] = filter_class
+        # Экземпляры прежнего класса с тем же именем больше не выдаются
+        for key in [key for key in cls._instances if key[0] == instance.name]:
+            del cls._instances[key]
 
     @classmethod
     def create(
@@ -57,6 +153,36 @@ class FilterFactory:
 
         return cls._filters[filter_name](intensity)
 
+    @classmethod
+    def get(
+        cls,
+        filter_name: str,
+        intensity: float = 1.0
+    ) -> BaseFilter:
+        """
+            Общий экземпляр фильтра из кэша (создаётся при первом запросе).
+            Экземпляр используется совместно, поэтому его интенсивность менять нельзя -
+            для другой интенсивности запрашивается другой экземпляр.
+            Фильтры с состоянием (is_stateful) не кэшируются: каждый вызов создаёт новый экземпляр
+        """
+        key = (filter_name, float(intensity))
+        instance = cls._instances.get(key)
+        if instance is None:
+            instance = cls.create(filter_name, intensity)
+            if not instance.is_stateful:
+                cls._instances[key] = instance
+        return instance
+
+    @classmethod
+    def is_stateful(cls, filter_name: str) -> bool:
+        """True, если результат фильтра с этим именем зависит от предыдущих кадров"""
+        return cls.create(filter_name).is_stateful
+
+    @classmethod
+    def clear_instances(cls) -> None:
+        """Сброс кэша экземпляров"""
+        cls._instances.clear()
+
     @classmethod
     def get_available_filters(cls) -> list:
         """Возврат списока имен доступных фильтров"""
@@ -1,3 +1,6 @@
+import copy
+from typing import Optional, Tuple
+
 import cv2
 import numpy as np
 
@@ -7,18 +10,52 @@ from .base import BaseFilter, FilterFactory
 class BlurFilter(BaseFilter):
     """Фильтр размытия по Гауссу для уменьшения шума"""
 
+    # Масштаб размера ядра для кадра, уменьшенного перед фильтрацией (см. scaled)
+    kernel_scale = 1.0
+
+    def _prepare(self, shape: Tuple[int, ...], dtype: np.dtype) -> None:
+        kernel_size = self._kernel_size()
+        self._ksize = (kernel_size, kernel_size)
+
     def apply(self, frame: np.ndarray) -> np.ndarray:
         """Размытие по Гауссу к кадру"""
+        self.prepare(frame.shape, frame.dtype)
+        return cv2.GaussianBlur(frame, self._ksize, 0)
+
+    def apply_into(self, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+        self.prepare(src.shape, src.dtype)
+        return cv2.GaussianBlur(src, self._ksize, 0, dst=dst)
+
+    @property
+    def kernel_radius(self) -> Optional[int]:
+        return self._kernel_size() // 2
+
+    def scaled(self, factor: float) -> Optional[BaseFilter]:
+        # Размытие уменьшенного кадра ядром, уменьшенным в том же отношении
+        blur = copy.copy(self)
+        blur.kernel_scale = self.kernel_scale * factor
+        blur._prepared_key = None
+        return blur
+
+    def separable_kernel(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        # GaussianBlur с sigma=0 использует те же коэффициенты, что и getGaussianKernel
+        coefficients = cv2.getGaussianKernel(self._kernel_size(), 0)
+        return coefficients, coefficients
+
+    def _kernel_size(self) -> int:
+        """Размер ядра по интенсивности"""
         # Определяем размер квадратной матрицы (ядра, kernel) на основе интенсивности
         # В результате размер ядра плавно увеличивается от 5 до 15 по мере роста интенсивности,
         kernel_size = int(5 + self.intensity * 10)
+        if self.kernel_scale != 1.0:
+            kernel_size = max(1, int(kernel_size * self.kernel_scale))
 
         # Ядро обязательно должно быть нечетного размера (например, 5x5, 7x7, 9x9),
         # чтобы центр ядра совпадал с обрабатываемым пикселем
         if kernel_size % 2 == 0:
             kernel_size += 1
 
-        return cv2.GaussianBlur(frame, (kernel_size, kernel_size), 0)
+        return kernel_size
 
     @property
     def name(self) -> str:
@@ -1,24 +1,35 @@
-import cv2
+from typing import Hashable, Optional, Tuple
+
 import numpy as np
 
-from .base import BaseFilter, FilterFactory
+from .base import FilterFactory
+from .lut import LutFilter
+
+
+class BrightnessFilter(LutFilter):
+    """Фильтр регулировки яркости"""
 
+    def lut_params(self) -> Hashable:
+        return self._brightness()
 
-class BrightnessFilter(BaseFilter):
-    """Фильтр повышения резкости для усиления краев"""
+    def mapping(self, values: np.ndarray) -> np.ndarray:
+        # Повторяет cv2.convertScaleAbs(alpha=1.0, beta=brightness): модуль результата с насыщением
+        return np.abs(values + self._brightness())
 
-    def apply(self, frame: np.ndarray) -> np.ndarray:
-        """Применяет регулировку яркости"""
-        # Преобразование интенсивности (0.0-1.0) в регулировку яркости (от -100 до +100)
-        brightness = (self.intensity - 0.5) * 200
+    def affine_params(self) -> Optional[Tuple[float, float]]:
+        # convertScaleAbs берёт модуль результата, поэтому при затемнении операция не аффинная
+        brightness = self._brightness()
+        if brightness < 0:
+            return None
+        return 1.0, brightness
 
-        # Применение регулировки яркости с помощью convertScaleAbs для скорости
-        adjusted = cv2.convertScaleAbs(frame, alpha=1.0, beta=brightness)
-        return adjusted
+    def _brightness(self) -> float:
+        """Преобразование интенсивности (0.0-1.0) в регулировку яркости (от -100 до +100)"""
+        return (self.intensity - 0.5) * 200
 
     @property
     def name(self) -> str:
         return "brightness"
 
 
-FilterFactory.register(BrightnessFilter)
\ No newline at end of file
+FilterFactory.register(BrightnessFilter)
@@ -0,0 +1,41 @@
+from typing import Hashable, Optional, Tuple
+
+import numpy as np
+
+from .base import FilterFactory
+from .lut import LutFilter
+
+# Середина диапазона, относительно которой растягивается контраст
+MIDPOINT = 127.5
+
+
+class ContrastFilter(LutFilter):
+    """Фильтр контрастности: растяжение значений относительно середины диапазона"""
+
+    def lut_params(self) -> Hashable:
+        return self._factor()
+
+    def mapping(self, values: np.ndarray) -> np.ndarray:
+        return (values - MIDPOINT) * self._factor() + MIDPOINT
+
+    def affine_params(self) -> Optional[Tuple[float, float]]:
+        factor = self._factor()
+        return factor, MIDPOINT * (1.0 - factor)
+
+    @property
+    def is_identity(self) -> bool:
+        return self._factor() == 1.0
+
+    def _factor(self) -> float:
+        """
+            Преобразование интенсивности (0.0-1.0) в коэффициент контраста от 0.5 до 2.0;
+            при интенсивности 0.5 кадр не меняется
+        """
+        return 2.0 ** ((self.intensity - 0.5) * 2)
+
+    @property
+    def name(self) -> str:
+        return "contrast"
+
+
+FilterFactory.register(ContrastFilter)
@@ -0,0 +1,64 @@
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .base import FilterFactory
+from .temporal import TemporalFilter
+
+
+class DenoiseFilter(TemporalFilter):
+    """
+        Временное шумоподавление с учётом движения.
+        Неподвижные пиксели усредняются по времени (как в TemporalFilter), а в областях движения накопитель
+        заменяется новым кадром, поэтому движущиеся объекты не оставляют шлейфа.
+        Движение определяется по локальному среднему модуля разницы кадра и предыдущего результата:
+        одиночные шумовые выбросы усредняются окном 5x5 и не считаются движением.
+        Все промежуточные буферы выделяются при подготовке, на кадр память не выделяется
+    """
+
+    # Порог локальной средней разницы (уровни 0-255), выше которого пиксель считается движущимся
+    MOTION_THRESHOLD = 20
+    MOTION_WINDOW = (5, 5)
+
+    def __init__(self, intensity: float = 1.0):
+        super().__init__(intensity)
+        self._smoothed: Optional[np.ndarray] = None  # Предыдущий результат в типе кадра
+        self._difference: Optional[np.ndarray] = None
+        self._motion: Optional[np.ndarray] = None
+        self.motion_ratio = 0.0  # Доля движущихся пикселей в последнем кадре
+
+    def _allocate(self, shape: Tuple[int, ...]) -> None:
+        self._smoothed = np.zeros(shape, dtype=np.uint8)
+        self._difference = np.zeros(shape, dtype=np.uint8)
+        self._motion = np.zeros(shape[:2], dtype=np.uint8)
+
+    def _update(self, frame: np.ndarray) -> None:
+        cv2.absdiff(frame, self._smoothed, dst=self._difference)
+        if self._difference.ndim == 3:
+            cv2.cvtColor(self._difference, cv2.COLOR_BGR2GRAY, dst=self._motion)
+            magnitude = self._motion
+        else:
+            magnitude = self._difference
+        cv2.blur(magnitude, self.MOTION_WINDOW, dst=self._motion)
+        cv2.threshold(self._motion, self.MOTION_THRESHOLD, 255, cv2.THRESH_BINARY, dst=self._motion)
+
+        cv2.accumulateWeighted(frame, self._accumulator, self.alpha)
+        moving = cv2.countNonZero(self._motion)
+        if moving:
+            # В областях движения накопитель заменяется новым кадром (вес 1)
+            cv2.accumulateWeighted(frame, self._accumulator, 1.0, mask=self._motion)
+        self.motion_ratio = moving / self._motion.size
+
+    def _output(self, dst: np.ndarray) -> np.ndarray:
+        # Результат сохраняется для сравнения со следующим кадром
+        cv2.convertScaleAbs(self._accumulator, dst=self._smoothed)
+        np.copyto(dst, self._smoothed)
+        return dst
+
+    @property
+    def name(self) -> str:
+        return "denoise"
+
+
+FilterFactory.register(DenoiseFilter)
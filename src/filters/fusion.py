@@ -0,0 +1,197 @@
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from .base import BaseFilter
+
+# Плотные ядра больше этого размера не объединяются: filter2D переходит на DFT,
+# и один проход с большим ядром обходится дороже нескольких проходов с маленькими
+MAX_DENSE_KERNEL = 9
+
+
+def _convolve_full(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Полная двумерная свёртка двух ядер (размер a + b - 1)"""
+    height = first.shape[0] + second.shape[0] - 1
+    width = first.shape[1] + second.shape[1] - 1
+    result = np.zeros((height, width), dtype=np.float64)
+    for row in range(second.shape[0]):
+        for col in range(second.shape[1]):
+            result[row:row + first.shape[0], col:col + first.shape[1]] += first * second[row, col]
+    return result
+
+
+class LinearStage(BaseFilter):
+    """
+        Объединённый линейный проход: свёртка (раздельная или плотная) и аффинное преобразование
+        alpha * x + beta, выполняемые одним вызовом OpenCV.
+        filter2D вычисляет корреляцию, а последовательные корреляции с ядрами k1 и k2 равны
+        одной корреляции с полной свёрткой k1 * k2, поэтому ядра объединяются свёрткой
+    """
+
+    def __init__(
+        self,
+        dense: Optional[np.ndarray] = None,
+        separable: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+        alpha: float = 1.0,
+        beta: float = 0.0,
+        source_names: Sequence[str] = ()
+    ):
+        super().__init__(1.0)
+        self.dense = dense
+        self.separable = separable
+        self.alpha = alpha
+        self.beta = beta
+        self.source_names = list(source_names)
+        # Исходный фильтр, если этап ни с чем не объединён: тогда применяется он сам, без изменения результата
+        self.origin: Optional[BaseFilter] = None
+
+    @classmethod
+    def from_filter(cls, image_filter: BaseFilter) -> Optional["LinearStage"]:
+        """Линейное представление фильтра или None, если фильтр нелинейный"""
+        separable = image_filter.separable_kernel()
+        dense = image_filter.linear_kernel()
+        affine = image_filter.affine_params()
+        if separable is not None:
+            kernel_x, kernel_y = separable
+            stage = cls(separable=(kernel_x.astype(np.float64), kernel_y.astype(np.float64)))
+        elif dense is not None:
+            stage = cls(dense=dense.astype(np.float64))
+        elif affine is not None:
+            stage = cls(alpha=affine[0], beta=affine[1])
+        else:
+            return None
+        stage.source_names = [image_filter.name]
+        stage.origin = image_filter
+        return stage
+
+    @property
+    def has_kernel(self) -> bool:
+        return self.dense is not None or self.separable is not None
+
+    def dense_kernel(self) -> Optional[np.ndarray]:
+        if self.separable is not None:
+            kernel_x, kernel_y = self.separable
+            return np.outer(kernel_y.ravel(), kernel_x.ravel())
+        return self.dense
+
+    def kernel_size(self) -> int:
+        if self.separable is not None:
+            return max(self.separable[0].size, self.separable[1].size)
+        if self.dense is not None:
+            return max(self.dense.shape)
+        return 1
+
+    @property
+    def kernel_radius(self) -> Optional[int]:
+        if self.separable is not None:
+            return self.separable[1].size // 2
+        if self.dense is not None:
+            return self.dense.shape[0] // 2
+        return 0
+
+    def then(self, other: "LinearStage") -> Optional["LinearStage"]:
+        """
+            Композиция: сначала self, затем other. None, если объединение невыгодно.
+            other(self(x)) = a2 * K2(a1 * K1 x + b1) + b2 = a1*a2 * (K1*K2) x + (a2 * b1 * sum(K2) + b2)
+        """
+        alpha = self.alpha * other.alpha
+        kernel_sum = float(other.dense_kernel().sum()) if other.has_kernel else 1.0
+        beta = other.alpha * self.beta * kernel_sum + other.beta
+        names = self.source_names + other.source_names
+
+        if not self.has_kernel or not other.has_kernel:
+            # Аффинное преобразование просто переносится в проход соседнего ядра
+            stage = self if self.has_kernel else other
+            return LinearStage(stage.dense, stage.separable, alpha, beta, names)
+
+        if self.separable is not None and other.separable is not None:
+            separable = (
+                np.convolve(self.separable[0].ravel(), other.separable[0].ravel()),
+                np.convolve(self.separable[1].ravel(), other.separable[1].ravel()),
+            )
+            return LinearStage(separable=separable, alpha=alpha, beta=beta, source_names=names)
+
+        if self.kernel_size() + other.kernel_size() - 1 > MAX_DENSE_KERNEL:
+            return None
+        dense = _convolve_full(self.dense_kernel(), other.dense_kernel())
+        return LinearStage(dense=dense, alpha=alpha, beta=beta, source_names=names)
+
+    def is_noop(self) -> bool:
+        """Ядро-единица без аффинного сдвига"""
+        if self.alpha != 1.0 or self.beta != 0.0:
+            return False
+        if not self.has_kernel:
+            return True
+        kernel = self.dense_kernel()
+        identity = np.zeros_like(kernel)
+        identity[kernel.shape[0] // 2, kernel.shape[1] // 2] = 1.0
+        return kernel.shape[0] % 2 == 1 and kernel.shape[1] % 2 == 1 and np.allclose(kernel, identity)
+
+    def apply(self, frame: np.ndarray) -> np.ndarray:
+        return self.apply_into(frame, np.empty_like(frame))
+
+    def _prepare(self, shape: Tuple[int, ...], dtype: np.dtype) -> None:
+        # Коэффициент alpha вносится в ядро один раз, а не на каждом кадре
+        if self.separable is not None:
+            kernel_x, kernel_y = self.separable
+            self._scaled_kernels = (kernel_x * self.alpha, kernel_y)
+        else:
+            # Без ядра аффинный проход выполняется ядром 1x1
+            kernel = self.dense if self.dense is not None else np.ones((1, 1), dtype=np.float64)
+            self._scaled_kernels = (kernel * self.alpha,)
+
+    def apply_into(self, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+        self.prepare(src.shape, src.dtype)
+        if self.separable is not None:
+            kernel_x, kernel_y = self._scaled_kernels
+            return cv2.sepFilter2D(src, -1, kernel_x, kernel_y, dst=dst, delta=self.beta)
+        return cv2.filter2D(src, -1, self._scaled_kernels[0], dst=dst, delta=self.beta)
+
+    @property
+    def name(self) -> str:
+        return "fused(" + ",".join(self.source_names) + ")"
+
+
+def optimize_filters(filters: Sequence[BaseFilter]) -> List[BaseFilter]:
+    """
+        Оптимизация цепочки фильтров:
+        - фильтры-заглушки и ядра-единицы удаляются;
+        - соседние свёртки объединяются в одно ядро (раздельные остаются раздельными);
+        - аффинные поточечные операции переносятся в проход соседней свёртки.
+        Промежуточные результаты больше не округляются и не насыщаются до uint8,
+        поэтому результат совпадает с последовательным применением с точностью до округления
+        везде, кроме пикселей, где промежуточный результат выходил за [0, 255]
+    """
+    optimized: List[BaseFilter] = []
+    pending: Optional[LinearStage] = None
+
+    def flush() -> None:
+        nonlocal pending
+        if pending is not None and not pending.is_noop():
+            optimized.append(pending.origin or pending)
+        pending = None
+
+    for image_filter in filters:
+        if image_filter.is_identity:
+            continue
+
+        stage = LinearStage.from_filter(image_filter)
+        if stage is None:
+            flush()
+            optimized.append(image_filter)
+            continue
+
+        if pending is None:
+            pending = stage
+            continue
+
+        combined = pending.then(stage)
+        if combined is None:
+            flush()
+            pending = stage
+        else:
+            pending = combined
+
+    flush()
+    return optimized
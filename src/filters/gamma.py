@@ -0,0 +1,31 @@
+from typing import Hashable
+
+import numpy as np
+
+from .base import FilterFactory
+from .lut import LutFilter
+
+
+class GammaFilter(LutFilter):
+    """Гамма-коррекция: out = 255 * (in / 255) ^ gamma"""
+
+    def lut_params(self) -> Hashable:
+        return self._gamma()
+
+    def mapping(self, values: np.ndarray) -> np.ndarray:
+        return 255.0 * (values / 255.0) ** self._gamma()
+
+    @property
+    def is_identity(self) -> bool:
+        return self._gamma() == 1.0
+
+    def _gamma(self) -> float:
+        """Преобразование интенсивности (0.0-1.0) в гамму (от 2.0 до 0.5; при интенсивности 0.5 кадр не меняется)"""
+        return 2.0 ** ((0.5 - self.intensity) * 2)
+
+    @property
+    def name(self) -> str:
+        return "gamma"
+
+
+FilterFactory.register(GammaFilter)
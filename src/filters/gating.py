@@ -0,0 +1,192 @@
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ..utils.metrics import REGISTRY
+from .pipeline import FilterPipeline
+
+
+@dataclass
+class GateStats:
+    """Счётчики решений детектора изменений"""
+
+    full: int = 0     # Кадров обработано целиком
+    partial: int = 0  # Кадров, в которых перефильтрованы только изменившиеся плитки
+    skipped: int = 0  # Кадров без изменений: повторён предыдущий результат
+    tiles: int = 0    # Перефильтровано плиток при частичной обработке
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+    def rates(self) -> Dict[str, float]:
+        """Доли решений от всех кадров"""
+        total = self.full + self.partial + self.skipped
+        if total == 0:
+            return {"full": 0.0, "partial": 0.0, "skipped": 0.0}
+        return {"full": self.full / total, "partial": self.partial / total, "skipped": self.skipped / total}
+
+
+class ChangeGate:
+    """
+        Пропуск повторной фильтрации статичных кадров.
+        Кадр уменьшается до сетки ячеек cell x cell пикселей (INTER_AREA - средние по ячейкам) и сравнивается
+        с сигнатурой кадра, по которому построен текущий результат. Ячейки с разницей больше threshold
+        отмечают изменившиеся плитки tile x tile:
+        - изменений нет - возвращается предыдущий результат цепочки;
+        - изменилась доля плиток не больше partial_limit - перефильтровываются только они (с перекрытием
+          на суммарный радиус ядер цепочки, поэтому плитки совпадают с полной обработкой);
+        - иначе, а также раз в refresh_frames кадров, кадр обрабатывается целиком.
+        Сравнение идёт с сигнатурой обработанного кадра, а не предыдущего, поэтому медленные изменения
+        (например, освещения) накапливаются и не теряются.
+        Цепочка с фильтрами с состоянием (temporal, denoise) обрабатывает каждый кадр целиком: пропущенный кадр
+        не попал бы в их накопитель, а плитка подменила бы его кадром другого размера
+    """
+
+    def __init__(
+        self,
+        threshold: float = 4.0,
+        tile: int = 64,
+        partial_limit: float = 0.5,
+        refresh_frames: int = 30,
+        cell: int = 8
+    ):
+        self.threshold = threshold
+        self.cell = cell
+        self.cells_per_tile = max(1, tile // cell)
+        self.partial_limit = partial_limit
+        self.refresh_frames = refresh_frames  # 0 - без принудительной полной обработки
+        self.stats = GateStats()
+
+        self._pipeline: Optional[FilterPipeline] = None
+        self._tile_pipeline: Optional[FilterPipeline] = None
+        self._halo: Optional[int] = None
+        self._stateful = False
+        self._output: Optional[np.ndarray] = None
+        self._reference: Optional[np.ndarray] = None  # Сигнатура кадра, по которому построен результат
+        self._signature: Optional[np.ndarray] = None
+        self._frames_since_full = 0
+
+        frames = REGISTRY.counter("video_gate_frames_total", "Frames by change-detection decision")
+        self._metrics = {decision: frames.labels(decision=decision) for decision in ("full", "partial", "skipped")}
+
+    def reset(self) -> None:
+        """Сброс состояния: следующий кадр обрабатывается целиком"""
+        self._pipeline = None
+        self._output = None
+        self._reference = None
+
+    def apply(self, pipeline: FilterPipeline, frame: np.ndarray) -> np.ndarray:
+        """Применение цепочки к кадру с пропуском неизменившихся плиток"""
+        if pipeline.is_passthrough:
+            # Без фильтров результат - сам кадр слота, его нельзя повторять после возврата слота
+            return pipeline.apply(frame)
+        if pipeline is not self._pipeline:
+            self._bind(pipeline)
+        if self._stateful:
+            self._record("full")
+            return pipeline.apply(frame)
+
+        height, width = frame.shape[:2]
+        grid = (max(1, width // self.cell), max(1, height // self.cell))
+        self._signature = cv2.resize(frame, grid, dst=self._signature, interpolation=cv2.INTER_AREA)
+
+        if (
+            self._output is None
+            or self._reference is None
+            or self._reference.shape != self._signature.shape
+            or (self.refresh_frames and self._frames_since_full >= self.refresh_frames)
+        ):
+            return self._full(frame)
+
+        changed = self._changed_tiles()
+        if not changed:
+            self._record("skipped")
+            self._frames_since_full += 1
+            return self._output
+
+        tile_rows, tile_cols = self._tile_grid()
+        if self._halo is None or len(changed) > self.partial_limit * tile_rows * tile_cols:
+            return self._full(frame)
+
+        for row, col in changed:
+            self._refilter_tile(frame, row, col)
+        self.stats.tiles += len(changed)
+        self._record("partial")
+        self._frames_since_full += 1
+        return self._output
+
+    def _bind(self, pipeline: FilterPipeline) -> None:
+        """Новая цепочка: частичная обработка возможна, если у всех фильтров известен радиус ядра"""
+        self.reset()
+        self._pipeline = pipeline
+        self._stateful = any(image_filter.is_stateful for image_filter in pipeline.all_filters)
+        radii = [image_filter.kernel_radius for image_filter in pipeline.filters]
+        if pipeline.post is None and pipeline.output_scale == 1.0 and None not in radii:
+            self._halo = sum(radii)
+            # Отдельная цепочка для плиток: буферы полной цепочки не пересоздаются под размер плитки
+            self._tile_pipeline = FilterPipeline(pipeline.all_filters, pipeline.fuse)
+        else:
+            self._halo = None
+            self._tile_pipeline = None
+
+    def _full(self, frame: np.ndarray) -> np.ndarray:
+        self._output = self._pipeline.apply(frame)
+        if self._reference is None or self._reference.shape != self._signature.shape:
+            self._reference = self._signature.copy()
+        else:
+            np.copyto(self._reference, self._signature)
+        self._frames_since_full = 0
+        self._record("full")
+        return self._output
+
+    def _tile_grid(self) -> Tuple[int, int]:
+        rows, cols = self._signature.shape[:2]
+        step = self.cells_per_tile
+        return (rows + step - 1) // step, (cols + step - 1) // step
+
+    def _changed_tiles(self) -> List[Tuple[int, int]]:
+        """Плитки, в которых хотя бы одна ячейка изменилась больше порога"""
+        diff = cv2.absdiff(self._signature, self._reference)
+        if diff.ndim == 3:
+            diff = diff.max(axis=2)
+        changed_cells = diff > self.threshold
+        if not changed_cells.any():
+            return []
+        if self._halo:
+            # Изменение влияет на результат в радиусе ядер цепочки, в том числе в соседних плитках
+            reach = 2 * -(-self._halo // self.cell) + 1
+            changed_cells = cv2.dilate(changed_cells.astype(np.uint8), np.ones((reach, reach), np.uint8)) > 0
+
+        step = self.cells_per_tile
+        tile_rows, tile_cols = self._tile_grid()
+        padded = np.zeros((tile_rows * step, tile_cols * step), dtype=bool)
+        padded[:changed_cells.shape[0], :changed_cells.shape[1]] = changed_cells
+        tiles = padded.reshape(tile_rows, step, tile_cols, step).any(axis=(1, 3))
+        return [(int(row), int(col)) for row, col in zip(*np.nonzero(tiles))]
+
+    def _refilter_tile(self, frame: np.ndarray, row: int, col: int) -> None:
+        """Фильтрация плитки с перекрытием и запись её внутренней части в предыдущий результат"""
+        height, width = frame.shape[:2]
+        rows, cols = self._signature.shape[:2]
+        step = self.cells_per_tile
+        # Границы плитки в пикселях по границам её ячеек; последняя плитка доходит до края кадра
+        y0 = row * step * height // rows
+        y1 = height if (row + 1) * step >= rows else (row + 1) * step * height // rows
+        x0 = col * step * width // cols
+        x1 = width if (col + 1) * step >= cols else (col + 1) * step * width // cols
+
+        halo = self._halo
+        sy0, sy1 = max(0, y0 - halo), min(height, y1 + halo)
+        sx0, sx1 = max(0, x0 - halo), min(width, x1 + halo)
+        result = self._tile_pipeline.apply(frame[sy0:sy1, sx0:sx1])
+        self._output[y0:y1, x0:x1] = result[y0 - sy0:y1 - sy0, x0 - sx0:x1 - sx0]
+
+        cell_rows = slice(row * step, min(rows, (row + 1) * step))
+        cell_cols = slice(col * step, min(cols, (col + 1) * step))
+        self._reference[cell_rows, cell_cols] = self._signature[cell_rows, cell_cols]
+
+    def _record(self, decision: str) -> None:
+        setattr(self.stats, decision, getattr(self.stats, decision) + 1)
+        self._metrics[decision].inc()
@@ -0,0 +1,134 @@
+import threading
+from abc import abstractmethod
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .base import BaseFilter
+
+LutKey = Tuple[str, Hashable]
+
+
+class LutCache:
+    """
+        Ограниченный LRU-кэш скомпилированных таблиц (ключ - имя фильтра и параметры).
+        При смене интенсивности на лету таблица для уже встречавшихся параметров не пересчитывается
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._tables: "OrderedDict[LutKey, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: LutKey, compile_table: Callable[[], np.ndarray]) -> np.ndarray:
+        """Таблица из кэша или скомпилированная заново"""
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                self.hits += 1
+                return table
+            self.misses += 1
+
+        table = compile_table()
+        table.setflags(write=False)
+        with self._lock:
+            self._tables[key] = table
+            self._tables.move_to_end(key)
+            while len(self._tables) > self.maxsize:
+                self._tables.popitem(last=False)
+        return table
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tables.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+
+# Общий кэш таблиц процесса
+LUT_CACHE = LutCache()
+
+
+def compile_table(mapping: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+    """
+        Компиляция поточечного отображения в таблицу uint8 на 256 значений.
+        mapping получает значения 0..255 (float64) и возвращает массив (256,) либо (256, каналы)
+        для поканальных кривых
+    """
+    values = np.asarray(mapping(np.arange(256, dtype=np.float64)), dtype=np.float64)
+    table = np.clip(np.rint(values), 0, 255).astype(np.uint8)
+    if table.ndim == 2:
+        # cv2.LUT принимает многоканальную таблицу в форме (1, 256, каналы)
+        return np.ascontiguousarray(table.reshape(1, 256, table.shape[1]))
+    return table
+
+
+class LutFilter(BaseFilter):
+    """
+        Базовый класс поточечных фильтров (яркость, контраст, гамма, кривые).
+        Отображение один раз компилируется в таблицу и применяется одним вызовом cv2.LUT.
+        Кадры не uint8 обрабатываются прямым вычислением отображения
+    """
+
+    cache: LutCache = LUT_CACHE
+
+    def __init__(self, intensity: float = 1.0):
+        super().__init__(intensity)
+        self._table_key: Optional[LutKey] = None
+        self._table: Optional[np.ndarray] = None
+
+    @abstractmethod
+    def lut_params(self) -> Hashable:
+        """Параметры, однозначно задающие таблицу"""
+        pass
+
+    @abstractmethod
+    def mapping(self, values: np.ndarray) -> np.ndarray:
+        """Поточечное отображение значений пикселей (float64) до насыщения"""
+        pass
+
+    @property
+    def kernel_radius(self) -> Optional[int]:
+        return 0
+
+    def scaled(self, factor: float) -> Optional[BaseFilter]:
+        # Поточечное преобразование не зависит от разрешения
+        return self
+
+    @property
+    def table(self) -> np.ndarray:
+        """Таблица для текущих параметров; кэш опрашивается только при их изменении"""
+        key = (self.name, self.lut_params())
+        if key != self._table_key:
+            self._table = self.cache.get(key, lambda: compile_table(self.mapping))
+            self._table_key = key
+        return self._table
+
+    def _prepare(self, shape: Tuple[int, ...], dtype: np.dtype) -> None:
+        # Таблица компилируется заранее, а не на первом кадре
+        if dtype == np.uint8:
+            self.table
+
+    def _apply_direct(self, frame: np.ndarray) -> np.ndarray:
+        values = self.mapping(frame.astype(np.float64))
+        if np.issubdtype(frame.dtype, np.integer):
+            values = np.rint(values)
+        return np.clip(values, 0, 255).astype(frame.dtype)
+
+    def apply(self, frame: np.ndarray) -> np.ndarray:
+        if frame.dtype != np.uint8:
+            return self._apply_direct(frame)
+        return cv2.LUT(frame, self.table)
+
+    def apply_into(self, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+        if src.dtype != np.uint8:
+            return super().apply_into(src, dst)
+        return cv2.LUT(src, self.table, dst=dst)
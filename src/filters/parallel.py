@@ -0,0 +1,142 @@
+import copy
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..exceptions import FilterError
+from .base import BaseFilter
+
+# Полоса кадра: (начало входа, конец входа, начало выхода, конец выхода) по строкам
+Band = Tuple[int, int, int, int]
+
+_pools: Dict[int, ThreadPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(workers: int) -> ThreadPoolExecutor:
+    """Общий пул потоков на заданное число исполнителей; создаётся один раз и переиспользуется"""
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"tiles{workers}")
+            _pools[workers] = pool
+        return pool
+
+
+def split_bands(height: int, count: int, halo: int) -> List[Band]:
+    """
+        Разбиение кадра на горизонтальные полосы.
+        Вход каждой полосы расширен на halo строк сверху и снизу (в пределах кадра),
+        поэтому пиксели на границах полос считаются по тем же соседям, что и при обработке целого кадра
+    """
+    count = max(1, min(count, height))
+    bands = []
+    for index in range(count):
+        out_start = height * index // count
+        out_stop = height * (index + 1) // count
+        bands.append((max(0, out_start - halo), min(height, out_stop + halo), out_start, out_stop))
+    return bands
+
+
+class TiledFilter(BaseFilter):
+    """
+        Параллельное выполнение фильтра по горизонтальным полосам в пуле потоков.
+        OpenCV отпускает GIL, поэтому полосы обрабатываются на разных ядрах одновременно.
+        Перекрытие полос (halo) равно радиусу ядра фильтра, и результат совпадает с однопоточным побитно.
+        Каждая полоса обрабатывается своей копией фильтра, подготовленной под форму полосы
+    """
+
+    def __init__(self, inner: BaseFilter, workers: int = 0, min_band_rows: int = 32):
+        if inner.kernel_radius is None:
+            raise FilterError(f"Filter '{inner.name}' does not support tiled execution")
+        super().__init__(inner.intensity)
+        self.inner = inner
+        self.workers = workers or os.cpu_count() or 1
+        self.min_band_rows = min_band_rows
+        self._bands: List[Band] = []
+        self._band_filters: List[BaseFilter] = []
+        self._band_scratch: List[Optional[np.ndarray]] = []
+
+    @property
+    def name(self) -> str:
+        return self.inner.name
+
+    @property
+    def is_identity(self) -> bool:
+        return self.inner.is_identity
+
+    @property
+    def kernel_radius(self) -> Optional[int]:
+        return self.inner.kernel_radius
+
+    def _prepare(self, shape: Tuple[int, ...], dtype: np.dtype) -> None:
+        halo = self.inner.kernel_radius
+        count = min(self.workers, max(1, shape[0] // max(self.min_band_rows, 2 * halo + 1)))
+        self._bands = split_bands(shape[0], count, halo)
+        self._band_filters = []
+        self._band_scratch = []
+        for src_start, src_stop, _, _ in self._bands:
+            band_shape = (src_stop - src_start,) + tuple(shape[1:])
+            band_filter = copy.copy(self.inner)
+            band_filter.intensity = self.intensity
+            band_filter.prepare(band_shape, dtype)
+            self._band_filters.append(band_filter)
+            # Поточечным фильтрам перекрытие не нужно: полоса пишется прямо в выходной кадр
+            self._band_scratch.append(np.empty(band_shape, dtype=dtype) if halo else None)
+
+    def _run_band(self, index: int, src: np.ndarray, dst: np.ndarray) -> None:
+        src_start, src_stop, out_start, out_stop = self._bands[index]
+        band_filter = self._band_filters[index]
+        scratch = self._band_scratch[index]
+        target = dst[out_start:out_stop]
+
+        if scratch is None:
+            result = band_filter.apply_into(src[src_start:src_stop], target)
+            if result is not target:
+                np.copyto(target, result)
+            return
+
+        result = band_filter.apply_into(src[src_start:src_stop], scratch)
+        offset = out_start - src_start
+        np.copyto(target, result[offset:offset + out_stop - out_start])
+
+    def apply(self, frame: np.ndarray) -> np.ndarray:
+        return self.apply_into(frame, np.empty_like(frame))
+
+    def apply_into(self, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+        self.prepare(src.shape, src.dtype)
+        if dst.shape != src.shape or dst.dtype != src.dtype:
+            dst = np.empty_like(src)
+
+        if len(self._bands) == 1:
+            self._run_band(0, src, dst)
+            return dst
+
+        # Первая полоса обрабатывается в вызывающем потоке, остальные - в пуле
+        pool = get_pool(self.workers)
+        futures = [pool.submit(self._run_band, index, src, dst) for index in range(1, len(self._bands))]
+        self._run_band(0, src, dst)
+        for future in futures:
+            future.result()
+        return dst
+
+
+def tile_filters(
+    filters: Sequence[BaseFilter],
+    filter_names: Sequence[str],
+    workers: int = 0
+) -> List[BaseFilter]:
+    """Оборачивает в TiledFilter фильтры с именами из filter_names ("*" - все, поддерживающие полосы)"""
+    selected = set(filter_names)
+    result: List[BaseFilter] = []
+    for image_filter in filters:
+        names = getattr(image_filter, "source_names", None) or [image_filter.name]
+        wanted = "*" in selected or any(name in selected for name in names)
+        if wanted and image_filter.kernel_radius is not None:
+            result.append(TiledFilter(image_filter, workers))
+        else:
+            result.append(image_filter)
+    return result
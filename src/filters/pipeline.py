@@ -0,0 +1,161 @@
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from .base import BaseFilter, FilterFactory
+from .fusion import optimize_filters
+from .parallel import tile_filters
+from .planner import plan_resize
+
+
+class FilterPipeline:
+    """
+        Цепочка фильтров, применяемых по порядку (например, blur,brightness).
+        Промежуточные результаты пишутся в два чередующихся буфера (ping-pong) через apply_into,
+        поэтому после первого кадра цепочка из N фильтров не выделяет память.
+        Фильтры-заглушки (none) пропускаются; пустая цепочка возвращает исходный кадр без копирования.
+        С fuse=True соседние линейные фильтры объединяются в один проход (см. fusion.optimize_filters).
+        Фильтры из tiled выполняются параллельно по полосам кадра (см. parallel.TiledFilter).
+        С output_scale != 1 цепочка возвращает кадр в выходном разрешении; место масштабирования
+        выбирает planner.plan_resize (resize_mode), и фильтры после него выполняются вложенной цепочкой post.
+        Возвращаемый кадр принадлежит конвейеру и действителен до следующего вызова apply()
+    """
+
+    def __init__(
+        self,
+        filters: Sequence[BaseFilter],
+        fuse: bool = False,
+        tiled: Sequence[str] = (),
+        tile_workers: int = 0,
+        output_scale: float = 1.0,
+        resize_mode: str = "auto"
+    ):
+        self.all_filters: List[BaseFilter] = list(filters)
+        self.fuse = fuse
+        self.output_scale = output_scale
+        before, after = plan_resize(self.all_filters, output_scale, resize_mode)
+        self.filters: List[BaseFilter] = self._optimize(before, fuse, tiled, tile_workers)
+        # Фильтры в выходном разрешении; у вложенной цепочки свои буферы ping-pong
+        self.post: Optional[FilterPipeline] = FilterPipeline(after, fuse, tiled, tile_workers) if after else None
+        self._buffers: List[Optional[np.ndarray]] = [None, None]
+        self._resized: Optional[np.ndarray] = None  # Предвыделенный буфер результата масштабирования
+
+    @staticmethod
+    def _optimize(
+        filters: Sequence[BaseFilter],
+        fuse: bool,
+        tiled: Sequence[str],
+        tile_workers: int
+    ) -> List[BaseFilter]:
+        if fuse:
+            result = optimize_filters(filters)
+        else:
+            result = [image_filter for image_filter in filters if not image_filter.is_identity]
+        if tiled:
+            result = tile_filters(result, tiled, tile_workers)
+        return result
+
+    @classmethod
+    def from_names(
+        cls,
+        filter_names: Sequence[str],
+        intensity: float = 1.0,
+        fuse: bool = False,
+        tiled: Sequence[str] = (),
+        tile_workers: int = 0,
+        output_scale: float = 1.0,
+        resize_mode: str = "auto"
+    ) -> "FilterPipeline":
+        """Создаёт цепочку из общих экземпляров зарегистрированных фильтров (FilterFactory.get)"""
+        filters = [FilterFactory.get(filter_name, intensity) for filter_name in filter_names]
+        return cls(filters, fuse, tiled, tile_workers, output_scale, resize_mode)
+
+    @property
+    def name(self) -> str:
+        return ",".join(image_filter.name for image_filter in self.all_filters) or "none"
+
+    @property
+    def is_passthrough(self) -> bool:
+        """True, если цепочка возвращает кадр без изменений"""
+        return not self.has_filters and self.output_scale == 1.0
+
+    @property
+    def has_filters(self) -> bool:
+        return bool(self.filters) or self.post is not None
+
+    @property
+    def geometry(self) -> Optional[Tuple[Tuple[int, ...], np.dtype]]:
+        """Форма и тип кадра, под которые выделены буферы"""
+        buffer = self._buffers[0]
+        return (buffer.shape, buffer.dtype) if buffer is not None else None
+
+    def prepare(self, shape: Sequence[int], dtype) -> None:
+        """
+            Подготовка фильтров и буферов ping-pong к кадрам заданной геометрии с пробным прогоном.
+            После неё первый реальный кадр обрабатывается без выделения памяти и пересчёта ядер
+        """
+        if self.is_passthrough:
+            return
+        warmup_frame = np.zeros(tuple(shape), dtype=dtype)
+        for image_filter in self.filters:
+            image_filter.prepare(warmup_frame.shape, warmup_frame.dtype)
+        if self.filters:
+            self._scratch(0, warmup_frame)
+            self._scratch(1, warmup_frame)
+        # Прогон инициализирует внутренние буферы и потоки OpenCV, а также буферы масштабирования и post
+        self.apply(warmup_frame)
+        # Пустой кадр прогона не должен попасть в историю фильтров с состоянием
+        for image_filter in self.all_filters:
+            image_filter.reset()
+
+    def _scratch(self, index: int, frame: np.ndarray) -> np.ndarray:
+        """Буфер ping-pong; пересоздаётся только при смене формы или типа кадра"""
+        buffer = self._buffers[index]
+        if buffer is None or buffer.shape != frame.shape or buffer.dtype != frame.dtype:
+            buffer = np.empty_like(frame)
+            self._buffers[index] = buffer
+        return buffer
+
+    def output_size(self, shape: Sequence[int]) -> Tuple[int, int]:
+        """(ширина, высота) результата для кадра формы shape"""
+        return max(1, int(shape[1] * self.output_scale)), max(1, int(shape[0] * self.output_scale))
+
+    def _resize(self, frame: np.ndarray) -> np.ndarray:
+        """Масштабирование в предвыделенный буфер; он пересоздаётся только при смене размера или типа"""
+        width, height = self.output_size(frame.shape)
+        resized = self._resized
+        if resized is None or resized.shape[:2] != (height, width) or resized.shape[2:] != frame.shape[2:] \
+                or resized.dtype != frame.dtype:
+            resized = None
+        self._resized = cv2.resize(frame, (width, height), dst=resized, interpolation=cv2.INTER_LINEAR)
+        return self._resized
+
+    def apply(self, frame: np.ndarray) -> np.ndarray:
+        """Применение всей цепочки к кадру"""
+        result = frame
+        for index, image_filter in enumerate(self.filters):
+            result = image_filter.apply_into(result, self._scratch(index % 2, result))
+
+        if self.output_scale == 1.0:
+            return result
+        result = self._resize(result)
+        return self.post.apply(result) if self.post else result
+
+    def apply_into(self, frame: np.ndarray, dst: np.ndarray) -> np.ndarray:
+        """Применение цепочки с записью результата в готовый буфер dst (последний фильтр пишет прямо в него)"""
+        if self.output_scale != 1.0:
+            np.copyto(dst, self.apply(frame))
+            return dst
+        if not self.filters:
+            np.copyto(dst, frame)
+            return dst
+
+        result = frame
+        last = len(self.filters) - 1
+        for index, image_filter in enumerate(self.filters):
+            target = dst if index == last else self._scratch(index % 2, result)
+            result = image_filter.apply_into(result, target)
+        if result is not dst:
+            np.copyto(dst, result)
+        return dst
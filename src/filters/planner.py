@@ -0,0 +1,33 @@
+from typing import List, Sequence, Tuple
+
+from .base import BaseFilter
+
+# Режимы размещения масштабирования в цепочке:
+#   auto   - уменьшение кадра переносится перед фильтрами, перестановочными с масштабированием
+#   strict - масштабирование всегда после всей цепочки (результат совпадает с фильтрацией в полном разрешении)
+RESIZE_MODES = ["auto", "strict"]
+
+
+def plan_resize(
+    filters: Sequence[BaseFilter],
+    scale: float,
+    mode: str = "auto"
+) -> Tuple[List[BaseFilter], List[BaseFilter]]:
+    """
+        Разбиение цепочки на фильтры до масштабирования и после него.
+        Масштабирование переносится к началу цепочки через фильтры с конца, пока они перестановочны с ним
+        (BaseFilter.scaled): такие фильтры выполняются в выходном разрешении с пересчитанными параметрами ядра.
+        Переносится только уменьшение кадра - при увеличении дешевле фильтровать до него
+    """
+    if mode == "strict" or scale >= 1.0:
+        return list(filters), []
+
+    split = len(filters)
+    after: List[BaseFilter] = []
+    while split > 0:
+        scaled_filter = filters[split - 1].scaled(scale)
+        if scaled_filter is None:
+            break
+        after.insert(0, scaled_filter)
+        split -= 1
+    return list(filters[:split]), after
@@ -1,3 +1,5 @@
+from typing import Optional, Tuple
+
 import cv2
 import numpy as np
 
@@ -7,8 +9,33 @@ from .base import BaseFilter, FilterFactory
 class SharpenFilter(BaseFilter):
     """Фильтр повышения резкости"""
 
+    def _prepare(self, shape: Tuple[int, ...], dtype: np.dtype) -> None:
+        self._prepared_kernel = self._kernel()
+
     def apply(self, frame: np.ndarray) -> np.ndarray:
         """Применяем фильтр повышения резкости"""
+        self.prepare(frame.shape, frame.dtype)
+        sharpened = cv2.filter2D(frame, -1, self._prepared_kernel)
+        # Для uint8 filter2D уже насыщает значения, отдельный проход не нужен
+        if sharpened.dtype == np.uint8:
+            return sharpened
+        # Ограничиваем значения пикселей в диапазоне [0, 255]
+        return np.clip(sharpened, 0, 255).astype(np.uint8)
+
+    def apply_into(self, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+        # filter2D с ddepth=-1 сохраняет тип кадра и насыщает значения uint8 сам
+        self.prepare(src.shape, src.dtype)
+        return cv2.filter2D(src, -1, self._prepared_kernel, dst=dst)
+
+    @property
+    def kernel_radius(self) -> Optional[int]:
+        return 1
+
+    def linear_kernel(self) -> Optional[np.ndarray]:
+        return self._kernel()
+
+    def _kernel(self) -> np.ndarray:
+        """Ядро резкости для текущей интенсивности"""
         # Базовая квадратная матрица для повышения резкости
         base_kernel = np.array([
             [0, -1, 0],
@@ -24,11 +51,7 @@ class SharpenFilter(BaseFilter):
         ], dtype=np.float32)
 
         # Интерполяция между единичным и ядром резкости на основе интенсивности
-        kernel = identity_kernel * (1.0 - self.intensity) + base_kernel * self.intensity
-
-        sharpened = cv2.filter2D(frame, -1, kernel)
-        # Ограничиваем значения пикселей в диапазоне [0, 255]
-        return np.clip(sharpened, 0, 255).astype(np.uint8)
+        return identity_kernel * (1.0 - self.intensity) + base_kernel * self.intensity
 
     @property
     def name(self) -> str:
@@ -0,0 +1,109 @@
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .base import BaseFilter, FilterFactory
+
+
+class TemporalFilter(BaseFilter):
+    """
+        Временное сглаживание: экспоненциальное скользящее среднее кадров (cv2.accumulateWeighted).
+        Шум усредняется по времени, а не по соседним пикселям, поэтому детали неподвижной сцены сохраняются.
+        Фильтр хранит состояние: накопитель float32 выделяется при подготовке и обновляется на месте.
+        Накопитель сбрасывается при смене разрешения и при смене сцены (резкое изменение всего кадра)
+    """
+
+    # Средняя разница уменьшенных кадров (уровни 0-255), выше которой кадр считается сменой сцены
+    SCENE_CUT_THRESHOLD = 30.0
+    # Размер уменьшенного кадра для обнаружения смены сцены
+    SIGNATURE_SIZE = (64, 36)
+
+    def __init__(self, intensity: float = 1.0):
+        super().__init__(intensity)
+        self._accumulator: Optional[np.ndarray] = None
+        self._signature: Optional[np.ndarray] = None
+        self._previous_signature: Optional[np.ndarray] = None
+        self._primed = False
+        self.resets = 0  # Сбросы накопителя (первый кадр, смена разрешения или сцены)
+
+    @property
+    def alpha(self) -> float:
+        """Вес нового кадра: от 1 (без сглаживания) до 0.2 при полной интенсивности"""
+        return 1.0 - 0.8 * self.intensity
+
+    @property
+    def is_identity(self) -> bool:
+        return self.alpha >= 1.0
+
+    @property
+    def is_stateful(self) -> bool:
+        return True
+
+    def scaled(self, factor: float) -> Optional[BaseFilter]:
+        # Среднее по времени поточечное и линейное, поэтому перестановочно с уменьшением кадра
+        return self
+
+    def _prepare(self, shape: Tuple[int, ...], dtype: np.dtype) -> None:
+        if self._accumulator is None or self._accumulator.shape != shape:
+            self._accumulator = np.zeros(shape, dtype=np.float32)
+            self._allocate(shape)
+            self._previous_signature = None
+            self._primed = False
+
+    def _allocate(self, shape: Tuple[int, ...]) -> None:
+        """Дополнительные буферы фильтров семейства"""
+        pass
+
+    def reset(self) -> None:
+        """Сброс накопленного состояния: следующий кадр заменит накопитель"""
+        self._primed = False
+
+    def _scene_cut(self, frame: np.ndarray) -> bool:
+        """Смена сцены по средней разнице уменьшенных кадров"""
+        # Билинейная выборка читает лишь несколько тысяч пикселей; шум усредняется при сравнении
+        self._signature = cv2.resize(frame, self.SIGNATURE_SIZE, dst=self._signature, interpolation=cv2.INTER_LINEAR)
+        previous = self._previous_signature
+        if previous is None:
+            self._previous_signature = self._signature.copy()
+            return False
+        cut = float(cv2.absdiff(self._signature, previous).mean()) > self.SCENE_CUT_THRESHOLD
+        np.copyto(previous, self._signature)
+        return cut
+
+    def _update(self, frame: np.ndarray) -> None:
+        """Обновление накопителя новым кадром"""
+        cv2.accumulateWeighted(frame, self._accumulator, self.alpha)
+
+    def apply(self, frame: np.ndarray) -> np.ndarray:
+        return self.apply_into(frame, np.empty_like(frame))
+
+    def apply_into(self, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+        self.prepare(src.shape, src.dtype)
+        if dst.shape != src.shape or dst.dtype != src.dtype:
+            dst = np.empty_like(src)
+
+        if self._scene_cut(src) or not self._primed:
+            # Новая сцена не смешивается с накопленной историей
+            np.copyto(self._accumulator, src, casting="unsafe")
+            self._primed = True
+            self.resets += 1
+        else:
+            self._update(src)
+
+        return self._output(dst)
+
+    def _output(self, dst: np.ndarray) -> np.ndarray:
+        """Запись накопителя в кадр результата с округлением и насыщением"""
+        if dst.dtype == np.uint8:
+            cv2.convertScaleAbs(self._accumulator, dst=dst)
+        else:
+            np.copyto(dst, self._accumulator, casting="unsafe")
+        return dst
+
+    @property
+    def name(self) -> str:
+        return "temporal"
+
+
+FilterFactory.register(TemporalFilter)
@@ -2,24 +2,35 @@ import signal
 import sys
 import threading
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from dotenv import load_dotenv
 from loguru import logger
 
 from .config import Config
 from .camera.manager import CameraManager
+from .display.commands import CommandChannel
+from .display.sink import FrameSink, create_sinks
 from .display.window import DisplayWindow
 from .exceptions import ApplicationError, ConfigurationError
+from .processing.stage import ProcessingStage
+from .utils.metrics import MetricsServer
 
 
 class VideoApplication:
     """Класс работы с видео (захват и обработка)"""
 
-    def __init__(self):
+    def __init__(self, sinks: Optional[List[FrameSink]] = None):
         self.config: Optional[Config] = None
+        # Приёмники кадров; если не заданы, создаются по настройке OUTPUT_SINKS
+        self.sinks: Optional[List[FrameSink]] = sinks
+        # Канал команд управления (переключение фильтров, выход), общий для всех приёмников
+        self.commands = CommandChannel()
         self.camera_manager: Optional[CameraManager] = None
         self.display_window: Optional[DisplayWindow] = None
+        # Многопроцессная фильтрация между захватом и отображением (PROCESSING_WORKERS > 0)
+        self.processing: Optional[ProcessingStage] = None
+        self.metrics_server: Optional[MetricsServer] = None
         self.running = False
         self._shutdown_event = threading.Event() # Событие для завершения потоков
         # Используется для синхронизации завершения работы между потоками:
@@ -33,7 +44,11 @@ class VideoApplication:
             logger.info("Configuration loaded successfully")
 
             self.camera_manager = CameraManager(self.config)
-            self.display_window = DisplayWindow(self.config)
+            if self.sinks is None:
+                self.sinks = create_sinks(self.config, self.commands)
+            if self.config.processing_workers > 0:
+                self.processing = ProcessingStage(self.config)
+            self.display_window = DisplayWindow(self.config, self.sinks, self.commands, self.processing)
 
             # Настройка обработчиков сигналов для корректного завершения
             # Функция _signal_handler будет вызвана при получении сигналов SIGINT и SIGTERM
@@ -57,6 +72,11 @@ class VideoApplication:
             logger.info("Starting video capture application")
             self.running = True
 
+            # Эндпоинт метрик работает в своём потоке и только читает счётчики
+            if self.config.metrics_enabled:
+                self.metrics_server = MetricsServer(self.config.metrics_host, self.config.metrics_port)
+                self.metrics_server.start()
+
             # Запуск захвата с камеры в отдельном потоке
             camera_thread = threading.Thread(
                 target=self.camera_manager.start_capture,
@@ -65,11 +85,14 @@ class VideoApplication:
             )
             camera_thread.start()
 
+            # Кадры идут в отображение напрямую или через исполнителей стадии обработки
+            frame_buffer = self.camera_manager.get_frame_buffer()
+            if self.processing:
+                self.processing.start(frame_buffer, self._shutdown_event)
+                frame_buffer = self.processing
+
             # Запуск цикла отображения в главном потоке
-            self.display_window.start_display(
-                self.camera_manager.get_frame_queue(),
-                self._shutdown_event
-            )
+            self.display_window.start_display(frame_buffer, self._shutdown_event)
 
             logger.info("Application started successfully")
 
@@ -103,6 +126,13 @@ class VideoApplication:
             # Завершить отображение
             self.display_window.stop_display()
 
+        if self.processing:
+            # Разделяемая память освобождается после остановки отображения, которое читает из неё кадры
+            self.processing.stop()
+
+        if self.metrics_server:
+            self.metrics_server.stop()
+
         logger.info("Application shutdown complete")
 
     def _signal_handler(self, signum: int, frame) -> None:
@@ -0,0 +1,356 @@
+import multiprocessing
+import threading
+import time
+from collections import deque
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection, wait
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from ..camera.buffer import FrameBuffer, FrameSlot
+from ..config import Config
+from ..exceptions import CameraError, ProcessingError
+from ..filters.base import FilterFactory
+from ..utils.metrics import REGISTRY
+from .worker import ATTACH, FRAME, frame_views, worker_main
+
+ORDER_STRICT = "strict"
+ORDER_REORDER = "reorder"
+
+
+class _Worker:
+    """Процесс-исполнитель со своими каналами заданий и результатов и списком кадров в работе"""
+
+    def __init__(self, worker_id: int, process, tasks: Connection, results: Connection):
+        # Номер уникален для каждого запуска: результаты перезапущенного процесса не путаются с новыми
+        self.worker_id = worker_id
+        self.process = process
+        self.tasks = tasks
+        self.results = results
+        self.in_flight: Dict[int, int] = {}  # номер кадра -> слот
+
+
+class ProcessingStage:
+    """
+        Стадия многопроцессной фильтрации между захватом и отображением.
+        Кадр копируется из буфера захвата во входной слот разделяемой памяти, исполнитель пишет результат
+        в выходной слот того же индекса, и отображение читает его прямо из разделяемой памяти.
+        Через очереди передаются только индексы слотов и номера кадров, массивы не сериализуются.
+        Число слотов ограничивает количество кадров в работе; пока свободных слотов нет,
+        стадия не забирает кадры из буфера захвата, и переполнение обрабатывает его политика.
+        В режиме strict кадры выдаются в порядке захвата (буфер переупорядочивания),
+        в режиме reorder - по мере готовности. Упавший исполнитель перезапускается,
+        а его кадры один раз отправляются повторно.
+        Для отображения стадия выглядит как буфер кадров: acquire_read() и release()
+    """
+
+    def __init__(self, config: Config):
+        if config.processing_workers <= 0:
+            raise ProcessingError("Processing stage requires at least one worker")
+
+        self.worker_count = config.processing_workers
+        self.depth = config.processing_depth
+        self.order = config.processing_order
+        self.intensity = config.filter_intensity
+        self.fuse = config.filter_fusion
+        self.filter_names: Tuple[str, ...] = tuple(config.filter_chain)
+        # Модули зарегистрированных фильтров: исполнители импортируют их, чтобы получить тот же набор фильтров
+        self._filter_modules = sorted({
+            filter_class.__module__ for filter_class in FilterFactory._filters.values()
+        })
+
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: List[_Worker] = []
+        self._workers_by_id: Dict[int, _Worker] = {}
+        self._spawned = 0
+        self._block: Optional[shared_memory.SharedMemory] = None
+        self._geometry: Optional[Tuple[Tuple[int, ...], np.dtype]] = None
+        self._inputs: Optional[np.ndarray] = None
+        self._outputs: Optional[np.ndarray] = None
+        self._slots: List[FrameSlot] = []
+
+        self._condition = threading.Condition()
+        self._free: Deque[int] = deque()
+        self._ready: Deque[int] = deque()
+        self._pending: Dict[int, Optional[int]] = {}  # буфер переупорядочивания: номер кадра -> слот
+        self._retried: set = set()
+        self._next_sequence = 0   # номер следующего кадра на отправку
+        self._next_output = 0     # номер следующего кадра на выдачу (strict)
+        self._closed = False
+        self._threads: List[threading.Thread] = []
+
+        self.processed = 0
+        self.failed = 0
+        self.restarts = 0
+        self.frames_metric = REGISTRY.counter(
+            "video_processing_frames_total", "Frames processed by worker processes"
+        ).labels()
+        self.restarts_metric = REGISTRY.counter(
+            "video_processing_worker_restarts_total", "Worker processes restarted after a crash"
+        ).labels()
+
+    @property
+    def capacity(self) -> int:
+        return self.depth
+
+    @property
+    def occupancy(self) -> int:
+        return len(self._ready)
+
+    def set_filters(self, filter_names: Sequence[str]) -> None:
+        """
+            Смена цепочки фильтров; применяется к кадрам, отправленным после вызова.
+            Фильтры с состоянием допустимы только с одним исполнителем: кадры распределяются между
+            исполнителями, и каждый копил бы своё состояние по части кадров
+        """
+        for filter_name in filter_names:
+            if filter_name not in FilterFactory.get_available_filters():
+                raise ProcessingError(f"Unknown filter: {filter_name}")
+            if self.worker_count > 1 and FilterFactory.is_stateful(filter_name):
+                raise ProcessingError(f"Stateful filter {filter_name} requires a single processing worker")
+        self.filter_names = tuple(filter_names)
+
+    def start(self, source: FrameBuffer, shutdown_event: threading.Event) -> None:
+        """Запуск исполнителей и потоков отправки и сбора результатов"""
+        for _ in range(self.worker_count):
+            self._workers.append(self._spawn_worker())
+
+        self._threads = [
+            threading.Thread(target=self._dispatch_loop, args=(source, shutdown_event), daemon=True),
+            threading.Thread(target=self._collect_loop, args=(shutdown_event,), daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Processing stage started: {self.worker_count} workers, depth {self.depth}, order {self.order}")
+
+    def _spawn_worker(self) -> _Worker:
+        worker_id = self._spawned
+        self._spawned += 1
+        task_reader, task_writer = self._context.Pipe(duplex=False)
+        result_reader, result_writer = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=worker_main,
+            args=(worker_id, task_reader, result_writer, self.intensity, self.fuse, self._filter_modules),
+            name=f"filter-worker-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        # Концы каналов исполнителя закрываются в родителе, чтобы его завершение было видно как EOF
+        task_reader.close()
+        result_writer.close()
+        worker = _Worker(worker_id, process, task_writer, result_reader)
+        with self._condition:
+            self._workers_by_id[worker_id] = worker
+        return worker
+
+    def _send_attach(self, worker: _Worker) -> None:
+        """Подключение исполнителя к слотам (под self._condition)"""
+        shape, dtype = self._geometry
+        self._send(worker, (ATTACH, self._block.name, self.depth, shape, dtype.str))
+
+    @staticmethod
+    def _send(worker: _Worker, message) -> None:
+        try:
+            worker.tasks.send(message)
+        except (BrokenPipeError, OSError):
+            # Исполнитель упал: кадры в работе будут отправлены повторно после перезапуска
+            pass
+
+    def _allocate(self, frame: np.ndarray) -> None:
+        """Выделение слотов в разделяемой памяти под геометрию первого кадра"""
+        block = shared_memory.SharedMemory(create=True, size=2 * self.depth * frame.nbytes)
+        self._inputs, self._outputs = frame_views(block, self.depth, frame.shape, frame.dtype.str)
+        self._slots = [FrameSlot(index, self._outputs[index]) for index in range(self.depth)]
+        with self._condition:
+            self._geometry = (frame.shape, frame.dtype)
+            self._block = block
+            self._free.extend(range(self.depth))
+            for worker in self._workers:
+                self._send_attach(worker)
+
+    def _dispatch_loop(self, source: FrameBuffer, shutdown_event: threading.Event) -> None:
+        """Перенос кадров из буфера захвата во входные слоты и отправка заданий исполнителям"""
+        try:
+            while not shutdown_event.is_set() and not self._closed:
+                # Кадр забирается из буфера захвата только при наличии свободного слота
+                with self._condition:
+                    if self._block is not None and not self._condition.wait_for(
+                        lambda: self._free or self._closed, timeout=0.1
+                    ):
+                        continue
+                    if self._closed:
+                        break
+
+                source_slot = source.acquire_read(timeout=0.1)
+                if source_slot is None:
+                    continue
+                try:
+                    if self._block is None:
+                        self._allocate(source_slot.frame)
+                    if source_slot.frame.shape != self._geometry[0] or source_slot.frame.dtype != self._geometry[1]:
+                        logger.error(f"Frame geometry changed to {source_slot.frame.shape}, frame skipped")
+                        continue
+                    with self._condition:
+                        index = self._free.popleft()
+                    np.copyto(self._inputs[index], source_slot.frame)
+                    self._slots[index].record.copy_from(source_slot.record)
+                finally:
+                    source.release(source_slot)
+
+                with self._condition:
+                    sequence = self._next_sequence
+                    self._next_sequence += 1
+                    self._submit(index, sequence)
+        except Exception as e:
+            logger.error(f"Processing dispatch error: {e}")
+        finally:
+            self.close()
+
+    def _submit(self, index: int, sequence: int) -> None:
+        """Отправка кадра наименее загруженному исполнителю (под self._condition)"""
+        worker = min(self._workers, key=lambda candidate: len(candidate.in_flight))
+        worker.in_flight[sequence] = index
+        self._send(worker, (FRAME, index, sequence, self.filter_names))
+
+    def _collect_loop(self, shutdown_event: threading.Event) -> None:
+        """Приём результатов, контроль исполнителей и выдача кадров по порядку"""
+        last_check = time.monotonic()
+        while not shutdown_event.is_set() and not self._closed:
+            if time.monotonic() - last_check >= 0.1:
+                self._check_workers()
+                last_check = time.monotonic()
+
+            with self._condition:
+                workers = {worker.results: worker for worker in self._workers}
+            for reader in wait(list(workers), timeout=0.1):
+                try:
+                    message = reader.recv()
+                except (EOFError, OSError):
+                    # Канал закрыт - исполнитель завершается; после его выхода он будет перезапущен
+                    workers[reader].process.join(timeout=1.0)
+                    self._check_workers()
+                    last_check = time.monotonic()
+                    continue
+                self._handle_result(*message)
+
+    def _handle_result(self, worker_id: int, index: int, sequence: int, error: Optional[str]) -> None:
+        """Учёт результата исполнителя"""
+        with self._condition:
+            worker = self._workers_by_id.get(worker_id)
+            if worker is None or worker.in_flight.pop(sequence, None) is None:
+                # Результат от исполнителя, который уже перезапущен
+                return
+            self._retried.discard(sequence)
+            if error is not None:
+                logger.warning(f"Worker {worker_id} failed on frame {sequence}: {error}")
+                self._complete(sequence, None)
+                self._free.append(index)
+            else:
+                self.processed += 1
+                self.frames_metric.inc()
+                self._complete(sequence, index)
+            self._condition.notify_all()
+
+    def _complete(self, sequence: int, index: Optional[int]) -> None:
+        """Выдача готового кадра; index None - кадр потерян (под self._condition)"""
+        if index is None:
+            self.failed += 1
+        if self.order == ORDER_REORDER:
+            if index is not None:
+                self._ready.append(index)
+            return
+
+        self._pending[sequence] = index
+        while self._next_output in self._pending:
+            ready_index = self._pending.pop(self._next_output)
+            if ready_index is not None:
+                self._ready.append(ready_index)
+            self._next_output += 1
+
+    def _check_workers(self) -> None:
+        """Перезапуск упавших исполнителей; их кадры отправляются повторно один раз"""
+        for position, worker in enumerate(self._workers):
+            if worker.process.is_alive() or self._closed:
+                continue
+
+            logger.error(f"Worker {worker.worker_id} exited with code {worker.process.exitcode}, restarting")
+            self.restarts += 1
+            self.restarts_metric.inc()
+            worker.tasks.close()
+            worker.results.close()
+            replacement = self._spawn_worker()
+            with self._condition:
+                self._workers[position] = replacement
+                del self._workers_by_id[worker.worker_id]
+                if self._block is not None:
+                    self._send_attach(replacement)
+                for sequence, index in sorted(worker.in_flight.items()):
+                    if sequence in self._retried:
+                        # Кадр уже ронял исполнитель - он пропускается, чтобы не зациклиться
+                        self._retried.discard(sequence)
+                        self._complete(sequence, None)
+                        self._free.append(index)
+                    else:
+                        self._retried.add(sequence)
+                        replacement.in_flight[sequence] = index
+                        self._send(replacement, (FRAME, index, sequence, self.filter_names))
+                self._condition.notify_all()
+
+    def acquire_read(self, timeout: Optional[float] = None) -> Optional[FrameSlot]:
+        """Ожидает следующий обработанный кадр. Возвращает None по таймауту или после close()"""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._ready or self._closed, timeout):
+                return None
+            if not self._ready:
+                return None
+            slot = self._slots[self._ready.popleft()]
+            slot.state = FrameSlot.READING
+            return slot
+
+    def release(self, slot: FrameSlot) -> None:
+        """Возвращает слот для следующего кадра"""
+        with self._condition:
+            if slot.state != FrameSlot.READING:
+                raise CameraError(f"Slot {slot.index} is not held by a consumer")
+            slot.state = FrameSlot.FREE
+            self._free.append(slot.index)
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """Будит ожидающих потребителей"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def stop(self) -> None:
+        """Остановка исполнителей и освобождение разделяемой памяти"""
+        self.close()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+
+        for worker in self._workers:
+            self._send(worker, None)
+        for worker in self._workers:
+            worker.process.join(timeout=2.0)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join(timeout=1.0)
+            worker.tasks.close()
+            worker.results.close()
+        self._workers = []
+
+        # Представления numpy должны быть освобождены до закрытия блока
+        self._slots = []
+        self._inputs = self._outputs = None
+        if self._block is not None:
+            try:
+                self._block.close()
+            except BufferError:
+                logger.warning("Shared frame memory is still referenced, unlinking anyway")
+            self._block.unlink()
+            self._block = None
+        logger.info(
+            f"Processing stage stopped: {self.processed} frames, {self.failed} failed, {self.restarts} restarts"
+        )
@@ -0,0 +1,95 @@
+import importlib
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Сообщения канала заданий исполнителя:
+#   ("attach", имя блока, число слотов, форма кадра, тип) - подключение к разделяемой памяти
+#   ("frame", слот, номер кадра, имена фильтров)          - обработка кадра из слота
+#   None                                                   - завершение
+# Ответ в свой канал результатов: (номер исполнителя, слот, номер кадра, ошибка или None).
+# У каждого исполнителя свои каналы: упавший процесс не может оставить захваченной общую блокировку очереди
+ATTACH = "attach"
+FRAME = "frame"
+
+
+def attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """
+        Подключение к блоку, созданному родительским процессом.
+        Блок удаляет только владелец, поэтому исполнитель по возможности не регистрирует его в resource_tracker
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # До Python 3.13 параметра track нет; процессы spawn используют resource_tracker родителя,
+        # и повторная регистрация того же блока ни на что не влияет
+        return shared_memory.SharedMemory(name=name)
+
+
+def frame_views(
+    block: shared_memory.SharedMemory,
+    slots: int,
+    shape: Tuple[int, ...],
+    dtype: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Входные и выходные кадры слотов поверх одного блока разделяемой памяти"""
+    inputs = np.ndarray((slots,) + tuple(shape), dtype=dtype, buffer=block.buf)
+    outputs = np.ndarray((slots,) + tuple(shape), dtype=dtype, buffer=block.buf, offset=inputs.nbytes)
+    return inputs, outputs
+
+
+def worker_main(
+    worker_id: int,
+    tasks: Connection,
+    results: Connection,
+    intensity: float,
+    fuse: bool,
+    filter_modules: Sequence[str]
+) -> None:
+    """Цикл процесса-исполнителя: кадры читаются из входного слота и пишутся в выходной без сериализации"""
+    # Регистрация фильтров в новом процессе (в родительском они зарегистрированы при загрузке Config)
+    for module_name in filter_modules:
+        importlib.import_module(module_name)
+    from ..filters.pipeline import FilterPipeline
+
+    block: Optional[shared_memory.SharedMemory] = None
+    inputs = outputs = None
+    pipelines: Dict[Tuple[str, ...], FilterPipeline] = {}
+
+    try:
+        while True:
+            try:
+                message = tasks.recv()
+            except EOFError:
+                break
+            if message is None:
+                break
+
+            if message[0] == ATTACH:
+                _, name, slots, shape, dtype = message
+                if block is not None:
+                    inputs = outputs = None
+                    block.close()
+                block = attach_shared_memory(name)
+                inputs, outputs = frame_views(block, slots, shape, dtype)
+                continue
+
+            _, index, sequence, filter_names = message
+            try:
+                pipeline = pipelines.get(filter_names)
+                if pipeline is None:
+                    pipeline = FilterPipeline.from_names(filter_names, intensity, fuse)
+                    pipelines[filter_names] = pipeline
+                pipeline.apply_into(inputs[index], outputs[index])
+                results.send((worker_id, index, sequence, None))
+            except Exception as e:
+                results.send((worker_id, index, sequence, str(e)))
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        # Представления numpy удерживают буфер блока и должны быть освобождены до close()
+        inputs = outputs = None
+        if block is not None:
+            block.close()
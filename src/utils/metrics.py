@@ -0,0 +1,296 @@
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape_label_value(value: str) -> str:
+    """Экранирование значения метки для формата Prometheus: обратная косая черта, кавычка, перевод строки"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (f'{name}="{_escape_label_value(value)}"' for name, value in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+class _Metric:
+    """Базовый класс метрики с набором дочерних серий по меткам"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._children: Dict[LabelKey, object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels: str):
+        """Серия метрики с заданными метками; результат стоит сохранить, чтобы не искать его на каждом кадре"""
+        key = _label_key(labels)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._new_child()
+                self._children[key] = child
+            return child
+
+    def remove(self, **labels: str) -> None:
+        """Удаление серии с заданными метками (например, ушедшего подписчика)"""
+        with self._lock:
+            self._children.pop(_label_key(labels), None)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            children = list(self._children.items())
+        for key, child in children:
+            lines.extend(child.render(self.name, key))
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("_value", "_lock", "_callback")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+        self._callback: Optional[Callable[[], float]] = None
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def set_function(self, callback: Callable[[], float]) -> None:
+        """Значение берётся из уже существующего монотонного счётчика (например, FlowStats) при чтении"""
+        self._callback = callback
+
+    @property
+    def value(self) -> float:
+        if self._callback is not None:
+            try:
+                return float(self._callback())
+            except Exception:
+                return float("nan")
+        return self._value
+
+    def render(self, name: str, key: LabelKey) -> List[str]:
+        return [f"{name}{_format_labels(key)} {self.value}"]
+
+
+class Counter(_Metric):
+    """Монотонно растущий счётчик"""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+
+class _GaugeChild:
+    __slots__ = ("_value", "_callback")
+
+    def __init__(self):
+        self._value = 0.0
+        self._callback: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def set_function(self, callback: Callable[[], float]) -> None:
+        """Значение вычисляется только при чтении метрик, без затрат в цикле обработки"""
+        self._callback = callback
+
+    @property
+    def value(self) -> float:
+        if self._callback is not None:
+            try:
+                return float(self._callback())
+            except Exception:
+                return float("nan")
+        return self._value
+
+    def render(self, name: str, key: LabelKey) -> List[str]:
+        return [f"{name}{_format_labels(key)} {self.value}"]
+
+
+class Gauge(_Metric):
+    """Текущее значение (глубина очереди, FPS)"""
+
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_counts", "_sum", "_count", "_lock")
+
+    def __init__(self, bounds: Sequence[float]):
+        self._bounds = list(bounds)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def render(self, name: str, key: LabelKey) -> List[str]:
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self._bounds, counts):
+            cumulative += bucket_count
+            lines.append(f"{name}_bucket{_format_labels(key, ('le', repr(bound)))} {cumulative}")
+        lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {count}")
+        lines.append(f"{name}_sum{_format_labels(key)} {total}")
+        lines.append(f"{name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Гистограмма с фиксированными границами корзин"""
+
+    type_name = "histogram"
+
+    # Границы по умолчанию (секунды): от 0.5 мс до 1 с
+    DEFAULT_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.033, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+
+class FrameRateGauge:
+    """FPS по приросту счётчика между двумя чтениями метрик"""
+
+    def __init__(self, counter: _CounterChild):
+        self.counter = counter
+        self._last_value = counter.value
+        self._last_time = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def __call__(self) -> float:
+        with self._lock:
+            now = time.perf_counter()
+            value = self.counter.value
+            elapsed = now - self._last_time
+            rate = (value - self._last_value) / elapsed if elapsed > 0 else 0.0
+            self._last_value, self._last_time = value, now
+            return rate
+
+
+class MetricsRegistry:
+    """Набор метрик процесса. Метрики создаются один раз и переиспользуются по имени"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric_class, name: str, documentation: str, **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = metric_class(name, documentation, **kwargs)
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        return self._get_or_create(Counter, name, documentation)
+
+    def gauge(self, name: str, documentation: str) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float] = Histogram.DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, buckets=buckets)
+
+    def render(self) -> str:
+        """Метрики в текстовом формате Prometheus"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Реестр процесса: метрики обновляются в потоках захвата и отображения, а читаются HTTP-сервером
+REGISTRY = MetricsRegistry()
+
+
+class MetricsServer:
+    """HTTP-сервер метрик в отдельном потоке, по умолчанию доступен только с localhost"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9100, registry: MetricsRegistry = REGISTRY):
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Запросы мониторинга не засоряют лог приложения
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Metrics endpoint: http://{self.host}:{self.port}/metrics")
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            logger.info("Metrics endpoint stopped")
@@ -0,0 +1,336 @@
+import os
+import time
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from ..exceptions import ExportError
+from .metrics import REGISTRY
+
+MAGIC = b"VCSHMRG1"
+VERSION = 1
+MAX_DIMS = 4
+# Заголовок кольца и заголовки слотов занимают по 64 байта, данные слотов выровнены на 64 байта
+ALIGNMENT = 64
+
+RING_HEADER = np.dtype({
+    "names": ["magic", "version", "slots", "capacity", "stride", "head", "writer_pid"],
+    "formats": ["S8", "<u4", "<u4", "<u8", "<u8", "<u8", "<u4"],
+    "offsets": [0, 8, 12, 16, 24, 32, 40],
+    "itemsize": ALIGNMENT,
+})
+
+# generation - счётчик seqlock: нечётный, пока производитель пишет слот, и увеличивается на 2 за запись
+SLOT_HEADER = np.dtype({
+    "names": ["generation", "index", "sequence", "timestamp", "nbytes", "ndim", "shape", "dtype"],
+    "formats": ["<u8", "<u8", "<u8", "<f8", "<u8", "<u4", ("<u4", (MAX_DIMS,)), "S4"],
+    "offsets": [0, 8, 16, 24, 32, 40, 44, 60],
+    "itemsize": ALIGNMENT,
+})
+
+
+def _aligned(size: int) -> int:
+    return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _attach(name: str) -> Tuple[shared_memory.SharedMemory, bool]:
+    """Подключение к существующему блоку; второе значение - блок зарегистрирован в resource_tracker процесса"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False), False
+    except TypeError:
+        # До Python 3.13 параметра track нет
+        return shared_memory.SharedMemory(name=name), True
+
+
+def _untrack(block: shared_memory.SharedMemory, writer_pid: int) -> None:
+    """Иначе resource_tracker процесса, подключившегося к чужому блоку, удалит его при выходе"""
+    if writer_pid != os.getpid():
+        resource_tracker.unregister(block._name, "shared_memory")
+
+
+def _process_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Процесс существует, но принадлежит другому пользователю
+        return True
+    return True
+
+
+@dataclass(frozen=True)
+class SharedFrame:
+    """Кадр кольца: представление данных слота без копирования и его заголовок"""
+
+    frame: np.ndarray   # Только для чтения; действителен, пока слот не перезаписан (SharedFrameReader.is_valid)
+    index: int          # Номер публикации в кольце (без пропусков)
+    sequence: int       # Номер кадра у производителя (например, номер захвата)
+    timestamp: float    # time.perf_counter() производителя (монотонные часы, на Linux общие для процессов)
+    slot: int
+    generation: int
+
+
+class _RingLayout:
+    """Представления заголовков и данных поверх блока разделяемой памяти"""
+
+    def __init__(self, block: shared_memory.SharedMemory, slots: int, stride: int):
+        self.block = block
+        self.header = np.ndarray((), RING_HEADER, buffer=block.buf)
+        self.slot_headers = np.ndarray((slots,), SLOT_HEADER, buffer=block.buf, offset=ALIGNMENT)
+        data_offset = ALIGNMENT + _aligned(slots * ALIGNMENT)
+        self.data = np.ndarray((slots, stride), np.uint8, buffer=block.buf, offset=data_offset)
+
+    @staticmethod
+    def size(slots: int, stride: int) -> int:
+        return ALIGNMENT + _aligned(slots * ALIGNMENT) + slots * stride
+
+    def release(self) -> None:
+        """Закрытие блока; представления удаляются заранее, иначе mmap нельзя закрыть"""
+        self.header = self.slot_headers = self.data = None
+        try:
+            self.block.close()
+        except BufferError:
+            # Вызывающий код ещё держит кадры кольца: блок закроется, когда их удалит сборщик мусора
+            logger.warning(f"Shared memory ring {self.block.name} closed while frames are still referenced")
+
+
+class SharedFrameRing:
+    """
+        Кольцо кадров в именованной разделяемой памяти для потребителей в других процессах.
+        Каждый слот - заголовок (номер публикации и кадра, время, форма, тип, счётчик generation) и данные кадра
+        вместимостью capacity байт. Запись - seqlock: generation становится нечётным, копируются данные
+        и заголовок, затем generation снова чётный. Производитель никогда не ждёт читателей: медленный читатель
+        обнаруживает пропуски по номеру публикации, а прочитанный во время записи слот - по generation.
+        Блок создаётся владельцем и удаляется при close(); оставшийся от упавшего процесса блок
+        с тем же именем пересоздаётся, а кольцо работающего процесса не трогается (ExportError)
+    """
+
+    def __init__(self, name: str, slots: int, capacity: int):
+        if slots < 2:
+            raise ExportError("Shared memory ring needs at least 2 slots")
+        if capacity <= 0:
+            raise ExportError("Shared memory ring capacity must be positive")
+
+        self.name = name
+        self.slots = slots
+        self.capacity = capacity
+        stride = _aligned(capacity)
+        size = _RingLayout.size(slots, stride)
+        try:
+            block = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            self._remove_stale(name)
+            block = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        self._layout = _RingLayout(block, slots, stride)
+        self._layout.slot_headers[:] = np.zeros((), SLOT_HEADER)
+        header = self._layout.header
+        header["version"] = VERSION
+        header["slots"] = slots
+        header["capacity"] = capacity
+        header["stride"] = stride
+        header["head"] = 0
+        header["writer_pid"] = os.getpid()
+        # Сигнатура записывается последней: читатель не подключится к недописанному заголовку
+        header["magic"] = MAGIC
+        self.published = 0
+        self.oversized = 0  # Кадры больше вместимости слота, которые не были опубликованы
+
+        self._published_metric = REGISTRY.counter(
+            "video_shm_frames_total", "Frames published to a shared memory ring"
+        ).labels(ring=name)
+        logger.info(f"Shared memory ring {name}: {slots} slots x {capacity} bytes")
+
+    @staticmethod
+    def _remove_stale(name: str) -> None:
+        """Удаление блока с тем же именем, если это не кольцо или его владелец завершился"""
+        try:
+            block, tracked = _attach(name)
+        except FileNotFoundError:
+            return
+        writer_pid = 0
+        if block.size >= ALIGNMENT:
+            header = np.ndarray((), RING_HEADER, buffer=block.buf)
+            if bytes(header["magic"]) == MAGIC:
+                writer_pid = int(header["writer_pid"])
+            del header
+
+        if _process_alive(writer_pid):
+            if tracked:
+                _untrack(block, writer_pid)
+            block.close()
+            raise ExportError(f"Shared memory ring {name} is in use by process {writer_pid}")
+
+        logger.warning(f"Removing stale shared memory ring {name}")
+        block.close()
+        block.unlink()
+
+    def publish(self, frame: np.ndarray, sequence: int, timestamp: Optional[float] = None) -> bool:
+        """Публикация кадра в следующий слот; False, если кадр не помещается в слот"""
+        if frame.nbytes > self.capacity or frame.ndim > MAX_DIMS:
+            if self.oversized == 0:
+                logger.warning(f"Frame {frame.shape} does not fit shared memory ring {self.name}, skipping")
+            self.oversized += 1
+            return False
+        layout = self._layout
+        if layout is None:
+            return False
+
+        index = self.published
+        slot = index % self.slots
+        header = layout.slot_headers[slot]
+        generation = int(header["generation"])
+        header["generation"] = generation + 1
+        target = layout.data[slot, :frame.nbytes].view(frame.dtype).reshape(frame.shape)
+        np.copyto(target, frame)
+        header["index"] = index
+        header["sequence"] = sequence
+        header["timestamp"] = time.perf_counter() if timestamp is None else timestamp
+        header["nbytes"] = frame.nbytes
+        header["ndim"] = frame.ndim
+        header["dtype"] = frame.dtype.str.encode()
+        header["shape"] = tuple(frame.shape) + (0,) * (MAX_DIMS - frame.ndim)
+        header["generation"] = generation + 2
+        self.published = index + 1
+        layout.header["head"] = self.published
+        self._published_metric.inc()
+        return True
+
+    def close(self) -> None:
+        """Удаление кольца; подключённые читатели сохраняют доступ к блоку до своего close()"""
+        if self._layout is None:
+            return
+        block = self._layout.block
+        self._layout.release()
+        self._layout = None
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedFrameReader:
+    """
+        Читатель кольца SharedFrameRing из другого процесса. Кадры выдаются как представления данных слота
+        без копирования; после работы с кадром is_valid() проверяет, что производитель не перезаписал слот.
+        read_next() выдаёт кадры по порядку публикации и перескакивает к самому старому доступному кадру,
+        если читатель отстал больше чем на кольцо (счётчик dropped); кадры, перезаписанные во время чтения
+        заголовка, учитываются в torn. Читатель ничего не пишет в блок и никогда не задерживает производителя
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        try:
+            block, tracked = _attach(name)
+        except FileNotFoundError:
+            raise ExportError(f"Shared memory ring not found: {name}")
+
+        header = np.ndarray((), RING_HEADER, buffer=block.buf)
+        if bytes(header["magic"]) != MAGIC or int(header["version"]) != VERSION:
+            del header
+            block.close()
+            raise ExportError(f"Not a frame ring or unsupported version: {name}")
+        slots, stride, writer_pid = int(header["slots"]), int(header["stride"]), int(header["writer_pid"])
+        del header
+        if tracked:
+            _untrack(block, writer_pid)
+
+        self._layout = _RingLayout(block, slots, stride)
+        self.slots = slots
+        self.capacity = int(self._layout.header["capacity"])
+        self.next_index = self.head  # Читаются только кадры, опубликованные после подключения
+        self.consumed = 0
+        self.dropped = 0  # Кадры, перезаписанные до того, как читатель до них дошёл
+        self.torn = 0     # Кадры, перезаписанные во время чтения
+
+    @property
+    def head(self) -> int:
+        """Число опубликованных кадров"""
+        return int(self._layout.header["head"])
+
+    @property
+    def lag(self) -> int:
+        """Сколько опубликованных кадров читатель ещё не прочитал"""
+        return max(0, self.head - self.next_index)
+
+    def read(self, index: int) -> Optional[SharedFrame]:
+        """Кадр с номером публикации index; None, если слот пишется или уже содержит другой кадр"""
+        slot = index % self.slots
+        header = self._layout.slot_headers[slot]
+        generation = int(header["generation"])
+        if generation % 2 or int(header["index"]) != index:
+            return None
+        ndim = int(header["ndim"])
+        shape = tuple(int(size) for size in header["shape"][:ndim])
+        dtype = np.dtype(bytes(header["dtype"]).decode())
+        sequence, timestamp = int(header["sequence"]), float(header["timestamp"])
+        nbytes = int(header["nbytes"])
+        if nbytes > self.capacity or int(np.prod(shape)) * dtype.itemsize != nbytes:
+            return None
+        frame = self._layout.data[slot, :nbytes].view(dtype).reshape(shape)
+        frame.flags.writeable = False
+        if int(header["generation"]) != generation:
+            return None
+        return SharedFrame(frame, index, sequence, timestamp, slot, generation)
+
+    def is_valid(self, frame: SharedFrame) -> bool:
+        """True, если слот кадра не перезаписывался с момента чтения (данные кадра не разорваны)"""
+        return int(self._layout.slot_headers[frame.slot]["generation"]) == frame.generation
+
+    def read_next(self) -> Optional[SharedFrame]:
+        """Следующий непрочитанный кадр без ожидания; None, если новых кадров нет"""
+        while True:
+            head = self.head
+            if self.next_index >= head:
+                return None
+            # Слот самого старого кадра кольца производитель перезапишет следующим
+            oldest = max(0, head - self.slots + 1)
+            if self.next_index < oldest:
+                self.dropped += oldest - self.next_index
+                self.next_index = oldest
+            frame = self.read(self.next_index)
+            self.next_index += 1
+            if frame is not None:
+                self.consumed += 1
+                return frame
+            self.torn += 1
+
+    def wait_next(self, timeout: Optional[float] = None, poll_interval: float = 0.001) -> Optional[SharedFrame]:
+        """Ожидание следующего кадра опросом заголовка (межпроцессной блокировки у кольца нет)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            frame = self.read_next()
+            if frame is not None:
+                return frame
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(poll_interval)
+
+    def latest(self) -> Optional[SharedFrame]:
+        """Самый новый кадр (возможно, уже прочитанный); непрочитанные кадры до него учитываются в dropped"""
+        head = self.head
+        if head == 0:
+            return None
+        if self.next_index < head - 1:
+            self.dropped += head - 1 - self.next_index
+            self.next_index = head - 1
+        if self.next_index == head - 1:
+            return self.read_next()
+        return self.read(head - 1)
+
+    def close(self) -> None:
+        if self._layout is not None:
+            self._layout.release()
+            self._layout = None
+
+    def __enter__(self) -> "SharedFrameReader":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
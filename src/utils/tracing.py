@@ -0,0 +1,129 @@
+import bisect
+import time
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+
+class FrameRecord:
+    """
+        Метаданные кадра: порядковый номер и отметки времени этапов (time.perf_counter).
+        Запись принадлежит слоту буфера и переиспользуется, поэтому на кадр ничего не выделяется
+    """
+
+    __slots__ = ("sequence", "capture_ts", "dequeue_ts", "filter_ts", "present_ts")
+
+    def __init__(self):
+        self.begin(0, 0.0)
+
+    def begin(self, sequence: int, capture_ts: float) -> None:
+        """Начало пути кадра: захват"""
+        self.sequence = sequence
+        self.capture_ts = capture_ts
+        self.dequeue_ts = 0.0
+        self.filter_ts = 0.0
+        self.present_ts = 0.0
+
+    def copy_from(self, other: "FrameRecord") -> None:
+        """Копирование отметок из другой записи (при передаче кадра между буферами)"""
+        self.sequence = other.sequence
+        self.capture_ts = other.capture_ts
+        self.dequeue_ts = other.dequeue_ts
+        self.filter_ts = other.filter_ts
+        self.present_ts = other.present_ts
+
+
+class LatencyHistogram:
+    """Гистограмма задержек с логарифмическими корзинами от 10 мкс до ~10 с"""
+
+    # Границы корзин в секундах: 10 мкс * 1.25^k
+    BOUNDS: List[float] = [1e-5 * 1.25 ** k for k in range(63)]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.BOUNDS, value)] += 1
+        self.total += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        """Оценка перцентиля (верхняя граница корзины), q от 0 до 100"""
+        if self.total == 0:
+            return 0.0
+        rank = q / 100.0 * self.total
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank and count:
+                return self.BOUNDS[index] if index < len(self.BOUNDS) else self.max
+        return self.max
+
+    def reset(self) -> None:
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+
+class LatencyTracer:
+    """
+        Агрегирует отметки FrameRecord в гистограммы по этапам и периодически пишет сводку в лог.
+        Гистограммы скользящие: после каждого отчёта начинается новое окно
+    """
+
+    # Этап -> (начальная отметка, конечная отметка).
+    # Масштабирование до DISPLAY_SCALE выполняет цепочка фильтров, поэтому оно входит в этап filter
+    STAGES = {
+        "queue": ("capture_ts", "dequeue_ts"),
+        "filter": ("dequeue_ts", "filter_ts"),
+        "present": ("filter_ts", "present_ts"),
+        "total": ("capture_ts", "present_ts"),
+    }
+
+    def __init__(self, report_interval: float = 5.0):
+        self.report_interval = report_interval
+        self.histograms: Dict[str, LatencyHistogram] = {stage: LatencyHistogram() for stage in self.STAGES}
+        self._last_report = time.perf_counter()
+        self.last_summary: Optional[Dict[str, Dict[str, float]]] = None
+
+    def observe(self, record: FrameRecord) -> None:
+        """Учёт кадра, прошедшего все этапы"""
+        for stage, (start, end) in self.STAGES.items():
+            self.histograms[stage].observe(max(0.0, getattr(record, end) - getattr(record, start)))
+
+        now = record.present_ts
+        if now - self._last_report >= self.report_interval:
+            self.report(now)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Сводка по этапам в миллисекундах"""
+        result = {}
+        for stage, histogram in self.histograms.items():
+            result[stage] = {
+                "count": histogram.total,
+                "mean": histogram.sum / histogram.total * 1000.0 if histogram.total else 0.0,
+                "p50": histogram.percentile(50) * 1000.0,
+                "p99": histogram.percentile(99) * 1000.0,
+                "max": histogram.max * 1000.0,
+            }
+        return result
+
+    def report(self, now: Optional[float] = None) -> None:
+        """Запись сводки в лог и начало нового окна"""
+        if self.histograms["total"].total:
+            self.last_summary = self.summary()
+            line = ", ".join(
+                f"{stage} p50={stats['p50']:.2f} p99={stats['p99']:.2f} max={stats['max']:.2f}"
+                for stage, stats in self.last_summary.items()
+            )
+            logger.info(f"Frame latency (ms) over {self.histograms['total'].total} frames: {line}")
+
+        for histogram in self.histograms.values():
+            histogram.reset()
+        self._last_report = now if now is not None else time.perf_counter()
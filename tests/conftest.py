@@ -2,7 +2,6 @@ import os
 import sys
 from pathlib import Path
 import threading
-from queue import Queue
 from unittest.mock import Mock, patch
 import numpy as np
 import pytest
@@ -10,6 +9,7 @@ import pytest
 sys.path.insert(0, os.path.abspath(Path(__file__).resolve().parents[1]))
 sys.path.insert(0, os.path.abspath(Path(__file__).resolve().parents[0]))
 from src.config import Config
+from src.camera.buffer import FrameRingBuffer
 
 
 @pytest.fixture
@@ -46,10 +46,9 @@ def test_frame():
 
 
 @pytest.fixture
-def frame_queue():
-    """Создает тестовую очередь кадров"""
-    queue = Queue(maxsize=10)
-    return queue
+def frame_buffer():
+    """Создает тестовый кольцевой буфер кадров"""
+    return FrameRingBuffer(3, (480, 640, 3))
 
 
 @pytest.fixture
@@ -65,6 +64,8 @@ def mock_camera():
         mock_instance = Mock()
         mock_instance.isOpened.return_value = True
         mock_instance.read.return_value = (True, np.zeros((480, 640, 3), dtype=np.uint8))
+        mock_instance.grab.return_value = True
+        mock_instance.retrieve.return_value = (True, np.zeros((480, 640, 3), dtype=np.uint8))
         mock_instance.set.return_value = True
         mock_instance.release.return_value = None
         MockVideoCapture.return_value = mock_instance
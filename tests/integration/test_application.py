@@ -9,7 +9,7 @@ from src.exceptions import ConfigurationError
 class TestVideoApplication:
     def test_initialize_success(self, mock_env):
         """Тест успешной инициализации всего приложения"""
-        with patch('src.camera.capture.cv2.VideoCapture'), \
+        with patch('src.camera.source.cv2.VideoCapture'), \
                 patch('src.display.window.cv2.namedWindow'):
             app = VideoApplication()
             app.initialize()
@@ -29,7 +29,7 @@ class TestVideoApplication:
         app = VideoApplication()
 
         # Мокируем зависимые от оборудования и блокирующие части
-        mocker.patch('src.camera.capture.cv2.VideoCapture')
+        mocker.patch('src.camera.source.cv2.VideoCapture')
         mocker.patch('src.display.window.cv2.namedWindow')
         mocker.patch('src.display.window.cv2.imshow')
         mocker.patch('src.display.window.cv2.destroyAllWindows')
@@ -0,0 +1,165 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.camera.hub import FrameHub
+from src.camera.manager import CameraManager
+from src.camera.stream import AsyncFrameStream
+from src.config import Config
+from src.exceptions import CameraError
+
+
+def _publish(hub, value):
+    slot = hub.acquire_write()
+    slot.frame[0, 0, 0] = value
+    slot.record.begin(value, float(value))
+    hub.commit(slot)
+
+
+def _producer(hub, count, interval=0.002):
+    """Поток захвата: публикует count кадров и закрывает хаб"""
+    def run():
+        for value in range(1, count + 1):
+            _publish(hub, value)
+            threading.Event().wait(interval)
+        hub.close()
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+class TestAsyncFrameStream:
+    def test_many_consumers_share_one_producer(self):
+        """Тест: несколько асинхронных потребителей в одном цикле получают все кадры одного захвата"""
+        hub = FrameHub((4, 4, 3))
+
+        async def consume(stream):
+            values = []
+            async with stream:
+                async for frame in stream:
+                    values.append(int(frame[0, 0, 0]))
+                    assert stream.record.sequence == values[-1]
+            return values
+
+        async def main():
+            streams = [AsyncFrameStream(hub.subscribe(f"async-{i}", depth=64, policy="drop_oldest")) for i in range(3)]
+            producer = _producer(hub, 20)
+            results = await asyncio.gather(*(consume(stream) for stream in streams))
+            producer.join()
+            return results
+
+        results = asyncio.run(main())
+
+        assert results == [list(range(1, 21))] * 3
+        assert hub.occupancy == 0
+
+    def test_latest_skips_backlog(self):
+        """Тест: latest() возвращает копию самого нового кадра и отпускает накопившиеся"""
+        hub = FrameHub((4, 4, 3))
+
+        async def main():
+            stream = AsyncFrameStream(hub.subscribe("latest", depth=8))
+            for value in (1, 2, 3):
+                _publish(hub, value)
+            frame = await stream.latest()
+            stream.close()
+            return frame
+
+        frame = asyncio.run(main())
+
+        assert frame[0, 0, 0] == 3 and frame.flags.writeable
+        assert hub.occupancy == 0
+
+    def test_cancellation_releases_frames(self):
+        """Тест: отмена ожидающей задачи не удерживает слотов, закрытие потока возвращает очередь хабу"""
+        hub = FrameHub((4, 4, 3))
+
+        async def main():
+            stream = AsyncFrameStream(hub.subscribe("cancelled", depth=4))
+            _publish(hub, 1)
+
+            async def consume():
+                async for _ in stream:
+                    pass
+
+            task = asyncio.create_task(consume())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            held = stream.subscription._held
+            _publish(hub, 2)
+            stream.close()
+            return held
+
+        assert asyncio.run(main()) == 0
+        assert hub.occupancy == 0
+
+    def test_closed_hub_ends_iteration(self):
+        """Тест: остановка захвата будит ожидающего потребителя и завершает итерацию"""
+        hub = FrameHub((4, 4, 3))
+
+        async def main():
+            stream = AsyncFrameStream(hub.subscribe("waiting"))
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.01, threading.Thread(target=hub.close).start)
+            return [frame async for frame in stream], await stream.latest()
+
+        assert asyncio.run(main()) == ([], None)
+
+
+class TestManagerFrames:
+    def test_frames_over_capture(self, mock_env, monkeypatch):
+        """Тест: manager.frames() и latest_frame() читают захват через подписки хаба"""
+        monkeypatch.setenv("FRAME_SOURCE", "synthetic")
+        monkeypatch.setenv("FRAME_HUB", "true")
+        manager = CameraManager(Config())
+        manager.capture.initialize()
+
+        async def main():
+            async with manager.frames() as stream:
+                latest = asyncio.ensure_future(manager.latest_frame())
+                await asyncio.sleep(0)
+                await asyncio.to_thread(manager.capture._read_frame)
+                frame = await stream.__anext__()
+                return frame.shape, (await latest).shape
+
+        shapes = asyncio.run(main())
+        manager.stop_capture()
+
+        assert shapes[0] == shapes[1] == (480, 640, 3)
+        assert list(manager.capture.frame_hub.subscribers) == ["display"]
+
+    def test_repeated_latest_frame_reuses_subscription(self, mock_env, monkeypatch):
+        """Тест: повторные вызовы latest_frame() читают одну подписку и не наращивают пул хаба"""
+        monkeypatch.setenv("FRAME_SOURCE", "synthetic")
+        monkeypatch.setenv("FRAME_HUB", "true")
+        manager = CameraManager(Config())
+        manager.capture.initialize()
+        hub = manager.capture.frame_hub
+
+        display = manager.capture.get_frame_buffer()
+
+        async def main():
+            frames, capacities = [], []
+            for _ in range(20):
+                latest = asyncio.ensure_future(manager.latest_frame())
+                await asyncio.sleep(0)
+                await asyncio.to_thread(manager.capture._read_frame)
+                display.release(display.acquire_read(timeout=0))
+                frames.append(await latest)
+                capacities.append(hub.capacity)
+            return frames, capacities
+
+        frames, capacities = asyncio.run(main())
+        assert all(frame is not None for frame in frames) and len(set(capacities)) == 1
+        assert sorted(hub.subscribers) == ["async-latest-0", "display"]
+        manager.stop_capture()
+        assert list(hub.subscribers) == ["display"]
+
+    def test_frames_requires_running_loop(self, mock_env, monkeypatch):
+        """Тест: поток кадров открывается только в работающем цикле событий"""
+        monkeypatch.setenv("FRAME_HUB", "true")
+        with pytest.raises(CameraError):
+            CameraManager(Config()).frames()
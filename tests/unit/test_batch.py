@@ -0,0 +1,163 @@
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+from src.batch import BatchProcessor, find_inputs, main, process_range, split_ranges
+from src.exceptions import ProcessingError
+from src.filters import brightness  # noqa: F401  регистрация фильтров
+
+FRAMES = 25
+
+
+def _frame(index):
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    frame[:, :] = (index * 9) % 200
+    cv2.putText(frame, str(index), (4, 40), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
+    return frame
+
+
+@pytest.fixture
+def video(tmp_path):
+    """Короткий MJPG-файл с номером кадра в изображении"""
+    path = tmp_path / "input" / "clip.avi"
+    path.parent.mkdir()
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 25, (64, 48))
+    for index in range(FRAMES):
+        writer.write(_frame(index))
+    writer.release()
+    return path
+
+
+def _read(path):
+    capture = cv2.VideoCapture(str(path))
+    frames = []
+    while True:
+        ok, frame = capture.read()
+        if not ok:
+            return frames
+        frames.append(frame)
+
+
+def _processor(tmp_path, **kwargs):
+    options = dict(filters=["brightness"], intensity=0.5, codec="MJPG", container="avi", chunk_frames=10, workers=2)
+    options.update(kwargs)
+    return BatchProcessor(str(tmp_path / "output"), **options)
+
+
+class TestBatchPlanning:
+    def test_split_ranges(self):
+        """Тест: диапазоны покрывают файл без пропусков, последний короче"""
+        ranges = split_ranges(25, 10)
+        assert [(r.start, r.end) for r in ranges] == [(0, 10), (10, 20), (20, 25)]
+        with pytest.raises(ProcessingError):
+            split_ranges(25, 0)
+
+    def test_find_inputs(self, video, tmp_path):
+        """Тест: из каталога берутся только видеофайлы"""
+        (video.parent / "notes.txt").write_text("")
+        assert find_inputs([str(video.parent)]) == [video]
+        with pytest.raises(ProcessingError):
+            find_inputs([str(tmp_path / "missing.mp4")])
+
+    def test_unknown_filter_rejected(self, tmp_path):
+        """Тест: незарегистрированный фильтр отклоняется до запуска пула"""
+        with pytest.raises(ProcessingError):
+            _processor(tmp_path, filters=["missing"])
+
+
+class TestBatchRun:
+    def test_segments_concatenated_in_order(self, video, tmp_path):
+        """Тест: сегменты склеиваются по порядку без пропусков и повторов кадров"""
+        processor = _processor(tmp_path)
+
+        summary, = processor.run([video])
+
+        frames = _read(summary["output"])
+        assert summary["complete"] and summary["frames"] == FRAMES and summary["fps_per_core"] > 0
+        assert len(frames) == FRAMES
+        # Номер кадра сохраняет порядок: каждый кадр ближе всего к своему исходному
+        originals = _read(video)
+        for index, frame in enumerate(frames):
+            errors = [np.abs(frame.astype(int) - original.astype(int)).mean() for original in originals]
+            assert int(np.argmin(errors)) == index
+        assert not (tmp_path / "output" / ".clip.parts").exists()
+
+    def test_resume_processes_only_pending_ranges(self, video, tmp_path):
+        """Тест: после прерывания повторный запуск выполняет только незавершённые диапазоны"""
+        processor = _processor(tmp_path)
+        job = processor.plan(video)
+        job.parts_dir.mkdir(parents=True)
+        first = job.ranges[0]
+        _, first.frames, first.seconds = process_range(processor._task(job, first))
+        first.done = True
+        job.save()
+
+        resumed = processor.plan(video)
+        assert [r.index for r in resumed.pending] == [1, 2]
+
+        summary, = processor.run([video])
+        manifest = json.loads(job.manifest_path.read_text())
+        assert summary["frames"] == FRAMES and manifest["complete"]
+        assert len(_read(summary["output"])) == FRAMES
+        # Время первого диапазона из прерванного запуска: он не выполнялся повторно
+        assert manifest["ranges"][0]["seconds"] == first.seconds
+
+    def test_changed_settings_start_over(self, video, tmp_path):
+        """Тест: манифест с другими настройками не используется"""
+        processor = _processor(tmp_path)
+        processor.run([video])
+
+        assert processor.plan(video).complete
+        assert _processor(tmp_path, intensity=0.8).plan(video).pending
+
+    def test_inexact_seek_fails_range(self, video, tmp_path, monkeypatch):
+        """Тест: диапазон, позиционирование в начало которого не совпало, завершается ошибкой"""
+        processor = _processor(tmp_path)
+        job = processor.plan(video)
+        job.parts_dir.mkdir(parents=True)
+        original = cv2.VideoCapture
+
+        class KeyframeSeekCapture:
+            """Бэкенд, который при позиционировании встаёт на начало файла"""
+            def __init__(self, path):
+                self._capture = original(path)
+
+            def set(self, prop, value):
+                return True
+
+            def __getattr__(self, name):
+                return getattr(self._capture, name)
+
+        monkeypatch.setattr(cv2, "VideoCapture", KeyframeSeekCapture)
+        with pytest.raises(ProcessingError):
+            process_range(processor._task(job, job.ranges[1]))
+        assert not job.part_path(job.ranges[1]).exists()
+
+    def test_bad_file_does_not_stop_others(self, video, tmp_path):
+        """Тест: файл, который не удалось открыть, не мешает обработке остальных"""
+        broken = video.parent / "broken.mp4"
+        broken.write_bytes(b"not a video")
+        processor = _processor(tmp_path)
+
+        summaries = processor.run([broken, video])
+
+        assert [summary["complete"] for summary in summaries] == [True, False]
+        assert summaries[1]["source"] == str(broken) and summaries[1]["error"]
+        assert len(_read(summaries[0]["output"])) == FRAMES
+
+    def test_cli(self, video, tmp_path, mock_env, monkeypatch):
+        """Тест: командная строка обрабатывает каталог с настройками из окружения"""
+        monkeypatch.setenv("AVAILABLE_FILTERS", "none,brightness")
+        monkeypatch.setenv("RECORD_CODEC", "MJPG")
+        monkeypatch.setenv("RECORD_CONTAINER", "avi")
+        output = tmp_path / "cli"
+
+        code = main([str(video.parent), "--output", str(output), "--filters", "brightness",
+                     "--chunk-frames", "8", "--workers", "2"])
+
+        assert code == 0
+        assert len(_read(output / "clip.avi")) == FRAMES
+        (video.parent / "broken.mp4").write_bytes(b"not a video")
+        assert main([str(video.parent), "--output", str(output), "--filters", "brightness"]) == 1
@@ -0,0 +1,64 @@
+import json
+
+from src.benchmark import compare_results, main, run_benchmark
+
+
+class TestBenchmark:
+    def test_run_covers_registered_filters(self):
+        """Тест перебора всех зарегистрированных фильтров"""
+        results = run_benchmark(
+            resolutions={"tiny": (64, 48)},
+            intensities=(0.5,),
+            dtypes=("uint8", "float32"),
+            iterations=3,
+            warmup=1
+        )
+        names = {case["filter"] for case in results["results"]}
+
+        assert {"none", "blur", "brightness", "sharpen"} <= names
+        for case in results["results"]:
+            if "error" not in case:
+                assert case["p50_ms"] <= case["p99_ms"] <= case["max_ms"]
+                assert case["fps"] > 0
+
+    def test_compare_flags_regressions(self):
+        """Тест обнаружения регрессии сверх порога"""
+        case = {"filter": "blur", "resolution": "vga", "intensity": 0.5, "dtype": "uint8", "p50_ms": 1.0}
+        baseline = {"results": [case]}
+        slower = {"results": [dict(case, p50_ms=1.05)]}
+        much_slower = {"results": [dict(case, p50_ms=1.5)]}
+
+        assert compare_results(baseline, slower, threshold=0.1) == []
+        assert len(compare_results(baseline, much_slower, threshold=0.1)) == 1
+
+    def test_compare_flags_missing_and_failed_cases(self):
+        """Тест: случай baseline, пропавший или упавший в текущем прогоне, считается регрессией"""
+        case = {"filter": "blur", "resolution": "vga", "intensity": 0.5, "dtype": "uint8", "p50_ms": 1.0}
+        other = dict(case, filter="sharpen")
+        baseline = {"results": [case, other]}
+        current = {"results": [dict(case, p50_ms=None, error="boom")]}
+
+        regressions = compare_results(baseline, current)
+
+        assert [(r["filter"], r["error"]) for r in regressions] == [
+            ("blur", "boom"), ("sharpen", "missing from current run")
+        ]
+
+    def test_cli_compare_fails_on_broken_filter(self, tmp_path):
+        """Тест: режим сравнения завершается с ошибкой, если фильтр перестал работать"""
+        case = {"filter": "blur", "resolution": "vga", "intensity": 0.5, "dtype": "uint8", "p50_ms": 1.0}
+        baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+        baseline.write_text(json.dumps({"results": [case]}))
+        current.write_text(json.dumps({"results": [dict(case, error="boom")]}))
+
+        assert main(["compare", str(baseline), str(current)]) == 1
+
+    def test_cli_run_and_compare(self, tmp_path):
+        """Тест записи JSON и режима сравнения"""
+        output = tmp_path / "bench.json"
+        args = ["run", "--output", str(output), "--filters", "none", "--resolutions", "32x24",
+                "--intensities", "1.0", "--iterations", "2", "--warmup", "1"]
+
+        assert main(args) == 0
+        assert json.loads(output.read_text())["results"][0]["width"] == 32
+        assert main(["compare", str(output), str(output)]) == 0
@@ -0,0 +1,84 @@
+import os
+import threading
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.camera.buffer import DeferredDecodeBuffer
+from src.camera.capture import CameraCapture
+from src.config import Config
+
+
+@pytest.fixture
+def grab_config(mock_env):
+    """Конфигурация с декодированием по запросу"""
+    with patch.dict(os.environ, {'CAPTURE_MODE': 'grab'}):
+        yield Config()
+
+
+class TestGrabMode:
+    def test_only_pulled_frames_are_decoded(self, grab_config, mock_camera):
+        """Тест: retrieve вызывается только для кадров, забранных потребителем"""
+        capture = CameraCapture(grab_config)
+        capture.initialize()
+        capture.is_capturing = True
+        frame_buffer = capture.get_frame_buffer()
+        assert isinstance(frame_buffer, DeferredDecodeBuffer)
+
+        for _ in range(3):
+            capture._grab_frame()
+        slot = frame_buffer.acquire_read(timeout=0)
+        frame_buffer.release(slot)
+
+        assert mock_camera.grab.call_count == 3
+        mock_camera.retrieve.assert_called_once()
+        mock_camera.read.assert_not_called()
+        assert frame_buffer.stats.produced == 3
+        assert frame_buffer.stats.consumed == 1
+        assert frame_buffer.stats.stale == 2
+
+    def test_retrieve_writes_into_slot(self, grab_config, mock_camera):
+        """Тест декодирования в предвыделенный слот"""
+        def retrieve(image=None):
+            image[:] = 9
+            return True, image
+
+        mock_camera.retrieve.side_effect = retrieve
+        capture = CameraCapture(grab_config)
+        capture.initialize()
+        capture.is_capturing = True
+        frame_buffer = capture.get_frame_buffer()
+        buffers = {id(slot.frame) for slot in frame_buffer._slots}
+
+        capture._grab_frame()
+        slot = frame_buffer.acquire_read(timeout=0)
+
+        assert id(slot.frame) in buffers
+        assert np.all(slot.frame == 9)
+
+    def test_no_new_grab_times_out(self, grab_config, mock_camera):
+        """Тест: без нового захвата повторное чтение не декодирует тот же кадр"""
+        capture = CameraCapture(grab_config)
+        capture.initialize()
+        capture.is_capturing = True
+        frame_buffer = capture.get_frame_buffer()
+
+        capture._grab_frame()
+        frame_buffer.release(frame_buffer.acquire_read(timeout=0))
+
+        assert frame_buffer.acquire_read(timeout=0.01) is None
+        mock_camera.retrieve.assert_called_once()
+
+    def test_capture_loop_grabs(self, grab_config, mock_camera, shutdown_event):
+        """Тест цикла захвата в режиме grab"""
+        mock_camera.grab.side_effect = lambda: shutdown_event.set() or True
+        capture = CameraCapture(grab_config)
+        capture.initialize()
+
+        thread = threading.Thread(target=capture.start_capture, args=(shutdown_event,))
+        thread.start()
+        thread.join(timeout=1)
+
+        assert capture.frame_sequence == 1
+        mock_camera.read.assert_not_called()
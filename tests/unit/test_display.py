@@ -0,0 +1,63 @@
+import numpy as np
+
+from src.camera.buffer import FrameRingBuffer
+from src.display.commands import CommandChannel
+from src.display.sink import CallbackSink, NullSink, WindowSink
+from src.display.window import DisplayWindow
+from src.filters.blur import BlurFilter  # noqa: F401  регистрация фильтра blur
+
+
+def _buffer_with_frames(count):
+    buffer = FrameRingBuffer(count, (48, 64, 3))
+    for value in range(count):
+        slot = buffer.acquire_write()
+        slot.frame[:] = value
+        buffer.commit(slot)
+    return buffer
+
+
+class TestHeadlessDisplay:
+    def test_frames_reach_all_sinks(self, test_config, shutdown_event):
+        """Тест вывода кадров в несколько приёмников без окна"""
+        null_sink = NullSink()
+        received = []
+
+        def on_frame(frame):
+            received.append(int(frame[0, 0, 0]))
+            if len(received) == 3:
+                shutdown_event.set()
+
+        display = DisplayWindow(test_config, [null_sink, CallbackSink(on_frame)])
+        frame_buffer = _buffer_with_frames(3)
+        display.start_display(frame_buffer, shutdown_event)
+
+        assert received == [0, 1, 2]
+        assert null_sink.frames == 3
+        assert frame_buffer.occupancy == 0
+
+    def test_commands_control_display(self, test_config, shutdown_event):
+        """Тест управления через канал команд без клавиатуры"""
+        commands = CommandChannel()
+        display = DisplayWindow(test_config, [NullSink()], commands)
+        commands.send("filter", "blur")
+        commands.send("quit")
+
+        display.start_display(_buffer_with_frames(1), shutdown_event)
+
+        assert display.current_filter.name == "blur"
+        assert not display.is_displaying
+
+
+class TestWindowSink:
+    def test_key_press_becomes_command(self, mock_cv2_display):
+        """Тест преобразования клавиш окна в команды"""
+        commands = CommandChannel()
+        sink = WindowSink("Test Window", commands)
+        sink.open()
+        sink.write(np.zeros((4, 4, 3), dtype=np.uint8))
+        mock_cv2_display["waitKey"].return_value = ord('q')
+        sink.poll()
+        sink.close()
+
+        mock_cv2_display["imshow"].assert_called_once()
+        assert [command.action for command in commands.drain()] == ["quit"]
@@ -0,0 +1,75 @@
+import tracemalloc
+
+import numpy as np
+
+from src.display.commands import CommandChannel
+from src.display.sink import NullSink
+from src.display.window import DisplayWindow
+from src.filters.base import FilterFactory
+from src.filters.pipeline import FilterPipeline
+from src.filters import blur, brightness, sharpen  # noqa: F401  регистрация фильтров
+
+
+class TestPrepare:
+    def test_prepare_runs_once_per_geometry_and_intensity(self, monkeypatch):
+        """Тест: подготовка повторяется только при смене формы, типа или интенсивности"""
+        image_filter = FilterFactory.create("sharpen", 0.5)
+        calls = []
+        original = image_filter._prepare
+        monkeypatch.setattr(
+            image_filter, "_prepare", lambda shape, dtype: (calls.append(shape), original(shape, dtype))
+        )
+        frame = np.zeros((24, 32, 3), dtype=np.uint8)
+
+        for _ in range(3):
+            image_filter.apply(frame)
+        image_filter.intensity = 0.8
+        image_filter.apply(frame)
+        image_filter.apply(np.zeros((12, 16, 3), dtype=np.uint8))
+
+        assert calls == [(24, 32, 3), (24, 32, 3), (12, 16, 3)]
+
+    def test_prepared_kernel_follows_intensity(self):
+        """Тест: после смены интенсивности используется новое ядро"""
+        rng = np.random.default_rng(0)
+        frame = rng.integers(0, 256, (24, 32), dtype=np.uint8)
+        image_filter = FilterFactory.create("sharpen", 0.2)
+        image_filter.apply(frame)
+
+        image_filter.intensity = 0.9
+
+        assert np.array_equal(image_filter.apply(frame), FilterFactory.create("sharpen", 0.9).apply(frame))
+
+    def test_factory_caches_instances(self):
+        """Тест: общий экземпляр выдаётся повторно для тех же имени и интенсивности"""
+        assert FilterFactory.get("blur", 0.5) is FilterFactory.get("blur", 0.5)
+        assert FilterFactory.get("blur", 0.5) is not FilterFactory.get("blur", 0.6)
+        assert FilterFactory.create("blur", 0.5) is not FilterFactory.get("blur", 0.5)
+
+    def test_prepared_pipeline_first_frame_does_not_allocate(self):
+        """Тест: после prepare() первый кадр обрабатывается без выделения памяти"""
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        pipeline = FilterPipeline([FilterFactory.create(name, 0.5) for name in ("blur", "sharpen", "brightness")])
+        pipeline.prepare(frame.shape, frame.dtype)
+
+        tracemalloc.start()
+        pipeline.apply(frame)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert peak < frame.nbytes
+
+
+class TestFilterSwitching:
+    def test_switch_reuses_prepared_pipelines(self, test_config):
+        """Тест: повторное переключение берёт готовую цепочку, подготовленную под текущий кадр"""
+        display = DisplayWindow(test_config, [NullSink()], CommandChannel())
+        display.frame_geometry = ((48, 64, 3), np.dtype(np.uint8))
+
+        display._switch_filter("blur")
+        blur_pipeline = display.current_filter
+        display._switch_filter("sharpen")
+        display._switch_filter("blur")
+
+        assert display.current_filter is blur_pipeline
+        assert blur_pipeline.geometry == ((48, 64, 3), np.dtype(np.uint8))
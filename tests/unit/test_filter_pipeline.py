@@ -0,0 +1,49 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from src.filters.base import FilterFactory
+from src.filters.pipeline import FilterPipeline
+from src.filters import blur, brightness, sharpen  # noqa: F401  регистрация фильтров
+
+
+@pytest.fixture
+def noise_frame():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+
+
+class TestFilterPipeline:
+    @pytest.mark.parametrize("names", [["blur"], ["blur", "brightness"], ["sharpen", "none", "blur", "brightness"]])
+    def test_matches_sequential_apply(self, names, noise_frame):
+        """Тест: цепочка даёт тот же результат, что и последовательные apply()"""
+        expected = noise_frame
+        for name in names:
+            expected = FilterFactory.create(name, 0.7).apply(expected)
+
+        result = FilterPipeline.from_names(names, 0.7).apply(noise_frame)
+
+        assert np.array_equal(result, expected)
+
+    def test_no_allocations_after_warmup(self, noise_frame):
+        """Тест: после первого кадра цепочка не выделяет кадры"""
+        pipeline = FilterPipeline.from_names(["blur", "sharpen", "brightness"], 0.5)
+        pipeline.apply(noise_frame)
+
+        tracemalloc.start()
+        for _ in range(5):
+            result = pipeline.apply(noise_frame)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert peak < noise_frame.nbytes
+        assert any(result is buffer for buffer in pipeline._buffers)
+
+    def test_none_is_zero_copy(self, noise_frame):
+        """Тест: цепочка из none возвращает исходный кадр"""
+        pipeline = FilterPipeline.from_names(["none"])
+
+        assert pipeline.is_passthrough
+        assert pipeline.apply(noise_frame) is noise_frame
+        assert pipeline.name == "none"
@@ -0,0 +1,133 @@
+import threading
+
+import numpy as np
+import pytest
+
+from src.camera.backpressure import BackpressureFactory
+from src.camera.buffer import FrameRingBuffer
+from src.camera.capture import CameraCapture
+from src.exceptions import CameraError, ConfigurationError
+
+
+class TestFrameRingBuffer:
+    def test_slots_are_preallocated_and_reused(self, frame_buffer):
+        """Тест повторного использования одних и тех же буферов"""
+        buffers = {id(slot.frame) for slot in frame_buffer._slots}
+
+        for _ in range(10):
+            slot = frame_buffer.acquire_write()
+            frame_buffer.commit(slot, slot.frame)
+            read_slot = frame_buffer.acquire_read(timeout=0)
+            frame_buffer.release(read_slot)
+
+        assert {id(slot.frame) for slot in frame_buffer._slots} == buffers
+
+    def test_overwrites_oldest_ready_frame(self, frame_buffer):
+        """Тест перезаписи самого старого кадра при заполненном кольце"""
+        for value in range(5):
+            slot = frame_buffer.acquire_write()
+            slot.frame[0, 0, 0] = value
+            frame_buffer.commit(slot)
+
+        assert frame_buffer.overwrites == 2
+        assert frame_buffer.occupancy == 3
+        slot = frame_buffer.acquire_read(timeout=0)
+        assert slot.frame[0, 0, 0] == 2
+
+    def test_held_slot_is_never_overwritten(self, frame_buffer):
+        """Тест: слот, удерживаемый потребителем, не выдаётся производителю"""
+        slot = frame_buffer.acquire_write()
+        frame_buffer.commit(slot)
+        held = frame_buffer.acquire_read(timeout=0)
+
+        for _ in range(10):
+            write_slot = frame_buffer.acquire_write()
+            assert write_slot is not held
+            frame_buffer.commit(write_slot)
+
+        frame_buffer.release(held)
+        with pytest.raises(CameraError):
+            frame_buffer.release(held)
+
+    def test_acquire_read_timeout_and_close(self, frame_buffer):
+        """Тест таймаута ожидания и пробуждения при закрытии"""
+        assert frame_buffer.acquire_read(timeout=0.01) is None
+
+        result = []
+        reader = threading.Thread(target=lambda: result.append(frame_buffer.acquire_read(timeout=5)))
+        reader.start()
+        frame_buffer.close()
+        reader.join(timeout=1)
+        assert result == [None]
+
+
+class TestCameraCaptureBuffer:
+    def test_capture_reads_into_slot(self, test_config, mock_camera, shutdown_event):
+        """Тест чтения кадра камерой в предвыделенный слот"""
+        def read(image=None):
+            image[:] = 7
+            shutdown_event.set()
+            return True, image
+
+        mock_camera.read.side_effect = read
+        capture = CameraCapture(test_config)
+        capture.initialize()
+        capture.start_capture(shutdown_event)
+
+        slot = capture.get_frame_buffer().acquire_read(timeout=0)
+        assert slot is not None
+        assert np.all(slot.frame == 7)
+
+
+class TestBackpressurePolicies:
+    def _publish(self, buffer, count):
+        for value in range(count):
+            slot = buffer.acquire_write()
+            if slot is not None:
+                slot.frame[0, 0, 0] = value
+                buffer.commit(slot)
+
+    def test_drop_newest_keeps_queued_frames(self):
+        """Тест: drop_newest отбрасывает новые кадры"""
+        buffer = FrameRingBuffer(3, (4, 4, 3), policy=BackpressureFactory.create("drop_newest"))
+        self._publish(buffer, 5)
+
+        assert buffer.stats.produced == 3
+        assert buffer.stats.dropped == 2
+        assert buffer.acquire_read(timeout=0).frame[0, 0, 0] == 0
+
+    def test_block_waits_for_release(self):
+        """Тест: block дожидается освобождения слота потребителем"""
+        buffer = FrameRingBuffer(1, (4, 4, 3), policy=BackpressureFactory.create("block", timeout=2.0))
+        self._publish(buffer, 1)
+        held = buffer.acquire_read(timeout=0)
+
+        releaser = threading.Timer(0.05, buffer.release, args=(held,))
+        releaser.start()
+        assert buffer.acquire_write() is not None
+        releaser.join()
+
+        assert buffer.stats.dropped == 0
+
+    def test_block_drops_after_timeout(self):
+        """Тест: block отбрасывает кадр по истечении таймаута"""
+        buffer = FrameRingBuffer(1, (4, 4, 3), policy=BackpressureFactory.create("block", timeout=0.01))
+        self._publish(buffer, 2)
+
+        assert buffer.stats.dropped == 1
+
+    def test_latest_only_delivers_newest_frame(self):
+        """Тест: почтовый ящик хранит только последний кадр"""
+        buffer = FrameRingBuffer(3, (4, 4, 3), policy=BackpressureFactory.create("latest_only"))
+        self._publish(buffer, 5)
+
+        assert buffer.occupancy == 1
+        assert buffer.stats.stale == 4
+        slot = buffer.acquire_read(timeout=0)
+        assert slot.frame[0, 0, 0] == 4
+        assert buffer.stats.consumed == 1
+
+    def test_unknown_policy(self):
+        """Тест ошибки для неизвестной политики"""
+        with pytest.raises(ConfigurationError):
+            BackpressureFactory.create("unknown")
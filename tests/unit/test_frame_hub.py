@@ -0,0 +1,143 @@
+import threading
+
+import numpy as np
+import pytest
+
+from src.camera.capture import CameraCapture
+from src.camera.hub import FrameHub
+from src.config import Config
+from src.exceptions import CameraError, ConfigurationError
+from src.utils.metrics import REGISTRY
+
+
+def _publish(hub, value):
+    slot = hub.acquire_write()
+    slot.frame[0, 0, 0] = value
+    slot.record.begin(value, float(value))
+    hub.commit(slot)
+    return slot
+
+
+class TestFrameHub:
+    def test_subscribers_share_read_only_frames(self):
+        """Тест: подписчики получают один и тот же кадр без копирования и не могут его изменить"""
+        hub = FrameHub((4, 4, 3))
+        first = hub.subscribe("display")
+        second = hub.subscribe("recorder")
+        written = _publish(hub, 7)
+
+        a = first.acquire_read(timeout=0)
+        b = second.acquire_read(timeout=0)
+
+        assert np.shares_memory(a.frame, written.frame) and np.shares_memory(b.frame, written.frame)
+        assert a.frame[0, 0, 0] == 7 and b.record.sequence == 7
+        with pytest.raises(ValueError):
+            a.frame[0, 0, 0] = 1
+
+    def test_slot_recycled_after_all_subscribers_release(self):
+        """Тест: слот возвращается в пул только после освобождения всеми подписчиками"""
+        hub = FrameHub((4, 4, 3))
+        first = hub.subscribe("display")
+        second = hub.subscribe("recorder")
+        _publish(hub, 1)
+
+        a = first.acquire_read(timeout=0)
+        first.release(a)
+        assert hub.occupancy == 1
+        b = second.acquire_read(timeout=0)
+        second.release(b)
+        assert hub.occupancy == 0
+        with pytest.raises(CameraError):
+            second.release(b)
+
+    def test_slow_subscriber_does_not_stall_others(self):
+        """Тест: медленный подписчик теряет свои кадры, но производитель и другие подписчики не ждут"""
+        hub = FrameHub((4, 4, 3))
+        fast = hub.subscribe("display", depth=1)
+        slow = hub.subscribe("analytics", depth=2, policy="drop_oldest")
+        _publish(hub, 1)
+        fast.release(fast.acquire_read(timeout=0))
+        held = slow.acquire_read(timeout=0)
+
+        for value in range(2, 12):
+            _publish(hub, value)
+            slot = fast.acquire_read(timeout=0)
+            assert slot.record.sequence == value
+            fast.release(slot)
+
+        assert hub.stats.dropped == 0
+        assert slow.stats.dropped == 8
+        assert slow.lag == 10
+        assert [slow.acquire_read(timeout=0).record.sequence for _ in range(2)] == [10, 11]
+        assert held.frame[0, 0, 0] == 1
+
+    def test_latest_only_subscriber(self):
+        """Тест: подписчик latest_only получает только самый свежий кадр"""
+        hub = FrameHub((4, 4, 3))
+        subscription = hub.subscribe("preview", depth=1, policy="latest_only")
+        for value in range(1, 4):
+            _publish(hub, value)
+
+        assert subscription.acquire_read(timeout=0).record.sequence == 3
+        assert subscription.stats.stale == 2
+
+    def test_unsubscribe_returns_frames_and_wakes_reader(self):
+        """Тест отписки: кадры очереди освобождаются, ожидающий потребитель просыпается"""
+        hub = FrameHub((4, 4, 3))
+        subscription = hub.subscribe("recorder", depth=3)
+        _publish(hub, 1)
+        subscription.close()
+        assert hub.occupancy == 0
+
+        waiting = hub.subscribe("analytics")
+        result = []
+        reader = threading.Thread(target=lambda: result.append(waiting.acquire_read(timeout=2.0)))
+        reader.start()
+        hub.close()
+        reader.join(timeout=1.0)
+        assert result == [None]
+
+    def test_unsubscribe_frees_pool_slots_and_metrics(self):
+        """Тест: после отписки слоты пула освобождаются и переиспользуются, серии метрик удаляются"""
+        hub = FrameHub((4, 4, 3), camera_label="pool")
+        display = hub.subscribe("display")
+        baseline = hub.capacity
+        for cycle in range(10):
+            subscription = hub.subscribe(f"async-{cycle}", depth=4)
+            _publish(hub, cycle)
+            held = subscription.acquire_read(timeout=0)
+            subscription.close()
+            subscription.release(held)
+            display.release(display.acquire_read(timeout=0))
+
+        assert hub.capacity == baseline and len(hub._slots) == baseline + 5
+        assert hub.occupancy == 0
+        assert "async-" not in REGISTRY.render()
+
+
+class TestCaptureHub:
+    def test_capture_feeds_display_and_subscribers(self, mock_env, monkeypatch):
+        """Тест: захват с FRAME_HUB пишет кадр один раз, окно и подписчик читают его из общего слота"""
+        monkeypatch.setenv("FRAME_SOURCE", "synthetic")
+        monkeypatch.setenv("FRAME_HUB", "true")
+        capture = CameraCapture(Config())
+        capture.initialize()
+        recorder = capture.subscribe("recorder", depth=4)
+        capture._read_frame()
+
+        display_slot = capture.get_frame_buffer().acquire_read(timeout=0)
+        recorder_slot = recorder.acquire_read(timeout=0)
+        assert np.shares_memory(display_slot.frame, recorder_slot.frame)
+        capture.stop_capture()
+
+    def test_subscribe_requires_hub(self, test_config):
+        """Тест: без FRAME_HUB подписка недоступна"""
+        with pytest.raises(CameraError):
+            CameraCapture(test_config).subscribe("recorder")
+
+    def test_hub_rejects_block_policy(self, mock_env, monkeypatch):
+        """Тест: с FRAME_HUB производитель не может ждать подписчика"""
+        monkeypatch.setenv("FRAME_HUB", "true")
+        monkeypatch.setenv("BACKPRESSURE_POLICY", "block")
+        with pytest.raises(ConfigurationError):
+            Config()
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from src.filters.base import FilterFactory
+from src.filters.fusion import optimize_filters
+from src.filters.pipeline import FilterPipeline
+from src.filters import blur, brightness, sharpen  # noqa: F401  регистрация фильтров
+
+
+@pytest.fixture
+def smooth_frame():
+    """Плавный кадр, на котором промежуточные результаты не выходят за [0, 255]"""
+    y, x = np.mgrid[0:120, 0:160].astype(np.float32)
+    frame = np.empty((120, 160, 3), dtype=np.uint8)
+    frame[..., 0] = 100 + 40 * np.sin(x / 9.0)
+    frame[..., 1] = 60 + x / 2
+    frame[..., 2] = 120 + 30 * np.cos((x + y) / 13.0)
+    return frame
+
+
+def _filters(spec):
+    return [FilterFactory.create(name, intensity) for name, intensity in spec]
+
+
+class TestFilterFusion:
+    @pytest.mark.parametrize("spec, stages", [
+        ([("blur", 0.0), ("blur", 0.3)], 1),
+        ([("blur", 0.0), ("sharpen", 0.5)], 1),
+        ([("sharpen", 0.5), ("brightness", 0.7)], 1),
+        ([("brightness", 0.6), ("blur", 0.2), ("none", 1.0), ("brightness", 0.55)], 1),
+        ([("blur", 1.0), ("sharpen", 0.5), ("brightness", 0.6)], 2),
+    ])
+    def test_fused_matches_unfused(self, spec, stages, smooth_frame):
+        """Тест: объединённая цепочка совпадает с последовательной с точностью до округления"""
+        unfused = FilterPipeline(_filters(spec)).apply(smooth_frame).astype(np.int16)
+        fused_pipeline = FilterPipeline(_filters(spec), fuse=True)
+        fused = fused_pipeline.apply(smooth_frame).astype(np.int16)
+
+        assert len(fused_pipeline.filters) == stages
+        difference = np.abs(fused - unfused)
+        assert difference.mean() < 0.5
+        assert difference.max() <= 3
+
+    def test_noop_stages_are_dropped(self):
+        """Тест удаления этапов, не меняющих кадр"""
+        assert optimize_filters(_filters([("none", 1.0), ("sharpen", 0.0), ("brightness", 0.5)])) == []
+
+    def test_darkening_brightness_is_not_folded(self):
+        """Тест: затемнение (модуль в convertScaleAbs) не объединяется с линейными этапами"""
+        filters = _filters([("blur", 0.0), ("brightness", 0.2)])
+        optimized = optimize_filters(filters)
+
+        assert optimized == filters
@@ -0,0 +1,80 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.filters.gating import ChangeGate
+from src.filters.pipeline import FilterPipeline
+from src.filters import blur, brightness, sharpen, temporal  # noqa: F401  регистрация фильтров
+
+
+@pytest.fixture
+def scene():
+    rng = np.random.default_rng(0)
+    return cv2.GaussianBlur(rng.integers(0, 256, (240, 320, 3), dtype=np.uint8), (5, 5), 0)
+
+
+class TestChangeGate:
+    def test_static_frames_reuse_output(self, scene):
+        """Тест: неизменный кадр не фильтруется повторно"""
+        gate = ChangeGate(refresh_frames=0)
+        pipeline = FilterPipeline.from_names(["blur"], 0.5)
+
+        first = gate.apply(pipeline, scene).copy()
+        second = gate.apply(pipeline, scene.copy())
+
+        assert np.array_equal(second, first)
+        assert gate.stats.as_dict() == {"full": 1, "partial": 0, "skipped": 1, "tiles": 0}
+
+    def test_small_change_refilters_tiles_exactly(self, scene):
+        """Тест: локальное изменение перефильтровывает только свои плитки, результат совпадает с полной обработкой"""
+        gate = ChangeGate(refresh_frames=0)
+        pipeline = FilterPipeline.from_names(["sharpen", "blur", "brightness"], 0.5)
+        gate.apply(pipeline, scene)
+
+        moved = scene.copy()
+        moved[100:120, 150:170] = 255
+        result = gate.apply(pipeline, moved)
+        expected = FilterPipeline.from_names(["sharpen", "blur", "brightness"], 0.5).apply(moved)
+
+        assert gate.stats.partial == 1
+        assert 0 < gate.stats.tiles < 20
+        assert np.array_equal(result, expected)
+
+    def test_large_change_and_refresh_process_full_frame(self, scene):
+        """Тест: большое изменение и периодическое обновление обрабатывают кадр целиком"""
+        gate = ChangeGate(refresh_frames=2)
+        pipeline = FilterPipeline.from_names(["blur"], 0.5)
+        gate.apply(pipeline, scene)
+        gate.apply(pipeline, 255 - scene)
+        gate.apply(pipeline, 255 - scene)
+        gate.apply(pipeline, 255 - scene)
+        gate.apply(pipeline, 255 - scene)
+
+        assert gate.stats.as_dict() == {"full": 3, "partial": 0, "skipped": 2, "tiles": 0}
+        assert gate.stats.rates()["skipped"] == pytest.approx(0.4)
+
+    def test_slow_drift_accumulates(self, scene):
+        """Тест: медленное изменение сравнивается с обработанным кадром и в итоге обрабатывается"""
+        gate = ChangeGate(threshold=4.0, refresh_frames=0)
+        pipeline = FilterPipeline.from_names(["brightness"], 0.5)
+        gate.apply(pipeline, scene)
+
+        for step in range(1, 4):
+            gate.apply(pipeline, cv2.add(scene, np.full_like(scene, 2 * step)))
+
+        assert gate.stats.skipped == 2
+        assert gate.stats.full == 2
+
+    def test_stateful_chain_sees_every_frame(self, scene):
+        """Тест: цепочка с фильтром с состоянием получает и статичные кадры, её накопитель не отстаёт"""
+        gate = ChangeGate(refresh_frames=0)
+        gated = FilterPipeline.from_names(["temporal"], 0.5)
+        reference = FilterPipeline.from_names(["temporal"], 0.5)
+        dark = scene // 4
+
+        for frame in (dark, scene, scene, scene):
+            result = gate.apply(gated, frame)
+            expected = reference.apply(frame)
+
+        assert np.array_equal(result, expected)
+        assert gate.stats.skipped == 0 and gate.stats.full == 4
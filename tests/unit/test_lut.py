@@ -0,0 +1,99 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.filters.base import FilterFactory
+from src.filters.lut import LutCache, LutFilter, compile_table
+from src.filters import brightness, contrast, gamma  # noqa: F401  регистрация фильтров
+
+
+@pytest.fixture
+def noise_frame():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (60, 80, 3), dtype=np.uint8)
+
+
+class _InvertBlue(LutFilter):
+    """Поканальная кривая: инверсия только синего канала"""
+
+    def lut_params(self):
+        return ()
+
+    def mapping(self, values):
+        return np.stack([255.0 - values, values, values], axis=1)
+
+    @property
+    def name(self):
+        return "invert_blue"
+
+
+class TestLutCache:
+    def test_hit_and_eviction(self):
+        """Тест: повторный запрос берётся из кэша, старые таблицы вытесняются"""
+        cache = LutCache(maxsize=2)
+        build = lambda: compile_table(lambda values: values)  # noqa: E731
+
+        cache.get(("a", 1), build)
+        cache.get(("a", 1), build)
+        cache.get(("b", 1), build)
+        cache.get(("c", 1), build)
+
+        assert (cache.hits, cache.misses) == (1, 3)
+        assert len(cache) == 2
+        cache.get(("a", 1), build)
+        assert cache.misses == 4
+
+    def test_intensity_change_reuses_table(self, monkeypatch):
+        """Тест: возврат к прежней интенсивности не компилирует таблицу заново"""
+        cache = LutCache()
+        monkeypatch.setattr(LutFilter, "cache", cache)
+        image_filter = FilterFactory.create("gamma", 0.2)
+        frame = np.zeros((4, 4), dtype=np.uint8)
+
+        for intensity in (0.2, 0.8, 0.2, 0.8):
+            image_filter.intensity = intensity
+            image_filter.apply(frame)
+
+        assert cache.misses == 2
+
+
+class TestLutFilters:
+    @pytest.mark.parametrize("intensity", [0.0, 0.3, 0.5, 1.0])
+    def test_brightness_matches_convert_scale_abs(self, intensity, noise_frame):
+        """Тест: таблица яркости совпадает с прежней реализацией через convertScaleAbs"""
+        image_filter = FilterFactory.create("brightness", intensity)
+        expected = cv2.convertScaleAbs(noise_frame, alpha=1.0, beta=(intensity - 0.5) * 200)
+
+        assert np.array_equal(image_filter.apply(noise_frame), expected)
+        assert np.array_equal(image_filter.apply_into(noise_frame, np.empty_like(noise_frame)), expected)
+
+    @pytest.mark.parametrize("name", ["contrast", "gamma"])
+    def test_neutral_intensity_is_identity(self, name, noise_frame):
+        """Тест: при интенсивности 0.5 контраст и гамма не меняют кадр"""
+        image_filter = FilterFactory.create(name, 0.5)
+
+        assert image_filter.is_identity
+        assert np.array_equal(image_filter.apply(noise_frame), noise_frame)
+
+    def test_gamma_brightens_shadows(self):
+        """Тест: гамма меньше 1 осветляет тени, концы диапазона сохраняются"""
+        table = FilterFactory.create("gamma", 1.0).table
+
+        assert table[0] == 0 and table[255] == 255
+        assert table[64] > 64
+
+    def test_float_frame_uses_direct_mapping(self):
+        """Тест: кадры float обрабатываются без таблицы и сохраняют тип"""
+        frame = np.full((4, 4), 100.0, dtype=np.float32)
+
+        result = FilterFactory.create("contrast", 1.0).apply(frame)
+
+        assert result.dtype == np.float32
+        assert np.allclose(result, (100.0 - 127.5) * 2.0 + 127.5)
+
+    def test_per_channel_curve(self, noise_frame):
+        """Тест: поканальная таблица применяется к каждому каналу отдельно"""
+        result = _InvertBlue().apply(noise_frame)
+
+        assert np.array_equal(result[..., 0], 255 - noise_frame[..., 0])
+        assert np.array_equal(result[..., 1:], noise_frame[..., 1:])
@@ -0,0 +1,55 @@
+import urllib.request
+
+from src.camera.capture import CameraCapture
+from src.utils.metrics import REGISTRY, MetricsRegistry, MetricsServer
+
+
+class TestMetricsRegistry:
+    def test_render_prometheus_text(self):
+        """Тест текстового формата Prometheus"""
+        registry = MetricsRegistry()
+        registry.counter("frames_total", "Frames").labels(camera="0").inc(3)
+        registry.gauge("depth", "Depth").labels().set_function(lambda: 2)
+        histogram = registry.histogram("filter_seconds", "Filter time", buckets=(0.01, 0.1))
+        histogram.labels(filter="blur").observe(0.05)
+
+        text = registry.render()
+
+        assert '# TYPE frames_total counter' in text
+        assert 'frames_total{camera="0"} 3.0' in text
+        assert 'depth 2.0' in text
+        assert 'filter_seconds_bucket{filter="blur",le="0.01"} 0' in text
+        assert 'filter_seconds_bucket{filter="blur",le="0.1"} 1' in text
+        assert 'filter_seconds_count{filter="blur"} 1' in text
+
+    def test_label_values_are_escaped(self):
+        """Тест экранирования обратной косой черты, кавычки и перевода строки в значениях меток"""
+        registry = MetricsRegistry()
+        registry.counter("frames_total", "Frames").labels(subscriber='a"b\\c\nd').inc()
+
+        assert 'frames_total{subscriber="a\\"b\\\\c\\nd"} 1.0' in registry.render()
+
+    def test_capture_exposes_buffer_state(self, test_config, mock_camera):
+        """Тест: метрики захвата читаются из буфера в момент запроса"""
+        capture = CameraCapture(test_config)
+        capture.initialize()
+        capture._read_frame()
+
+        registry_text = REGISTRY.render()
+        assert 'video_queue_depth{camera="0"} 1.0' in registry_text
+
+
+class TestMetricsServer:
+    def test_serves_metrics_on_localhost(self):
+        """Тест HTTP-эндпоинта метрик"""
+        registry = MetricsRegistry()
+        registry.counter("frames_total", "Frames").labels().inc()
+        server = MetricsServer("127.0.0.1", 0, registry)
+        server.start()
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=2) as response:
+                body = response.read().decode()
+        finally:
+            server.stop()
+
+        assert "frames_total 1.0" in body
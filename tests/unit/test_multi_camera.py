@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+
+from src.camera.buffer import FrameRingBuffer
+from src.camera.manager import CameraManager
+from src.camera.scheduler import FrameSynchronizer
+from src.config import Config
+from src.exceptions import CameraError, ConfigurationError
+
+
+@pytest.fixture
+def multi_camera_config(mock_env, monkeypatch):
+    monkeypatch.setenv("FRAME_SOURCE", "synthetic")
+    monkeypatch.setenv("FRAME_WIDTH", "64")
+    monkeypatch.setenv("FRAME_HEIGHT", "48")
+    monkeypatch.setenv("FPS", "100")
+    monkeypatch.setenv("CAMERA_INDICES", "0,1,2,3")
+    monkeypatch.setenv("CAPTURE_THREADS", "2")
+    return Config()
+
+
+def _commit(buffer, capture_ts):
+    slot = buffer.acquire_write()
+    slot.record.begin(0, capture_ts)
+    buffer.commit(slot)
+
+
+class TestNearestFrame:
+    def test_acquire_nearest_drops_older_frames(self):
+        """Тест: берётся кадр, ближайший по времени, более старые отбрасываются как вытесненные"""
+        buffer = FrameRingBuffer(4, (2, 2))
+        for capture_ts in (1.00, 1.03, 1.06):
+            _commit(buffer, capture_ts)
+
+        slot = buffer.acquire_nearest(1.04)
+
+        assert slot.record.capture_ts == 1.03
+        assert buffer.stats.stale == 1
+        assert buffer.occupancy == 1
+
+    def test_frame_set_matches_nearest_timestamps(self):
+        """Тест: опорное время - самый поздний момент, до которого есть кадры всех камер"""
+        buffers = {0: FrameRingBuffer(4, (2, 2)), 1: FrameRingBuffer(4, (2, 2))}
+        for capture_ts in (1.00, 1.033, 1.066):
+            _commit(buffers[0], capture_ts)
+        for capture_ts in (1.01, 1.04):
+            _commit(buffers[1], capture_ts)
+
+        frame_set = FrameSynchronizer(buffers).acquire(timeout=0.1)
+
+        assert frame_set.slots[0].record.capture_ts == 1.033
+        assert frame_set.slots[1].record.capture_ts == 1.04
+        assert frame_set.skew == pytest.approx(0.007)
+        frame_set.release()
+        assert buffers[0].occupancy == 1 and buffers[1].occupancy == 0
+
+    def test_frame_set_rebuilt_after_capture_race(self):
+        """Тест: если кадр вытеснен захватом во время сборки, набор собирается заново, а не считается таймаутом"""
+        buffers = {0: FrameRingBuffer(4, (2, 2)), 1: FrameRingBuffer(4, (2, 2))}
+        for capture_ts in (1.00, 1.033, 1.066):
+            _commit(buffers[0], capture_ts)
+        _commit(buffers[1], 1.04)
+        acquire_nearest = buffers[1].acquire_nearest
+        calls = []
+
+        def racing_acquire_nearest(timestamp):
+            # Первая попытка проигрывает гонку с захватом
+            calls.append(timestamp)
+            return None if len(calls) == 1 else acquire_nearest(timestamp)
+
+        buffers[1].acquire_nearest = racing_acquire_nearest
+
+        frame_set = FrameSynchronizer(buffers).acquire(timeout=0.5)
+
+        assert frame_set is not None and len(calls) == 2
+        assert frame_set.slots[0].record.capture_ts == 1.066
+        assert frame_set.slots[1].record.capture_ts == 1.04
+        frame_set.release()
+
+
+class TestCameraManager:
+    def test_scheduler_bounds_threads_and_feeds_every_camera(self, multi_camera_config):
+        """Тест: четыре камеры захватываются двумя потоками, у каждой свой буфер"""
+        manager = CameraManager(multi_camera_config)
+        shutdown_event = threading.Event()
+        thread = threading.Thread(target=manager.start_capture, args=(shutdown_event,), daemon=True)
+        thread.start()
+        try:
+            frame_set = manager.get_frame_set(timeout=2.0)
+            assert sorted(frame_set.slots) == [0, 1, 2, 3]
+            assert frame_set.skew < 0.1
+            frame_set.release()
+            time.sleep(0.1)
+        finally:
+            shutdown_event.set()
+            thread.join(timeout=2.0)
+            manager.stop_capture()
+
+        assert len(manager.scheduler.threads) == 2
+        for camera_index in manager.camera_indices:
+            assert manager.get_frame_buffer(camera_index).stats.produced > 0
+
+    def test_unknown_camera(self, multi_camera_config):
+        """Тест: запрос буфера несуществующей камеры"""
+        with pytest.raises(CameraError):
+            CameraManager(multi_camera_config).get_frame_buffer(7)
+
+    @pytest.mark.parametrize("indices", ["0,1,0", "0,-1"])
+    def test_invalid_camera_indices(self, mock_env, monkeypatch, indices):
+        """Тест: повторяющиеся и отрицательные номера камер отклоняются"""
+        monkeypatch.setenv("CAMERA_INDICES", indices)
+        with pytest.raises(ConfigurationError):
+            Config()
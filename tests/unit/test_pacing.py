@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from src.camera.pacing import FramePacer
+from src.exceptions import ConfigurationError
+
+
+class TestFramePacer:
+    @pytest.mark.parametrize("mode", ["sleep", "hybrid"])
+    def test_no_accumulated_drift(self, mode):
+        """Тест: длительность серии кадров определяется дедлайнами, а не ошибкой сна"""
+        pacer = FramePacer(200, mode=mode)
+        start = time.perf_counter()
+        for _ in range(41):
+            pacer.wait()
+        elapsed = time.perf_counter() - start
+
+        # 40 интервалов по 5 мс
+        assert 0.195 <= elapsed < 0.26
+
+    def test_skips_missed_deadlines_after_stall(self):
+        """Тест: после задержки расписание сдвигается без серии догоняющих кадров"""
+        pacer = FramePacer(100)
+        pacer.wait()
+        time.sleep(0.055)
+        pacer.wait()
+        start = time.perf_counter()
+        pacer.wait()
+
+        assert pacer.missed_deadlines >= 4
+        assert time.perf_counter() - start > 0.002
+
+    def test_jitter_stats(self):
+        """Тест статистики интервалов между кадрами"""
+        pacer = FramePacer(100, mode="hybrid")
+        assert pacer.jitter_stats()["count"] == 0
+
+        for _ in range(6):
+            pacer.wait()
+        stats = pacer.jitter_stats()
+
+        assert stats["count"] == 5
+        assert stats["target"] == pytest.approx(10.0)
+        assert stats["p50"] <= stats["p99"] <= stats["max"]
+        assert stats["p50"] == pytest.approx(10.0, abs=3.0)
+
+    def test_invalid_mode(self):
+        """Тест ошибки для неизвестного режима"""
+        with pytest.raises(ConfigurationError):
+            FramePacer(30, mode="busy")
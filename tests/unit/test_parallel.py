@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from src.benchmark import measure_tiled_speedup
+from src.filters.base import FilterFactory
+from src.filters.parallel import TiledFilter, split_bands
+from src.filters.pipeline import FilterPipeline
+from src.filters import blur, brightness, gamma, sharpen  # noqa: F401  регистрация фильтров
+
+
+@pytest.fixture
+def noise_frame():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (301, 160, 3), dtype=np.uint8)
+
+
+class TestSplitBands:
+    def test_bands_cover_frame_with_halo(self):
+        """Тест: полосы покрывают кадр без пропусков, вход расширен на halo в пределах кадра"""
+        bands = split_bands(100, 3, 4)
+
+        assert [(out_start, out_stop) for _, _, out_start, out_stop in bands] == [(0, 33), (33, 66), (66, 100)]
+        assert bands[0][:2] == (0, 37)
+        assert bands[1][:2] == (29, 70)
+        assert bands[2][:2] == (62, 100)
+
+
+class TestTiledFilter:
+    @pytest.mark.parametrize("name,intensity", [("blur", 1.0), ("blur", 0.3), ("sharpen", 0.7), ("gamma", 0.9)])
+    @pytest.mark.parametrize("workers", [2, 3, 8])
+    def test_bit_identical_to_single_thread(self, name, intensity, workers, noise_frame):
+        """Тест: результат по полосам побитно совпадает с обработкой целого кадра"""
+        expected = FilterFactory.create(name, intensity).apply(noise_frame)
+        tiled = TiledFilter(FilterFactory.create(name, intensity), workers, min_band_rows=8)
+
+        result = tiled.apply_into(noise_frame, np.empty_like(noise_frame))
+
+        assert len(tiled._bands) == workers
+        assert np.array_equal(result, expected)
+
+    def test_fused_pipeline_tiled(self, noise_frame):
+        """Тест: объединённые этапы тоже выполняются по полосам без изменения результата"""
+        names = ["blur", "sharpen", "brightness"]
+        expected = FilterPipeline.from_names(names, 0.6, fuse=True).apply(noise_frame).copy()
+
+        pipeline = FilterPipeline.from_names(names, 0.6, fuse=True, tiled=["*"], tile_workers=4)
+
+        assert all(isinstance(image_filter, TiledFilter) for image_filter in pipeline.filters)
+        assert np.array_equal(pipeline.apply(noise_frame), expected)
+
+    def test_speedup_report(self):
+        """Тест: отчёт об ускорении содержит строку на каждое число исполнителей"""
+        report = measure_tiled_speedup("blur", 320, 240, worker_counts=(1, 2), iterations=2, warmup=1)
+
+        assert [row["workers"] for row in report] == [1, 2]
+        assert all(row["identical"] and row["speedup"] > 0 for row in report)
@@ -0,0 +1,68 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.filters.base import FilterFactory
+from src.filters.pipeline import FilterPipeline
+from src.filters.planner import plan_resize
+from src.filters import blur, brightness, sharpen  # noqa: F401  регистрация фильтров
+
+
+@pytest.fixture
+def smooth_frame():
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(noise, (9, 9), 0)
+
+
+def _filters(names, intensity=0.7):
+    return [FilterFactory.create(name, intensity) for name in names]
+
+
+class TestPlanResize:
+    def test_downscale_moves_before_commuting_filters(self):
+        """Тест: уменьшение переносится через фильтры с конца цепочки, пока они перестановочны"""
+        before, after = plan_resize(_filters(["sharpen", "blur", "brightness"]), 0.5)
+
+        assert [f.name for f in before] == ["sharpen"]
+        assert [f.name for f in after] == ["blur", "brightness"]
+        assert after[0].kernel_radius == FilterFactory.create("blur", 0.7).kernel_radius // 2
+
+    @pytest.mark.parametrize("scale, mode", [(0.5, "strict"), (2.0, "auto"), (1.0, "auto")])
+    def test_keeps_order(self, scale, mode):
+        """Тест: в строгом режиме и без уменьшения кадра порядок не меняется"""
+        before, after = plan_resize(_filters(["blur", "brightness"]), scale, mode)
+
+        assert [f.name for f in before] == ["blur", "brightness"] and after == []
+
+
+class TestResizeAwarePipeline:
+    def test_strict_matches_filter_then_resize(self, smooth_frame):
+        """Тест: строгий режим совпадает с фильтрацией в полном разрешении и последующим масштабированием"""
+        expected = FilterFactory.create("blur", 0.7).apply(smooth_frame)
+        expected = cv2.resize(expected, (80, 60), interpolation=cv2.INTER_LINEAR)
+
+        result = FilterPipeline.from_names(["blur"], 0.7, output_scale=0.5, resize_mode="strict").apply(smooth_frame)
+
+        assert np.array_equal(result, expected)
+
+    def test_auto_filters_at_output_resolution(self, smooth_frame):
+        """Тест: автоматический режим фильтрует уменьшенный кадр, результат близок к строгому"""
+        strict = FilterPipeline.from_names(["blur", "brightness"], 0.7, output_scale=0.5, resize_mode="strict")
+        auto = FilterPipeline.from_names(["blur", "brightness"], 0.7, output_scale=0.5)
+
+        assert auto.filters == [] and auto.post is not None
+        expected = strict.apply(smooth_frame).astype(np.int16)
+        result = auto.apply(smooth_frame).astype(np.int16)
+        assert result.shape == (60, 80, 3)
+        assert np.abs(result - expected).mean() < 2.0
+
+    def test_reuses_resize_buffer(self, smooth_frame):
+        """Тест: буфер масштабирования выделяется один раз"""
+        pipeline = FilterPipeline.from_names(["none"], output_scale=0.5)
+        pipeline.prepare(smooth_frame.shape, smooth_frame.dtype)
+        buffer = pipeline._resized
+
+        assert pipeline.apply(smooth_frame) is buffer
+        assert pipeline.apply(smooth_frame) is buffer
+        assert not pipeline.is_passthrough
@@ -0,0 +1,115 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.camera.backpressure import BlockPolicy
+from src.camera.buffer import FrameRingBuffer
+from src.config import Config
+from src.exceptions import ConfigurationError, ProcessingError
+from src.filters.base import FilterFactory
+from src.processing.stage import ProcessingStage
+from src.filters import blur, temporal  # noqa: F401  регистрация фильтров
+
+
+@pytest.fixture
+def processing_config(test_config):
+    test_config.processing_workers = 2
+    test_config.processing_depth = 3
+    test_config.processing_order = "strict"
+    test_config.filter_chain = ["blur"]
+    return test_config
+
+
+def _make_frame(value):
+    """Кадр с номером в пикселе [0, 0] и плавным градиентом"""
+    frame = np.repeat(np.tile(np.arange(64, dtype=np.uint8), (48, 1))[..., None], 3, axis=2)
+    frame[0, 0] = value * 10
+    return frame
+
+
+def _feed(buffer, count, shutdown_event):
+    for value in range(count):
+        slot = None
+        while slot is None and not shutdown_event.is_set():
+            slot = buffer.acquire_write()
+        slot.frame[:] = _make_frame(value)
+        slot.record.begin(value, time.perf_counter())
+        buffer.commit(slot)
+
+
+def _collect(stage, count, timeout=60.0):
+    received = []
+    deadline = time.monotonic() + timeout
+    while len(received) < count and time.monotonic() < deadline:
+        slot = stage.acquire_read(timeout=0.1)
+        if slot is None:
+            continue
+        received.append((slot.record.sequence, slot.frame.copy()))
+        stage.release(slot)
+    return received
+
+
+class TestReorderBuffer:
+    def test_strict_order_skips_lost_frames(self, processing_config):
+        """Тест: в режиме strict кадры выдаются по порядку, потерянный кадр не задерживает следующие"""
+        stage = ProcessingStage(processing_config)
+        stage._complete(1, 11)
+        stage._complete(2, 12)
+        assert list(stage._ready) == []
+
+        stage._complete(0, None)
+
+        assert list(stage._ready) == [11, 12]
+        assert stage.failed == 1
+
+    def test_reorder_mode_emits_immediately(self, processing_config):
+        """Тест: в режиме reorder кадры выдаются по мере готовности"""
+        processing_config.processing_order = "reorder"
+        stage = ProcessingStage(processing_config)
+        stage._complete(2, 12)
+        stage._complete(0, 10)
+
+        assert list(stage._ready) == [12, 10]
+
+
+class TestStatefulFilters:
+    def test_stateful_filters_rejected_with_several_workers(self, processing_config, mock_env, monkeypatch):
+        """Тест: фильтр с состоянием нельзя распределить между несколькими исполнителями"""
+        stage = ProcessingStage(processing_config)
+        with pytest.raises(ProcessingError):
+            stage.set_filters(["temporal"])
+        assert stage.filter_names == ("blur",)
+
+        monkeypatch.setenv("PROCESSING_WORKERS", "2")
+        monkeypatch.setenv("FILTER_CHAIN", "temporal")
+        with pytest.raises(ConfigurationError):
+            Config()
+        monkeypatch.setenv("PROCESSING_WORKERS", "1")
+        assert Config().filter_chain == ["temporal"]
+
+
+class TestProcessingStage:
+    def test_frames_filtered_in_capture_order_and_worker_restart(self, processing_config):
+        """Тест: исполнители фильтруют кадры по порядку захвата; упавший исполнитель перезапускается"""
+        shutdown_event = threading.Event()
+        source = FrameRingBuffer(4, (48, 64, 3), policy=BlockPolicy(timeout=None))
+        stage = ProcessingStage(processing_config)
+        stage.start(source, shutdown_event)
+        producer = threading.Thread(target=_feed, args=(source, 12, shutdown_event), daemon=True)
+        producer.start()
+        try:
+            first = _collect(stage, 6)
+            stage._workers[0].process.kill()
+            rest = _collect(stage, 6)
+        finally:
+            shutdown_event.set()
+            stage.stop()
+
+        received = first + rest
+        assert [sequence for sequence, _ in received] == list(range(12))
+        image_filter = FilterFactory.create("blur", processing_config.filter_intensity)
+        for sequence, frame in received:
+            assert np.array_equal(frame, image_filter.apply(_make_frame(sequence)))
+        assert stage.restarts == 1
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from src.display.commands import CommandChannel
+from src.display.quality import QUALITY_LEVELS, QualityController
+from src.display.sink import NullSink
+from src.display.window import DisplayWindow
+from src.filters.blur import BlurFilter  # noqa: F401  регистрация фильтра blur
+
+
+def _feed(controller, seconds, frames):
+    changes = 0
+    for _ in range(frames):
+        changes += controller.observe(seconds)
+    return changes
+
+
+class TestQualityController:
+    def test_degrades_step_by_step_under_load(self):
+        """Тест: при перегрузке уровень повышается по одному шагу не чаще раза в hold_frames кадров"""
+        controller = QualityController(fps=100, hold_frames=5)
+
+        assert _feed(controller, 0.02, 4) == 0
+        assert _feed(controller, 0.02, 1) == 1
+        assert controller.level == 1
+        _feed(controller, 0.02, 100)
+        assert controller.level == len(QUALITY_LEVELS) - 1
+
+    def test_hysteresis_between_watermarks(self):
+        """Тест: между порогами уровень не меняется"""
+        controller = QualityController(fps=100, hold_frames=5, smoothing=1.0)
+        _feed(controller, 0.02, 5)
+        assert controller.level == 1
+
+        assert _feed(controller, 0.0075, 200) == 0
+        assert controller.level == 1
+
+    def test_recovers_after_sustained_headroom(self):
+        """Тест: восстановление требует запаса в течение втрое большего числа кадров"""
+        controller = QualityController(fps=100, hold_frames=5, smoothing=1.0)
+        _feed(controller, 0.02, 10)
+        assert controller.level == 2
+
+        assert _feed(controller, 0.001, 14) == 0
+        assert _feed(controller, 0.001, 1) == 1
+        assert controller.level == 1
+
+
+class TestAdaptiveDisplay:
+    @pytest.fixture
+    def display(self, mock_env, monkeypatch):
+        monkeypatch.setenv("ADAPTIVE_QUALITY", "true")
+        monkeypatch.setenv("FILTER_CHAIN", "blur")
+        from src.config import Config
+        return DisplayWindow(Config(), [NullSink()], CommandChannel())
+
+    def test_degraded_levels_keep_frame_shape(self, display):
+        """Тест: на каждом уровне кадр фильтруется упрощённой цепочкой и сохраняет размер"""
+        frame = np.random.default_rng(0).integers(0, 255, (48, 64, 3), dtype=np.uint8)
+        full = display._apply_filters(frame).copy()
+
+        for level in range(1, len(QUALITY_LEVELS)):
+            display.quality.level = level
+            display._set_quality_pipeline()
+            output = display._apply_filters(frame)
+            assert output.shape == frame.shape
+            assert display._degraded_filter.filters[0].intensity == pytest.approx(0.25)
+
+        assert not np.array_equal(output, full)
+
+    def test_skipped_pass_repeats_last_output(self, display):
+        """Тест: на уровне с пропуском проходов фильтр применяется к каждому второму кадру"""
+        display.quality.level = len(QUALITY_LEVELS) - 1
+        display._set_quality_pipeline()
+        first = display._apply_filters(np.zeros((48, 64, 3), dtype=np.uint8)).copy()
+        repeated = display._apply_filters(np.full((48, 64, 3), 200, dtype=np.uint8)).copy()
+        fresh = display._apply_filters(np.full((48, 64, 3), 200, dtype=np.uint8))
+
+        assert np.array_equal(repeated, first)
+        assert fresh[0, 0, 0] == 200
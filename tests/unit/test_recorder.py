@@ -0,0 +1,118 @@
+import os
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from src.config import Config
+from src.display.recorder import RecorderSink
+from src.display.sink import create_sinks
+from src.display.commands import CommandChannel
+from src.exceptions import ConfigurationError
+
+
+def _frame(value, width=64, height=48):
+    return np.full((height, width, 3), value, dtype=np.uint8)
+
+
+class TestRecorderSink:
+    def test_records_frames_to_segment(self, tmp_path):
+        """Тест записи кадров в сегмент: после close() все кадры закодированы и файл читается"""
+        sink = RecorderSink(str(tmp_path), "MJPG", "avi", fps=10)
+        sink.open()
+        for value in range(5):
+            sink.write(_frame(value * 40))
+        sink.close()
+
+        assert sink.frames_written == 5
+        assert len(sink.segments) == 1
+        capture = cv2.VideoCapture(sink.segments[0])
+        assert int(capture.get(cv2.CAP_PROP_FRAME_COUNT)) == 5
+        capture.release()
+        assert sink.bytes_written == os.path.getsize(sink.segments[0])
+
+    def test_rotates_on_frame_shape_change(self, tmp_path):
+        """Тест ротации сегмента при смене размера кадра"""
+        sink = RecorderSink(str(tmp_path), "MJPG", "avi", fps=10)
+        sink.open()
+        sink.write(_frame(0))
+        sink.write(_frame(1))
+        sink.write(_frame(2, width=32))
+        sink.close()
+
+        assert sink.frames_written == 3
+        assert len(sink.segments) == 2
+
+    def test_rotates_by_size(self, tmp_path):
+        """Тест ротации по размеру: закрытые сегменты не меньше заданного предела"""
+        limit = 1024 * 1024
+        sink = RecorderSink(str(tmp_path), "MJPG", "avi", fps=10, segment_seconds=0, segment_bytes=limit)
+        sink.open()
+        rng = np.random.default_rng(0)
+        for _ in range(40):
+            sink.write(rng.integers(0, 255, (240, 320, 3), dtype=np.uint8))
+        sink.close()
+
+        assert sink.frames_written == 40
+        assert len(sink.segments) >= 2
+        assert all(os.path.getsize(path) >= limit for path in sink.segments[:-1])
+        assert sink.bytes_written == sum(os.path.getsize(path) for path in sink.segments)
+
+    def test_slow_disk_drops_frames_instead_of_blocking(self, tmp_path):
+        """Тест: если запись не успевает, write() не ждёт, а лишние кадры отбрасываются"""
+        sink = RecorderSink(str(tmp_path), "MJPG", "avi", fps=10, queue_size=2)
+        unblock = threading.Event()
+        encode = sink._encode
+        sink._encode = lambda frame, timestamp: (unblock.wait(), encode(frame, timestamp))
+        sink.open()
+
+        for value in range(10):
+            sink.write(_frame(value))
+
+        assert sink.frame_buffer.stats.dropped >= 7
+        unblock.set()
+        sink.close()
+        assert sink.frames_written == 10 - sink.frame_buffer.stats.dropped
+
+    def test_writer_open_failure_disables_recorder(self, tmp_path, monkeypatch):
+        """Тест: если сегмент не открывается, запись отключается без повторных попыток на каждом кадре"""
+        attempts = []
+
+        class FailingWriter:
+            def __init__(self, *args):
+                attempts.append(args[0])
+
+            def isOpened(self):
+                return False
+
+            def release(self):
+                pass
+
+        monkeypatch.setattr("src.display.recorder.cv2.VideoWriter", FailingWriter)
+        sink = RecorderSink(str(tmp_path), "MJPG", "avi", fps=10)
+        sink.open()
+        for value in range(10):
+            sink.write(_frame(value))
+        sink.close()
+        sink.write(_frame(10))
+
+        assert len(attempts) == 1 and sink.failed
+        assert sink.frames_written == 0 and sink.segments == []
+
+    def test_created_from_config(self, mock_env, monkeypatch, tmp_path):
+        """Тест создания приёмника записи по настройкам"""
+        monkeypatch.setenv("OUTPUT_SINKS", "null,recorder")
+        monkeypatch.setenv("RECORD_PATH", str(tmp_path))
+        monkeypatch.setenv("RECORD_SEGMENT_MB", "2")
+        sinks = create_sinks(Config(), CommandChannel())
+
+        recorder = sinks[1]
+        assert isinstance(recorder, RecorderSink)
+        assert recorder.segment_bytes == 2 * 1024 * 1024
+
+    def test_invalid_codec(self, mock_env, monkeypatch):
+        """Тест проверки кода FourCC"""
+        monkeypatch.setenv("RECORD_CODEC", "h264x")
+        with pytest.raises(ConfigurationError):
+            Config()
@@ -0,0 +1,213 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.camera.capture import CameraCapture
+from src.config import Config
+from src.display.commands import CommandChannel
+from src.display.sink import SharedMemorySink, create_sinks
+from src.exceptions import ConfigurationError, ExportError
+from src.utils.shared_ring import SharedFrameReader, SharedFrameRing
+
+
+@pytest.fixture
+def ring_name():
+    return f"test_ring_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture
+def ring(ring_name):
+    ring = SharedFrameRing(ring_name, slots=4, capacity=4 * 4 * 3)
+    yield ring
+    ring.close()
+
+
+def _frame(value):
+    return np.full((4, 4, 3), value, dtype=np.uint8)
+
+
+class TestSharedFrameRing:
+    def test_reader_gets_read_only_views_with_header(self, ring):
+        """Тест: читатель получает кадр без копирования с номером, временем, формой и типом"""
+        with SharedFrameReader(ring.name) as reader:
+            ring.publish(_frame(7), sequence=42, timestamp=1.5)
+
+            shared = reader.read_next()
+
+            assert shared.frame.shape == (4, 4, 3) and shared.frame.dtype == np.uint8
+            assert shared.frame[0, 0, 0] == 7 and (shared.sequence, shared.timestamp) == (42, 1.5)
+            assert not shared.frame.flags.writeable and not shared.frame.flags.owndata
+            assert reader.read_next() is None
+            del shared
+
+    def test_slow_reader_skips_overwritten_frames(self, ring):
+        """Тест: отставший больше чем на кольцо читатель перескакивает к самому старому доступному кадру"""
+        with SharedFrameReader(ring.name) as reader:
+            for value in range(10):
+                ring.publish(_frame(value), sequence=value)
+            assert reader.lag == 10
+
+            values = []
+            while (shared := reader.read_next()) is not None:
+                values.append(int(shared.frame[0, 0, 0]))
+            del shared
+
+            assert values == [7, 8, 9]
+            assert reader.dropped == 7 and reader.lag == 0
+
+    def test_overwritten_frame_is_invalid(self, ring):
+        """Тест: кадр, слот которого производитель перезаписал, обнаруживается как разорванный"""
+        with SharedFrameReader(ring.name) as reader:
+            ring.publish(_frame(1), sequence=1)
+            shared = reader.read_next()
+            assert reader.is_valid(shared)
+
+            for value in range(2, 6):
+                ring.publish(_frame(value), sequence=value)
+
+            assert not reader.is_valid(shared)
+            assert reader.read(shared.index) is None
+            del shared
+
+    def test_latest_and_oversized_frames(self, ring):
+        """Тест: latest() возвращает самый новый кадр, кадр больше слота не публикуется"""
+        with SharedFrameReader(ring.name) as reader:
+            for value in range(3):
+                ring.publish(_frame(value), sequence=value)
+            assert not ring.publish(np.zeros((8, 8, 3), np.uint8), sequence=99)
+
+            shared = reader.latest()
+
+            assert shared.frame[0, 0, 0] == 2 and reader.dropped == 2
+            assert ring.oversized == 1
+            del shared
+
+    def test_live_ring_is_not_replaced(self, ring):
+        """Тест: кольцо с тем же именем, владелец которого работает, не удаляется"""
+        ring.publish(_frame(6), sequence=1)
+        with pytest.raises(ExportError):
+            SharedFrameRing(ring.name, slots=4, capacity=4 * 4 * 3)
+
+        with SharedFrameReader(ring.name) as reader:
+            shared = reader.latest()
+            assert shared.frame[0, 0, 0] == 6
+            del shared
+
+    def test_stale_ring_of_dead_process_is_replaced(self, ring_name):
+        """Тест: блок, оставшийся от завершившегося процесса, пересоздаётся"""
+        dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+        stale = SharedFrameRing(ring_name, slots=2, capacity=8)
+        stale._layout.header["writer_pid"] = int(dead.stdout)
+        stale._layout.release()
+
+        ring = SharedFrameRing(ring_name, slots=4, capacity=4 * 4 * 3)
+        try:
+            assert ring.publish(_frame(1), sequence=1)
+        finally:
+            ring.close()
+
+    def test_missing_ring(self, ring_name):
+        """Тест: подключение к несуществующему кольцу"""
+        with pytest.raises(ExportError):
+            SharedFrameReader(ring_name)
+
+    def test_reader_in_other_process(self, ring):
+        """Тест: читатель в другом процессе видит кадры, а его завершение не удаляет кольцо владельца"""
+        ring.publish(_frame(3), sequence=1)
+        script = (
+            "import sys\n"
+            "from src.utils.shared_ring import SharedFrameReader\n"
+            "reader = SharedFrameReader(sys.argv[1])\n"
+            "shared = reader.latest()\n"
+            "print(int(shared.frame[0, 0, 0]), shared.sequence, reader.is_valid(shared))\n"
+            "del shared\n"
+            "reader.close()\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script, ring.name],
+            cwd=Path(__file__).resolve().parents[2], capture_output=True, text=True, timeout=30
+        )
+
+        assert result.stdout.split() == ["3", "1", "True"], result.stderr
+        ring.publish(_frame(4), sequence=2)
+        with SharedFrameReader(ring.name) as reader:
+            shared = reader.latest()
+            assert shared.frame[0, 0, 0] == 4
+            del shared
+
+
+class TestFrameExport:
+    def test_capture_exports_raw_frames(self, mock_env, monkeypatch, ring_name):
+        """Тест: захват с SHM_EXPORT=raw публикует каждый кадр с номером захвата"""
+        monkeypatch.setenv("FRAME_SOURCE", "synthetic")
+        monkeypatch.setenv("SHM_EXPORT", "raw")
+        monkeypatch.setenv("SHM_NAME", ring_name)
+        capture = CameraCapture(Config())
+        capture.initialize()
+        capture._read_frame()
+
+        with SharedFrameReader(f"{ring_name}_raw_0") as reader:
+            capture._read_frame()
+            shared = reader.read_next()
+            buffer = capture.get_frame_buffer()
+            buffer.release(buffer.acquire_read(timeout=0))
+            slot = buffer.acquire_read(timeout=0)
+            assert shared.sequence == 2 and np.array_equal(shared.frame, slot.frame)
+            del shared
+        capture.stop_capture()
+
+    def test_stop_during_export(self, mock_env, monkeypatch, ring_name):
+        """Тест: остановка захвата из другого потока не прерывает публикацию кадра ошибкой"""
+        monkeypatch.setenv("FRAME_SOURCE", "synthetic")
+        monkeypatch.setenv("SOURCE_REALTIME", "false")
+        monkeypatch.setenv("SHM_EXPORT", "raw")
+        monkeypatch.setenv("SHM_NAME", ring_name)
+        capture = CameraCapture(Config())
+        capture.initialize()
+        errors = []
+
+        def run():
+            try:
+                capture.start_capture(threading.Event())
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        while capture.frame_export is None or capture.frame_export.published < 20:
+            time.sleep(0.001)
+        capture.stop_capture()
+        thread.join(timeout=5.0)
+
+        assert not thread.is_alive() and errors == []
+        assert capture.frame_export is None
+
+    def test_filtered_export_sink(self, mock_env, monkeypatch, ring_name):
+        """Тест: SHM_EXPORT=filtered добавляет приёмник, публикующий обработанные кадры"""
+        monkeypatch.setenv("OUTPUT_SINKS", "null")
+        monkeypatch.setenv("SHM_EXPORT", "filtered")
+        monkeypatch.setenv("SHM_NAME", ring_name)
+        sinks = create_sinks(Config(), CommandChannel())
+        sink = sinks[-1]
+        assert isinstance(sink, SharedMemorySink)
+
+        sink.write(_frame(5))
+        with SharedFrameReader(f"{ring_name}_filtered") as reader:
+            shared = reader.latest()
+            assert shared.frame[0, 0, 0] == 5 and shared.sequence == 1
+            del shared
+        sink.close()
+
+    def test_raw_export_requires_read_mode(self, mock_env, monkeypatch):
+        """Тест: в режиме grab кадр не декодируется в потоке захвата и не может быть экспортирован"""
+        monkeypatch.setenv("SHM_EXPORT", "raw")
+        monkeypatch.setenv("CAPTURE_MODE", "grab")
+        with pytest.raises(ConfigurationError):
+            Config()
@@ -0,0 +1,105 @@
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from src.camera.capture import CameraCapture
+from src.camera.source import ImageSequenceSource, SyntheticSource, VideoFileSource
+from src.config import Config
+from src.exceptions import CameraError
+
+
+class TestSyntheticSource:
+    @pytest.mark.parametrize("pattern", ["gradient", "noise"])
+    def test_frames_are_deterministic(self, pattern):
+        """Тест: одинаковые параметры дают одинаковую последовательность кадров"""
+        first = SyntheticSource(320, 240, pattern=pattern, seed=3)
+        second = SyntheticSource(320, 240, pattern=pattern, seed=3)
+        first.open()
+        second.open()
+
+        for _ in range(5):
+            ok_a, frame_a = first.read()
+            ok_b, frame_b = second.read()
+            assert ok_a and ok_b
+            assert np.array_equal(frame_a, frame_b)
+
+        assert frame_a.shape == (240, 320, 3)
+
+    def test_read_into_buffer(self):
+        """Тест генерации кадра в переданный буфер"""
+        source = SyntheticSource(64, 48)
+        source.open()
+        buffer = np.zeros((48, 64, 3), dtype=np.uint8)
+        frames = [source.read(image=buffer)[1] for _ in range(3)]
+
+        assert all(frame is buffer for frame in frames)
+        assert buffer[0, 0, 0] == 2
+
+
+class TestFileSources:
+    def test_image_sequence_loops(self, tmp_path):
+        """Тест чтения каталога изображений по порядку с зацикливанием"""
+        for index in range(3):
+            cv2.imwrite(str(tmp_path / f"{index:03d}.png"), np.full((8, 8, 3), index * 10, dtype=np.uint8))
+
+        source = ImageSequenceSource(str(tmp_path), loop=True)
+        source.open()
+        values = [int(source.read()[1][0, 0, 0]) for _ in range(4)]
+
+        assert values == [0, 10, 20, 0]
+
+    def test_image_sequence_without_loop_ends(self, tmp_path):
+        """Тест окончания последовательности без зацикливания"""
+        cv2.imwrite(str(tmp_path / "only.png"), np.zeros((8, 8, 3), dtype=np.uint8))
+        source = ImageSequenceSource(str(tmp_path), loop=False)
+        source.open()
+
+        assert source.read()[0] and not source.exhausted
+        assert source.read() == (False, None)
+        assert source.exhausted
+
+    def test_video_file_loops(self, tmp_path):
+        """Тест зацикливания видеофайла"""
+        path = str(tmp_path / "clip.avi")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (32, 24))
+        for _ in range(3):
+            writer.write(np.zeros((24, 32, 3), dtype=np.uint8))
+        writer.release()
+
+        source = VideoFileSource(path, loop=True, realtime=False)
+        source.open()
+
+        assert all(source.read()[0] for _ in range(7))
+        assert source.fps is None
+        source.release()
+
+    def test_capture_ends_with_non_looping_file(self, mock_env, monkeypatch, tmp_path):
+        """Тест: захват незацикленного файла без реального времени завершается сам в конце файла"""
+        path = tmp_path / "clip.avi"
+        writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10, (32, 24))
+        for _ in range(5):
+            writer.write(np.zeros((24, 32, 3), dtype=np.uint8))
+        writer.release()
+        monkeypatch.setenv("FRAME_SOURCE", "video")
+        monkeypatch.setenv("SOURCE_PATH", str(path))
+        monkeypatch.setenv("SOURCE_LOOP", "false")
+        monkeypatch.setenv("SOURCE_REALTIME", "false")
+        capture = CameraCapture(Config())
+        capture.initialize()
+
+        thread = threading.Thread(target=capture.start_capture, args=(threading.Event(),))
+        thread.start()
+        thread.join(timeout=5.0)
+
+        assert not thread.is_alive() and not capture.is_capturing
+        assert capture.camera.exhausted and capture.frame_sequence == 5
+        capture.stop_capture()
+
+    def test_missing_paths(self, tmp_path):
+        """Тест ошибок для отсутствующих файлов"""
+        with pytest.raises(CameraError):
+            VideoFileSource(str(tmp_path / "missing.avi")).open()
+        with pytest.raises(CameraError):
+            ImageSequenceSource(str(tmp_path)).open()
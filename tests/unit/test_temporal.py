@@ -0,0 +1,117 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.filters.base import FilterFactory
+from src.filters.denoise import DenoiseFilter
+from src.filters.pipeline import FilterPipeline
+from src.filters.temporal import TemporalFilter
+from src.filters import blur  # noqa: F401  регистрация фильтров
+
+
+@pytest.fixture
+def clean_frame():
+    rng = np.random.default_rng(0)
+    texture = cv2.GaussianBlur(rng.integers(0, 256, (90, 160, 3), dtype=np.uint8), (15, 15), 0)
+    return cv2.normalize(texture, None, 40, 210, cv2.NORM_MINMAX)
+
+
+def _noisy(frame, rng, sigma=12.0):
+    noise = rng.normal(0.0, sigma, frame.shape)
+    return np.clip(frame.astype(np.float32) + noise, 0, 255).astype(np.uint8)
+
+
+def _rms(frame, reference):
+    return float(np.sqrt(np.mean((frame.astype(np.float32) - reference.astype(np.float32)) ** 2)))
+
+
+def _run(image_filter, frames):
+    dst = np.empty_like(frames[0])
+    for frame in frames:
+        result = image_filter.apply_into(frame, dst)
+    return result
+
+
+class TestTemporalFilter:
+    @pytest.mark.parametrize("filter_class", [TemporalFilter, DenoiseFilter])
+    def test_reduces_noise_on_static_scene(self, filter_class, clean_frame):
+        """Тест: на неподвижной сцене шум снижается сильнее, чем размытием"""
+        rng = np.random.default_rng(1)
+        frames = [_noisy(clean_frame, rng) for _ in range(20)]
+        image_filter = filter_class(1.0)
+
+        result = _run(image_filter, frames)
+
+        blurred = FilterFactory.create("blur", 1.0).apply(frames[-1])
+        assert _rms(result, clean_frame) < 0.5 * _rms(frames[-1], clean_frame)
+        assert _rms(result, clean_frame) < _rms(blurred, clean_frame)
+        assert image_filter.resets == 1
+
+    def test_zero_intensity_is_identity(self):
+        """Тест: без интенсивности фильтр пропускается в цепочке"""
+        assert TemporalFilter(0.0).is_identity
+        assert not TemporalFilter(0.5).is_identity
+
+    def test_resets_on_resolution_change(self, clean_frame):
+        """Тест: при смене разрешения накопитель пересоздаётся и первый кадр проходит без изменений"""
+        image_filter = TemporalFilter(1.0)
+        _run(image_filter, [clean_frame] * 3)
+
+        small = cv2.resize(clean_frame, (80, 45))
+        result = image_filter.apply(small)
+
+        np.testing.assert_array_equal(result, small)
+        assert image_filter.resets == 2
+
+    def test_resets_on_scene_cut(self, clean_frame):
+        """Тест: резкая смена сцены не смешивается с историей"""
+        image_filter = TemporalFilter(1.0)
+        _run(image_filter, [clean_frame] * 5)
+
+        cut = clean_frame // 4  # Тёмная сцена
+        result = image_filter.apply(cut)
+
+        np.testing.assert_array_equal(result, cut)
+        assert image_filter.resets == 2
+
+    def test_reset_drops_history(self, clean_frame):
+        """Тест: после reset() следующий кадр заменяет накопитель"""
+        image_filter = TemporalFilter(1.0)
+        _run(image_filter, [clean_frame] * 3)
+        shifted = cv2.add(clean_frame, 10)
+
+        image_filter.reset()
+
+        np.testing.assert_array_equal(image_filter.apply(shifted), shifted)
+
+
+class TestDenoiseFilter:
+    def test_moving_object_leaves_no_trail(self, clean_frame):
+        """Тест: в области движения результат совпадает с новым кадром, а у temporal остаётся шлейф"""
+        background = [clean_frame.copy() for _ in range(6)]
+        moved = clean_frame.copy()
+        moved[30:60, 60:100] = 255
+
+        denoise, temporal = DenoiseFilter(1.0), TemporalFilter(1.0)
+        denoised = _run(denoise, background + [moved]).copy()
+        averaged = _run(temporal, background + [moved])
+
+        region = (slice(34, 56), slice(64, 96))
+        np.testing.assert_array_equal(denoised[region], moved[region])
+        assert averaged[region].mean() < 200
+        assert 0.0 < denoise.motion_ratio < 0.2
+
+
+class TestStatefulFilters:
+    def test_registered_and_not_shared(self):
+        """Тест: фильтры зарегистрированы, а общий кэш выдаёт каждой цепочке свой экземпляр"""
+        assert {"temporal", "denoise"} <= set(FilterFactory.get_available_filters())
+        assert FilterFactory.get("temporal", 0.5) is not FilterFactory.get("temporal", 0.5)
+        assert FilterFactory.get("blur", 0.5) is FilterFactory.get("blur", 0.5)
+
+    def test_pipeline_warmup_does_not_leak_into_history(self, clean_frame):
+        """Тест: пробный прогон нулевым кадром при подготовке не попадает в накопитель"""
+        pipeline = FilterPipeline.from_names(["temporal"], 1.0)
+        pipeline.prepare(clean_frame.shape, clean_frame.dtype)
+
+        np.testing.assert_array_equal(pipeline.apply(clean_frame), clean_frame)
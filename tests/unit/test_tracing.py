@@ -0,0 +1,60 @@
+import pytest
+
+from src.camera.buffer import FrameRingBuffer
+from src.display.sink import CallbackSink
+from src.display.window import DisplayWindow
+from src.utils.tracing import FrameRecord, LatencyHistogram, LatencyTracer
+
+
+class TestLatencyHistogram:
+    def test_percentiles(self):
+        """Тест оценки перцентилей по корзинам"""
+        histogram = LatencyHistogram()
+        for _ in range(99):
+            histogram.observe(0.001)
+        histogram.observe(0.1)
+
+        assert histogram.percentile(50) == pytest.approx(0.001, rel=0.25)
+        assert histogram.percentile(100) == pytest.approx(0.1, rel=0.25)
+        assert histogram.max == 0.1
+
+
+class TestLatencyTracer:
+    def test_stage_breakdown(self):
+        """Тест разбиения задержки по этапам"""
+        record = FrameRecord()
+        record.begin(1, 10.0)
+        record.dequeue_ts = 10.004
+        record.filter_ts = 10.006
+        record.present_ts = 10.007
+
+        tracer = LatencyTracer(report_interval=60.0)
+        tracer.observe(record)
+        summary = tracer.summary()
+
+        assert summary["queue"]["mean"] == pytest.approx(4.0)
+        assert summary["filter"]["mean"] == pytest.approx(2.0)
+        assert summary["present"]["mean"] == pytest.approx(1.0)
+        assert "resize" not in summary
+        assert summary["total"]["mean"] == pytest.approx(7.0)
+
+    def test_display_stamps_frames(self, test_config, shutdown_event):
+        """Тест: цикл отображения проставляет отметки всех этапов"""
+        buffer = FrameRingBuffer(1, (48, 64, 3))
+        slot = buffer.acquire_write()
+        slot.record.begin(7, 0.0)
+        buffer.commit(slot)
+        records = []
+
+        def on_frame(frame):
+            records.append(slot.record.sequence)
+            shutdown_event.set()
+
+        display = DisplayWindow(test_config, [CallbackSink(on_frame)])
+        display.tracer.report_interval = 0.0
+        display.start_display(buffer, shutdown_event)
+
+        record = slot.record
+        assert records == [7]
+        assert record.capture_ts <= record.dequeue_ts <= record.filter_ts <= record.present_ts
+        assert display.tracer.last_summary["total"]["count"] == 1